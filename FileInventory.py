@@ -7,10 +7,13 @@ from pptx import Presentation
 from openpyxl import load_workbook
 import time
 import json
+import re
 from datetime import datetime
 import sys
 import warnings
 import argparse
+import threading
+import queue
 
 # Plattform-spezifische Konfiguration
 from platform_config import PLATFORM, is_windows, is_macos, is_linux
@@ -49,6 +52,7 @@ SCRIPT_NAME = PLATFORM.get_script_name()  # Plattformspezifischer Name
 
 # Fehlerbehandlungsmodus: None = fragen, "skip" = weiter ohne Fragen, "ask" = weiter mit Fragen
 ERROR_HANDLING_MODE = None
+_PROMPT_LOCK = threading.Lock()  # Serialisiert Benutzerabfragen im Pipeline-Modus
 
 # Plattformunabhängige Standard-Pfade
 SRC_ROOT = PLATFORM.default_src
@@ -71,10 +75,68 @@ MIN_IMAGE_SIZE = 10 * 1024  # 10 KB
 # - Reasoning-Modelle (z.B. mistralai/ministral-3-14b-reasoning): 262144
 MAX_CONTEXT_TOKENS = 262144
 
+# Token-Budget (siehe TokenBudget): Eingabetext und max_tokens werden in Tokens bemessen.
+# Exakt gezählt wird mit TOKENIZER_FILE (tokenizer.json des Modells, Paket "tokenizers") oder über
+# den /tokenize-Endpoint des Servers (z.B. llama.cpp). Sonst wird das Verhältnis Zeichen/Token pro
+# Server und Modell aus den "usage"-Angaben der Antworten gelernt (Startwerte bis dahin):
+TOKENIZER_FILE = None
+USE_TOKENIZE_ENDPOINT = True
+DEFAULT_CHARS_PER_TOKEN = 4.0         # Eingabe (konservativ für deutsche Texte)
+DEFAULT_OUTPUT_CHARS_PER_TOKEN = 2.5  # Antwort (für max_tokens)
+
 # Maximale Länge der Zusammenfassung in Zeichen
 # Wenn der Originaltext kürzer ist, wird er direkt kopiert
 SUMMARY_MAX_CHARS = 1500
 
+# Kombinierter LLM-Aufruf: Zusammenfassung, Schlüsselbegriffe und Named Entities in einer
+# JSON-Antwort statt zwei getrennter Anfragen (halbiert die Prompt-Verarbeitung pro Dokument)
+# Bei unlesbarer Antwort wird automatisch auf die getrennten Aufrufe zurückgefallen.
+COMBINED_LLM = False
+
+# Pipeline-Modus: Textextraktion und LLM-Anfragen laufen parallel (siehe ProcessingPipeline)
+# LLM_CONCURRENCY: Anzahl gleichzeitiger LLM-Anfragen (0 = sequentielle Verarbeitung wie bisher)
+# EXTRACT_THREADS: Anzahl Threads für die Textextraktion im Pipeline-Modus
+LLM_CONCURRENCY = 0
+EXTRACT_THREADS = 2
+
+# Textextraktion in separaten Prozessen (siehe ExtractionPool)
+# EXTRACT_WORKERS: Anzahl Worker-Prozesse (0 = Extraktion im Hauptprozess wie bisher)
+# EXTRACT_MAX_TASKS_PER_WORKER: Worker wird nach so vielen Dateien neu gestartet (gibt Speicher frei)
+# EXTRACT_MEMORY_LIMIT_MB: Speicherlimit pro Worker-Prozess (nur macOS/Linux, 0 = kein Limit)
+# EXTRACT_TIMEOUT: Maximale Extraktionszeit pro Datei in Sekunden, danach wird der Worker beendet
+EXTRACT_WORKERS = 0
+EXTRACT_MAX_TASKS_PER_WORKER = 200
+EXTRACT_MEMORY_LIMIT_MB = 4096
+EXTRACT_TIMEOUT = 900
+
+# PDF-Textextraktion
+# PDF_ENGINE: "pymupdf" (schnell, Standard) oder "pdfplumber" (bisheriges Verhalten)
+#   Mit pymupdf wird pdfplumber nur für Seiten genutzt, die die Qualitätsprüfung nicht bestehen
+# PDF_PARALLEL_MIN_PAGES: Ab dieser Seitenzahl werden Seitenbereiche parallel in Prozessen extrahiert
+# PDF_PAGE_WORKERS: Anzahl Prozesse für die parallele Seitenextraktion (0/1 = sequentiell)
+PDF_ENGINE = "pymupdf"
+PDF_PARALLEL_MIN_PAGES = 100
+PDF_PAGE_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+# OCR für gescannte PDF-Seiten (siehe ocr_pdf_pages)
+# OCR_DPI: Auflösung beim Rendern der Seiten
+# OCR_WORKERS: Anzahl paralleler Tesseract-Prozesse pro Dokument
+# OCR_BATCH_PAGES: Seiten pro Tesseract-Aufruf (spart den Start eines Prozesses pro Seite)
+# OCR_LANG: Tesseract-Sprache(n), z.B. "deu" oder "deu+eng"
+OCR_DPI = 300
+OCR_WORKERS = max(1, min(4, os.cpu_count() or 1))
+OCR_BATCH_PAGES = 8
+OCR_LANG = "deu"
+# OCR-Ergebnisse pro Seite unter DST_ROOT/.fileinventory/ocr_cache.sqlite zwischenspeichern
+# (Schlüssel: Content-Hash, Seite, DPI, Sprache, Tesseract-Version)
+USE_OCR_CACHE = True
+
+# Verzeichnis-Scan (siehe DirectoryScanner): Anzahl paralleler Threads
+# Mehrere Threads lohnen sich vor allem auf Netzlaufwerken mit hoher Latenz
+SCAN_THREADS = 8
+# Wie viele gefundene Dateien der Scan der Verarbeitung höchstens vorausläuft (begrenzt den RAM)
+SCAN_LOOKAHEAD = 10000
+
 # Welche Dateitypen sollen verarbeitet werden?
 EXTENSIONS = {
     ".pdf",                                    # PDF-Dokumente
@@ -98,7 +160,68 @@ EXCLUDE_PATTERNS = [
 ]
 
 # Duplikat-Erkennung: Cache für Dateigrößen und Hashes
-_SIZE_HASH_CACHE = {}  # {size: {hash: path}}
+# Gestuft: Größe → Teil-Hash (Anfang + Ende) → voller SHA-256 (nur bei Kollision)
+_SIZE_HASH_CACHE = {}       # {size: {hash: path}} - Dateien mit vollständigem Hash
+_SIZE_FIRST_SEEN = {}       # {size: path} - bisher einzige Datei dieser Größe, noch ungehasht
+_PARTIAL_HASH_CACHE = {}    # {size: {partial_hash: [path, ...]}} - nur Teil-Hash bekannt
+_PARTIAL_FULL_HASHES = {}   # {size: {partial_hash: {hash, ...}}} - volle Hashes je Teil-Hash
+_SIZES_WITHOUT_PARTIAL = set()  # Größen mit vollen Hashes ohne bekannten Teil-Hash (z.B. aus Manifest)
+PARTIAL_HASH_BYTES = 64 * 1024  # Bytes vom Anfang und vom Ende für den Teil-Hash
+_DUPLICATE_STATS = {'by_size': 0, 'by_partial': 0, 'partial_hashes': 0, 'full_hashes': 0}
+_DECIDED_WITHOUT_FULL_HASH = set()  # Pfade, die ohne vollen Hash als kein Duplikat erkannt wurden
+_DUPLICATE_INDEX = None     # FileManifest für den persistenten Duplikat-Index (None = nur im Speicher)
+_DUP_INDEX_ENTRIES = {}     # {path: (size, mtime_ns, partial_hash, hash)} - aus früheren Läufen geladen
+
+# Content-Hash: Jede Quelldatei wird pro Lauf höchstens einmal gehasht
+# (Duplikat-Erkennung, Validierung und Metadaten teilen sich den Cache)
+HASH_BUFFER_SIZE = 1024 * 1024  # Lesepuffer in Bytes
+HASH_USE_MMAP = False           # Datei per mmap hashen statt blockweise zu lesen
+_HASH_CACHE = {}                # {(path, size, mtime_ns): sha256}
+_HASH_CACHE_LOCK = threading.Lock()
+
+# Zustandsverzeichnis unter DST_ROOT für Manifest, Caches und Indizes
+STATE_DIR_NAME = ".fileinventory"
+
+# Manifest (siehe FileManifest): unveränderte Dateien werden per stat() + Index-Lookup übersprungen
+USE_MANIFEST = True
+# Extrahierten Text komprimiert unter DST_ROOT/.fileinventory/text ablegen (Schlüssel: Content-Hash),
+# damit Wartungsläufe (--update-dsgvo, --cleanup-phones) die Quelldateien nicht erneut parsen
+USE_TEXT_STORE = True
+
+# Wartungsläufe (--update-dsgvo, --cleanup-phones) in mehreren Prozessen (siehe run_bulk_update)
+# MAINTENANCE_WORKERS: Anzahl Worker-Prozesse (1 = im Hauptprozess)
+# MAINTENANCE_CHUNK_FILES: JSON-Dateien pro Auftrag an einen Worker
+# Der Fortschritt wird in DST_ROOT/.fileinventory/maintenance_<modus>.json gesichert, ein
+# abgebrochener Lauf setzt beim nächsten Aufruf an dieser Stelle fort.
+MAINTENANCE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+MAINTENANCE_CHUNK_FILES = 100
+
+# LLM-Antwort-Cache unter DST_ROOT/.fileinventory/llm_cache.sqlite
+# Schlüssel: Modell, Art der Anfrage, Prompt-Version, Temperatur, max_tokens, Hash des normalisierten Textes
+# LLM_PROMPT_VERSION bei inhaltlichen Prompt-Änderungen erhöhen (ältere Einträge werden dann nicht mehr genutzt)
+USE_LLM_CACHE = True
+LLM_CACHE_MAX_MB = 512
+LLM_PROMPT_VERSION = 1
+
+# Volltext-Suchindex (SQLite FTS5) unter DST_ROOT/.fileinventory/search_index.sqlite
+# Wird von process_file() und den Wartungsläufen direkt mitgeschrieben (--build-index baut ihn
+# für bestehende JSON-Dateien auf bzw. gleicht ihn ab, --search fragt ihn ab)
+USE_SEARCH_INDEX = True
+
+# Embedding-Index für die semantische Suche über die Zusammenfassungen (--build-embeddings)
+# Vektoren über den /v1/embeddings-Endpoint des LLM-Servers, gespeichert als float32-Matrix
+# unter DST_ROOT/.fileinventory/embeddings (Neuberechnung nur bei geändertem Content-Hash)
+EMBEDDING_MODEL = "text-embedding-nomic-embed-text-v1.5"  # in LM Studio geladenes Embedding-Modell
+EMBEDDING_BATCH_SIZE = 64  # Zusammenfassungen pro Anfrage
+
+# --create-database: Threads zum Lesen der einzelnen JSON-Dateien (DST_ROOT liegt oft auf einem Netzlaufwerk)
+DATABASE_READ_THREADS = 8
+# Ausgabeformate für --create-database --format (json = bisheriges Format)
+DATABASE_FORMATS = ("json", "jsonl", "jsonl.gz", "jsonl.zst", "sqlite")
+
+# Version der Verarbeitungspipeline - erhöhen, wenn sich das JSON-Format ändert.
+# Manifest-Einträge älterer Versionen werden beim nächsten Lauf vollständig validiert.
+PIPELINE_VERSION = 1
 
 # ============================================================================
 # DSGVO / BDSG - Klassifizierung besonders schutzbedürftiger Daten
@@ -180,6 +303,54 @@ SENSITIVE_DATA_KEYWORDS = {
     # - Wird nun via LLM-Kontext-Check geprüft (siehe classify_sensitive_data)
 }
 
+def _build_keyword_matcher(categories):
+    """
+    Kompiliert alle Keywords aus SENSITIVE_DATA_KEYWORDS in einen einzigen Regex.
+
+    Die Keywords werden als Präfixbaum (Trie) zu einer verschachtelten Alternation zusammengefasst,
+    so dass classify_sensitive_data() alle Kategorien in einem Durchlauf über den Text findet.
+    Der Lookahead liefert an jeder Wortgrenze das längste passende Keyword, auch überlappend.
+
+    Args:
+        categories: dict im Format von SENSITIVE_DATA_KEYWORDS
+
+    Returns:
+        tuple: (kompilierter Regex, {keyword: [kürzere Keywords, die am selben Wortanfang ebenfalls treffen]})
+    """
+    keywords = list(dict.fromkeys(kw for data in categories.values() for kw in data['keywords']))
+
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def trie_pattern(node):
+        alternatives = [re.escape(char) + trie_pattern(child)
+                        for char, child in sorted(node.items()) if char != '']
+        if not alternatives:
+            return ''
+        pattern = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        # Keyword endet hier, längere Fortsetzung ist optional (greedy = längstes Keyword zuerst)
+        return '(?:' + pattern + ')?' if '' in node else pattern
+
+    # Kürzere Keywords, die Präfix eines längeren sind und dort an einer Wortgrenze enden
+    # (z.B. "steuer" in "steuer-id"), werden bei einem Treffer des längeren mitgezählt
+    boundary = re.compile(r'\b')
+    nested = {}
+    for keyword in keywords:
+        nested[keyword] = [other for other in keywords
+                           if other != keyword and keyword.startswith(other)
+                           and boundary.match(keyword, len(other))]
+
+    pattern = re.compile(r'\b(?=(' + trie_pattern(trie) + r')\b)', re.IGNORECASE)
+    return pattern, nested
+
+# Einmalig beim Import kompiliert (siehe classify_sensitive_data)
+_SENSITIVE_KEYWORD_RE, _SENSITIVE_NESTED_KEYWORDS = _build_keyword_matcher(SENSITIVE_DATA_KEYWORDS)
+_BANKDATA_KEYWORD_RE = re.compile(r'\b(iban|kontonummer|bankverbindung|bic)\b', re.IGNORECASE)
+
 # Prüfe OCR-Verfügbarkeit global (einmalig beim Start)
 OCR_AVAILABLE = False
 pytesseract = None
@@ -191,6 +362,20 @@ try:
 except ImportError:
     pass  # OCR nicht verfügbar
 
+# Optional: NumPy für den Embedding-Index (--build-embeddings, --semantic-search)
+np = None
+try:
+    import numpy as np
+except ImportError:
+    pass  # Semantische Suche nicht verfügbar
+
+# Optional: zstd-Kompression für --create-database --format jsonl.zst
+zstandard = None
+try:
+    import zstandard
+except ImportError:
+    pass  # Nur gzip verfügbar
+
 def is_xfa_pdf(text, path=None):
     """
     Prüft ob ein PDF XFA/JavaScript enthält basierend auf:
@@ -308,9 +493,424 @@ def extract_xfa_xml(path):
         print(f"  → XFA-Extraktion Fehler: {e}")
         return None
 
+def pdf_page_quality_ok(text):
+    """
+    Qualitätsprüfung für den Text einer PDF-Seite.
+    Schlägt fehl bei (fast) leeren Seiten und bei Text mit vielen Ersatz-, Steuer- oder
+    Private-Use-Zeichen (typisch für Schriften ohne ToUnicode-Tabelle).
+
+    Returns:
+        bool: True wenn der Text brauchbar ist
+    """
+    stripped = text.strip()
+    if len(stripped) < 10:
+        return False
+    bad = 0
+    for ch in stripped:
+        code = ord(ch)
+        if ch == '\ufffd' or 0xE000 <= code <= 0xF8FF or (code < 32 and ch not in '\n\r\t'):
+            bad += 1
+    return bad <= len(stripped) * 0.05
+
+_TESSERACT_CMD = None  # Pfad zum Tesseract-Binary (False = nicht gefunden)
+
+def get_tesseract_cmd():
+    """
+    Ermittelt den Pfad zum Tesseract-Binary (einmalig, danach zwischengespeichert).
+    Ein in pytesseract konfigurierter Pfad hat Vorrang vor der Plattform-Suche.
+
+    Returns:
+        str oder None
+    """
+    global _TESSERACT_CMD
+    if _TESSERACT_CMD is None:
+        cmd = None
+        if pytesseract is not None:
+            configured = getattr(pytesseract.pytesseract, 'tesseract_cmd', None)
+            if configured and configured != 'tesseract':
+                cmd = configured
+        _TESSERACT_CMD = cmd or PLATFORM.find_tesseract() or False
+    return _TESSERACT_CMD or None
+
+def ocr_available():
+    """True wenn OCR möglich ist (Tesseract-Binary gefunden oder pytesseract installiert)."""
+    return get_tesseract_cmd() is not None or OCR_AVAILABLE
+
+_TESSERACT_VERSION = None
+
+def get_tesseract_version():
+    """Tesseract-Version als String (einmalig ermittelt, Teil des OCR-Cache-Schlüssels)."""
+    global _TESSERACT_VERSION
+    if _TESSERACT_VERSION is None:
+        version = "unknown"
+        try:
+            cmd = get_tesseract_cmd()
+            if cmd:
+                import subprocess
+                completed = subprocess.run([cmd, "--version"], capture_output=True, timeout=30)
+                output = (completed.stdout or completed.stderr).decode('utf-8', 'replace')
+                if output.strip():
+                    version = output.splitlines()[0].strip()
+            elif OCR_AVAILABLE:
+                version = str(pytesseract.get_tesseract_version())
+        except Exception:
+            pass
+        _TESSERACT_VERSION = version
+    return _TESSERACT_VERSION
+
+class OCRCache:
+    """
+    Inhaltsadressierter Cache für OCR-Ergebnisse (SQLite unter DST_ROOT/.fileinventory).
+
+    Schlüssel ist (Content-Hash, Seite, DPI, Sprache, Tesseract-Version): eine unveränderte
+    Datei wird auch in den Wartungsmodi (--cleanup-phones, --update-dsgvo) und bei
+    Neuverarbeitung nicht erneut gerendert und erkannt. Jeder Prozess öffnet eine eigene
+    Verbindung (siehe get_ocr_cache), WAL erlaubt parallele Leser und Schreiber.
+    """
+
+    def __init__(self, db_path):
+        import sqlite3
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS ocr_pages (
+                content_hash TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                dpi INTEGER NOT NULL,
+                lang TEXT NOT NULL,
+                engine_version TEXT NOT NULL,
+                text TEXT NOT NULL,
+                seconds REAL,
+                created TEXT,
+                PRIMARY KEY (content_hash, page, dpi, lang, engine_version)
+            )
+        """)
+        self.conn.commit()
+
+    def lookup(self, content_hash, pages, dpi, lang, engine_version):
+        """
+        Returns:
+            dict: {page: text} für alle gefundenen Seiten
+        """
+        if not pages:
+            return {}
+        placeholders = ",".join("?" * len(pages))
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT page, text FROM ocr_pages WHERE content_hash = ? AND dpi = ? AND lang = ? "
+                f"AND engine_version = ? AND page IN ({placeholders})",
+                (content_hash, dpi, lang, engine_version, *pages)
+            ).fetchall()
+        return dict(rows)
+
+    def store(self, content_hash, results, dpi, lang, engine_version):
+        """Speichert OCR-Ergebnisse {page: (text, sekunden)}."""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO ocr_pages "
+                "(content_hash, page, dpi, lang, engine_version, text, seconds, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(content_hash, page, dpi, lang, engine_version, text, seconds, now)
+                 for page, (text, seconds) in results.items()]
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+_OCR_CACHES = {}  # {(pid, db_path): OCRCache} - eine Verbindung pro Prozess
+_OCR_CACHES_LOCK = threading.Lock()
+
+def get_ocr_cache():
+    """
+    Gibt den OCR-Cache für DST_ROOT im aktuellen Prozess zurück.
+
+    Returns:
+        OCRCache oder None (deaktiviert oder nicht nutzbar)
+    """
+    if not USE_OCR_CACHE:
+        return None
+    try:
+        db_path = os.path.join(get_state_dir(), "ocr_cache.sqlite")
+        key = (os.getpid(), db_path)
+        with _OCR_CACHES_LOCK:
+            cache = _OCR_CACHES.get(key)
+            if cache is None:
+                cache = OCRCache(db_path)
+                _OCR_CACHES[key] = cache
+        return cache
+    except Exception as e:
+        print(f"  → Warnung: OCR-Cache nicht verfügbar: {e}")
+        return None
+
+def _render_pdf_pages(path, page_indexes, out_dir, engine):
+    """
+    Rendert PDF-Seiten als PNG-Dateien mit OCR_DPI.
+    PyMuPDF schreibt die Pixmap direkt als Graustufen-PNG (ohne Umweg über PIL).
+
+    Returns:
+        list: Pfade der PNG-Dateien in der Reihenfolge von page_indexes
+    """
+    images = []
+    if engine == 'pymupdf':
+        with fitz.open(path) as doc:
+            for index in page_indexes:
+                image_path = os.path.join(out_dir, f"page_{index + 1:05d}.png")
+                pix = doc.load_page(index).get_pixmap(dpi=OCR_DPI, colorspace=fitz.csGRAY)
+                pix.save(image_path)
+                images.append(image_path)
+    else:
+        with pdfplumber.open(path) as pdf:
+            for index in page_indexes:
+                image_path = os.path.join(out_dir, f"page_{index + 1:05d}.png")
+                pdf.pages[index].to_image(resolution=OCR_DPI).original.save(image_path)
+                images.append(image_path)
+    return images
+
+def _run_tesseract(cmd, images, out_dir):
+    """
+    Ruft Tesseract einmal für mehrere Bilder auf (Bildliste als Datei).
+    Tesseract trennt die Seiten in der Ausgabe mit einem Seitenvorschub (\\f).
+
+    Returns:
+        list: Text pro Bild oder None, wenn die Ausgabe nicht eindeutig aufgeteilt werden kann
+    """
+    import subprocess
+
+    if len(images) == 1:
+        source = images[0]
+    else:
+        source = os.path.join(out_dir, "images.txt")
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write("\n".join(images) + "\n")
+
+    # Tesseract soll selbst nur einen Thread nutzen - parallelisiert wird über OCR_WORKERS
+    env = dict(os.environ, OMP_THREAD_LIMIT="1")
+    completed = subprocess.run(
+        [cmd, source, "stdout", "-l", OCR_LANG, "--dpi", str(OCR_DPI)],
+        capture_output=True, env=env, timeout=EXTRACT_TIMEOUT
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.decode('utf-8', 'replace').strip()[:200])
+
+    parts = completed.stdout.decode('utf-8', 'replace').split('\f')
+    if len(parts) == len(images) + 1 and not parts[-1].strip():
+        parts = parts[:-1]
+    if len(images) == 1:
+        return ["\f".join(parts)]
+    return parts if len(parts) == len(images) else None
+
+def _ocr_page_batch(path, page_indexes, engine):
+    """
+    OCR für eine Gruppe von Seiten: rendern, Tesseract aufrufen, aufräumen.
+    Ohne Tesseract-Binary wird pytesseract pro Seite verwendet.
+
+    Returns:
+        list: (page_index, text, sekunden) pro Seite; die Zeit ist der Anteil an der Gruppe
+    """
+    import shutil
+    import tempfile
+
+    start = time.time()
+    out_dir = tempfile.mkdtemp(prefix="fileinventory_ocr_")
+    try:
+        images = _render_pdf_pages(path, page_indexes, out_dir, engine)
+        cmd = get_tesseract_cmd()
+        texts = None
+        if cmd:
+            texts = _run_tesseract(cmd, images, out_dir)
+            if texts is None:
+                # Ausgabe ließ sich nicht den Seiten zuordnen - einzeln wiederholen
+                texts = [_run_tesseract(cmd, [image], out_dir)[0] for image in images]
+        else:
+            texts = []
+            for image in images:
+                with PIL_Image.open(image) as pil_image:
+                    texts.append(pytesseract.image_to_string(pil_image, lang=OCR_LANG))
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    seconds = (time.time() - start) / max(1, len(page_indexes))
+    return [(index, text, seconds) for index, text in zip(page_indexes, texts)]
+
+def ocr_pdf_pages(path, page_indexes, engine):
+    """
+    OCR-Subsystem für gescannte PDF-Seiten.
+    Die Seiten werden in Gruppen zu OCR_BATCH_PAGES aufgeteilt, die Gruppen laufen parallel
+    in OCR_WORKERS Threads (jede Gruppe startet einen eigenen Tesseract-Prozess).
+
+    Bereits erkannte Seiten kommen aus dem OCR-Cache (sekunden ist dann None).
+
+    Returns:
+        dict: {page_index: (text, sekunden)}; fehlgeschlagene Seiten fehlen
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    results = {}
+
+    # Bereits erkannte Seiten aus dem OCR-Cache (Seitennummern 1-basiert)
+    cache = get_ocr_cache()
+    content_hash = calculate_content_hash(path) if cache is not None else None
+    cache_key = (OCR_DPI, OCR_LANG, get_tesseract_version())
+    if content_hash:
+        try:
+            cached = cache.lookup(content_hash, [index + 1 for index in page_indexes], *cache_key)
+        except Exception as e:
+            print(f"  → Warnung: OCR-Cache nicht lesbar: {e}")
+            cached = {}
+        for index in page_indexes:
+            if index + 1 in cached:
+                results[index] = (cached[index + 1], None)
+        page_indexes = [index for index in page_indexes if index not in results]
+        if results:
+            print(f"  → OCR-Cache: {len(results)} Seiten übernommen, {len(page_indexes)} Seiten neu")
+        if not page_indexes:
+            return results
+
+    batch_size = max(1, OCR_BATCH_PAGES)
+    batches = [page_indexes[i:i + batch_size] for i in range(0, len(page_indexes), batch_size)]
+    new_results = {}
+    errors = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(OCR_WORKERS, len(batches)))) as executor:
+        futures = [executor.submit(_ocr_page_batch, path, batch, engine) for batch in batches]
+        for batch, future in zip(batches, futures):
+            try:
+                for index, text, seconds in future.result():
+                    new_results[index] = (text, seconds)
+            except Exception as e:
+                # OCR fehlgeschlagen, verwende ursprünglichen Text
+                errors += 1
+                if errors == 1:
+                    print(f"  → OCR-Fehler auf Seite {batch[0] + 1}: {str(e)[:50]}")
+
+    if content_hash and new_results:
+        try:
+            cache.store(content_hash, {index + 1: value for index, value in new_results.items()}, *cache_key)
+        except Exception as e:
+            print(f"  → Warnung: OCR-Cache nicht beschreibbar: {e}")
+    results.update(new_results)
+    return results
+
+def _extract_pdf_page_range(path, start, end, engine):
+    """
+    Extrahiert den Text der Seiten [start, end) eines PDFs. Läuft auch in Worker-Prozessen.
+    Seiten ohne verwertbaren Text werden nur markiert, die OCR übernimmt ocr_pdf_pages().
+
+    Returns:
+        list: pro Seite ein dict mit 'text', 'needs_ocr' und 'fallback' (pdfplumber genutzt)
+    """
+    pages = []
+    progress = end - start > 10
+    if engine == 'pymupdf':
+        plumber = None
+        doc = fitz.open(path)
+        try:
+            total_pages = doc.page_count
+            for index in range(start, end):
+                page_text = doc.load_page(index).get_text().rstrip()
+                used_fallback = False
+
+                # pdfplumber nur für Seiten mit unbrauchbarem (verstümmeltem) Text. Gescannte und
+                # leere Seiten haben auch für pdfplumber keinen Text und gehen direkt an die OCR
+                if len(page_text.strip()) >= 10 and not pdf_page_quality_ok(page_text):
+                    try:
+                        if plumber is None:
+                            plumber = pdfplumber.open(path)
+                        plumber_text = plumber.pages[index].extract_text() or ""
+                        if (pdf_page_quality_ok(plumber_text)
+                                or len(plumber_text.strip()) > len(page_text.strip())):
+                            page_text = plumber_text
+                            used_fallback = True
+                    except Exception:
+                        pass
+
+                # Wenn keine oder sehr wenig Text gefunden wurde, könnte es ein Scan sein
+                pages.append({'text': page_text, 'needs_ocr': len(page_text.strip()) < 10,
+                              'fallback': used_fallback})
+
+                # Zeige Fortschritt bei vielen Seiten
+                if progress and (index + 1) % 10 == 0:
+                    print(f"  → PDF-Verarbeitung: {index + 1}/{total_pages} Seiten")
+        finally:
+            doc.close()
+            if plumber is not None:
+                plumber.close()
+    else:
+        with pdfplumber.open(path) as pdf:
+            total_pages = len(pdf.pages)
+            for index in range(start, end):
+                page_text = pdf.pages[index].extract_text() or ""
+
+                # Wenn keine oder sehr wenig Text gefunden wurde, könnte es ein Scan sein
+                pages.append({'text': page_text, 'needs_ocr': len(page_text.strip()) < 10,
+                              'fallback': False})
+
+                # Zeige Fortschritt bei vielen Seiten
+                if progress and (index + 1) % 10 == 0:
+                    print(f"  → PDF-Verarbeitung: {index + 1}/{total_pages} Seiten")
+    return pages
+
+# Prozess-Pool für die parallele Extraktion großer PDFs (wird bei Bedarf gestartet)
+_PDF_PAGE_POOL = None
+_PDF_PAGE_POOL_LOCK = threading.Lock()
+
+def _get_pdf_page_pool():
+    global _PDF_PAGE_POOL
+    with _PDF_PAGE_POOL_LOCK:
+        if _PDF_PAGE_POOL is None:
+            from concurrent.futures import ProcessPoolExecutor
+            kwargs = {
+                'max_workers': PDF_PAGE_WORKERS,
+                'initializer': _init_extract_worker,
+                'initargs': (EXTRACT_MEMORY_LIMIT_MB,
+                             {name: globals()[name] for name in _EXTRACT_WORKER_SETTINGS}),
+            }
+            if sys.version_info >= (3, 11) and EXTRACT_MAX_TASKS_PER_WORKER:
+                kwargs['max_tasks_per_child'] = EXTRACT_MAX_TASKS_PER_WORKER
+            _PDF_PAGE_POOL = ProcessPoolExecutor(**kwargs)
+        return _PDF_PAGE_POOL
+
+def shutdown_pdf_page_pool():
+    """Beendet den Prozess-Pool für die parallele PDF-Extraktion (falls gestartet)."""
+    global _PDF_PAGE_POOL
+    with _PDF_PAGE_POOL_LOCK:
+        pool, _PDF_PAGE_POOL = _PDF_PAGE_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def _extract_pdf_pages_parallel(path, total_pages, engine):
+    """
+    Verteilt die Seiten eines großen PDFs auf Seitenbereiche und extrahiert sie parallel.
+    Bei Fehlern im Pool wird sequentiell extrahiert.
+    """
+    # Doppelt so viele Bereiche wie Prozesse, damit ungleich aufwändige Seiten ausgeglichen werden
+    chunk = -(-total_pages // (PDF_PAGE_WORKERS * 2))
+    ranges = [(start, min(start + chunk, total_pages)) for start in range(0, total_pages, chunk)]
+    print(f"  → PDF mit {total_pages} Seiten: parallele Extraktion in {len(ranges)} Bereichen "
+          f"({PDF_PAGE_WORKERS} Prozesse)")
+    try:
+        pool = _get_pdf_page_pool()
+        futures = [pool.submit(_extract_pdf_page_range, os.fspath(path), start, end, engine)
+                   for start, end in ranges]
+        pages = []
+        for future in futures:
+            pages.extend(future.result(timeout=EXTRACT_TIMEOUT))
+        return pages
+    except Exception as e:
+        print(f"  → Parallele PDF-Extraktion fehlgeschlagen ({e}), extrahiere sequentiell")
+        shutdown_pdf_page_pool()
+        return _extract_pdf_page_range(path, 0, total_pages, engine)
+
 def extract_text_pdf(path):
     """
     Extrahiert Text aus PDF-Dateien.
+    - Standard-Engine PyMuPDF; pdfplumber nur für Seiten, die die Qualitätsprüfung nicht bestehen
+    - Große PDFs (ab PDF_PARALLEL_MIN_PAGES Seiten) werden seitenweise parallel extrahiert
     - Verwendet OCR (Tesseract) für gescannte PDFs ohne Text
     - Erkennt XFA/JavaScript-PDFs und nutzt alternative Extraktionsmethoden
 
@@ -322,84 +922,94 @@ def extract_text_pdf(path):
             - 'ocr_chars': Anzahl der via OCR extrahierten Zeichen
             - 'xfa_detected': Boolean, ob XFA/JavaScript-PDF erkannt wurde
             - 'extraction_method': Methode die erfolgreich war
+            - 'fallback_pages': Seiten, die per pdfplumber statt PyMuPDF extrahiert wurden
+            - 'ocr_dpi', 'ocr_seconds', 'ocr_page_times': OCR-Auflösung und Zeiten (nur mit OCR-Seiten)
+            - 'ocr_cached_pages': Seiten, deren OCR-Text aus dem OCR-Cache stammt
     """
-    texts = []
-    ocr_pages = 0
-    total_ocr_chars = 0
+    engine = 'pymupdf' if PDF_ENGINE == 'pymupdf' and PYMUPDF_AVAILABLE else 'pdfplumber'
     ocr_info = {
         'used_ocr': False,
         'ocr_pages': 0,
         'total_pages': 0,
         'ocr_chars': 0,
         'xfa_detected': False,
-        'extraction_method': 'pdfplumber'
+        'extraction_method': engine,
+        'fallback_pages': 0
     }
 
     try:
-        with pdfplumber.open(path) as pdf:
-            total_pages = len(pdf.pages)
-            ocr_info['total_pages'] = total_pages
-
-            # Verarbeite jede Seite
-            for page_num, page in enumerate(pdf.pages, 1):
-                page_text = page.extract_text() or ""
-
-                # Wenn keine oder sehr wenig Text gefunden wurde, könnte es ein Scan sein
-                if len(page_text.strip()) < 10:
-                    # Versuche OCR mit pytesseract (falls verfügbar)
-                    if OCR_AVAILABLE:
-                        try:
-                            # Konvertiere PDF-Seite zu Bild
-                            if hasattr(page, 'to_image'):
-                                pil_image = page.to_image(resolution=300).original
-
-                                # OCR mit Tesseract (Deutsch)
-                                ocr_text = pytesseract.image_to_string(pil_image, lang='deu')
-
-                                if len(ocr_text.strip()) > len(page_text.strip()):
-                                    page_text = ocr_text
-                                    ocr_pages += 1
-                                    total_ocr_chars += len(ocr_text)
-                                    ocr_info['used_ocr'] = True
-
-                                    if page_num == 1:
-                                        print(f"  → OCR verwendet für Seite {page_num}/{total_pages}")
-
-                        except Exception as e:
-                            # OCR fehlgeschlagen, verwende ursprünglichen Text
-                            if page_num == 1:
-                                print(f"  → OCR-Fehler auf Seite {page_num}: {str(e)[:50]}")
-                    else:
-                        # pytesseract nicht installiert - nur einmal warnen
-                        if page_num == 1:
-                            print(f"  → Warnung: OCR nicht verfügbar (pytesseract nicht installiert)")
-
-                texts.append(page_text)
-
-                # Zeige Fortschritt bei vielen Seiten
-                if total_pages > 10 and page_num % 10 == 0:
-                    print(f"  → PDF-Verarbeitung: {page_num}/{total_pages} Seiten")
-
+        if engine == 'pymupdf':
+            with fitz.open(path) as doc:
+                total_pages = doc.page_count
+        else:
+            with pdfplumber.open(path) as pdf:
+                total_pages = len(pdf.pages)
+        ocr_info['total_pages'] = total_pages
+
+        # Keine verschachtelten Pools in Worker-Prozessen des ExtractionPool
+        if (total_pages >= PDF_PARALLEL_MIN_PAGES and PDF_PAGE_WORKERS > 1
+                and not _IN_EXTRACT_WORKER):
+            pages = _extract_pdf_pages_parallel(path, total_pages, engine)
+        else:
+            pages = _extract_pdf_page_range(path, 0, total_pages, engine)
     except Exception as e:
         print(f"  → Fehler beim PDF-Öffnen: {e}")
         return "", ocr_info
 
+    # OCR für alle Seiten ohne Text (parallel und in Gruppen, siehe ocr_pdf_pages)
+    ocr_indexes = [index for index, page in enumerate(pages) if page['needs_ocr']]
+    ocr_pages = 0
+    total_ocr_chars = 0
+    if ocr_indexes:
+        if not ocr_available():
+            # Tesseract nicht installiert - nur einmal warnen
+            print(f"  → Warnung: OCR nicht verfügbar (Tesseract nicht installiert)")
+        else:
+            ocr_start = time.time()
+            ocr_results = ocr_pdf_pages(path, ocr_indexes, engine)
+            page_times = []
+            cached_pages = 0
+            for index in ocr_indexes:
+                if index not in ocr_results:
+                    continue
+                ocr_text, seconds = ocr_results[index]
+                if seconds is None:
+                    cached_pages += 1
+                else:
+                    page_times.append({'page': index + 1, 'seconds': round(seconds, 3)})
+                if len(ocr_text.strip()) > len(pages[index]['text'].strip()):
+                    pages[index]['text'] = ocr_text
+                    ocr_pages += 1
+                    total_ocr_chars += len(ocr_text)
+            ocr_info['ocr_dpi'] = OCR_DPI
+            ocr_info['ocr_seconds'] = round(time.time() - ocr_start, 2)
+            ocr_info['ocr_page_times'] = page_times
+            ocr_info['ocr_cached_pages'] = cached_pages
+            if ocr_pages and ocr_indexes[0] == 0:
+                print(f"  → OCR verwendet für Seite 1/{total_pages}")
+
+    texts = [page['text'] for page in pages]
     result = "\n\n".join(texts)
 
     # Update OCR Info
+    ocr_info['used_ocr'] = ocr_pages > 0
     ocr_info['ocr_pages'] = ocr_pages
     ocr_info['ocr_chars'] = total_ocr_chars
+    ocr_info['fallback_pages'] = sum(1 for page in pages if page['fallback'])
+    if ocr_info['fallback_pages']:
+        ocr_info['extraction_method'] = 'pymupdf+pdfplumber'
 
     if ocr_info['used_ocr'] and len(result.strip()) > 100:
-        print(f"  → OCR Ergebnis: {ocr_pages}/{total_pages} Seiten mit OCR verarbeitet, {total_ocr_chars:,} Zeichen extrahiert")
+        print(f"  → OCR Ergebnis: {ocr_pages}/{total_pages} Seiten mit OCR verarbeitet, {total_ocr_chars:,} Zeichen extrahiert "
+              f"({ocr_info['ocr_seconds']:.1f}s, {OCR_DPI} dpi)")
 
     # Prüfe ob XFA/JavaScript-PDF
     if is_xfa_pdf(result, path):
         ocr_info['xfa_detected'] = True
         print(f"  → XFA/JavaScript-PDF erkannt, versuche alternative Extraktionsmethoden...")
 
-        # Methode 1: Versuche PyMuPDF
-        if PYMUPDF_AVAILABLE:
+        # Methode 1: Versuche PyMuPDF (nur wenn nicht bereits die Engine)
+        if PYMUPDF_AVAILABLE and engine != 'pymupdf':
             print(f"  → Versuche PyMuPDF...")
             pymupdf_text = extract_text_pymupdf(path)
             if pymupdf_text and len(pymupdf_text.strip()) > len(result.strip()):
@@ -734,6 +1344,143 @@ def extract_text_image(path):
     # Der eigentliche Text wird später vom LLM extrahiert, das die Bilddatei direkt analysiert
     return f"[IMAGE_FILE:{path}]"
 
+# Aktiver Prozess-Pool für die Textextraktion (wird von walk_and_process gesetzt)
+_EXTRACTION_POOL = None
+# True in Worker-Prozessen des ExtractionPool (dort keine weiteren Pools starten)
+_IN_EXTRACT_WORKER = False
+# Wartungsläufe: prozessübergreifendes Limit gleichzeitiger LLM-Anfragen (siehe run_bulk_update)
+_LLM_REQUEST_SEMAPHORE = None
+
+# Globale Einstellungen, die in die Worker-Prozesse übernommen werden
+# (Worker importieren das Modul neu und sehen sonst nur die Standardwerte)
+_EXTRACT_WORKER_SETTINGS = ('SRC_ROOT', 'DST_ROOT', 'PDF_ENGINE', 'PDF_PARALLEL_MIN_PAGES', 'PDF_PAGE_WORKERS',
+                            'OCR_DPI', 'OCR_WORKERS', 'OCR_BATCH_PAGES', 'OCR_LANG', 'USE_OCR_CACHE')
+
+def _init_extract_worker(memory_limit_mb, settings):
+    """Initialisiert einen Worker-Prozess des ExtractionPool."""
+    global _IN_EXTRACT_WORKER
+    _IN_EXTRACT_WORKER = True
+    globals().update(settings)
+
+    if memory_limit_mb:
+        try:
+            import resource
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError):
+            # Windows kennt kein resource-Modul, manche Systeme erlauben RLIMIT_AS nicht
+            pass
+
+def _init_maintenance_worker(settings, llm_semaphore):
+    """Initialisiert einen Worker-Prozess von run_bulk_update()."""
+    global _LLM_REQUEST_SEMAPHORE
+    _init_extract_worker(0, settings)
+    _LLM_REQUEST_SEMAPHORE = llm_semaphore
+
+def llm_request_slot():
+    """
+    Kontext für eine LLM-Anfrage aus einem Wartungslauf: wartet auf einen freien Platz,
+    damit parallele Worker-Prozesse den lokalen LLM-Server nicht überlasten
+    (Wartezeit zählt nicht zum Timeout der Anfrage).
+    """
+    if _LLM_REQUEST_SEMAPHORE is None:
+        import contextlib
+        return contextlib.nullcontext()
+    return _LLM_REQUEST_SEMAPHORE
+
+class ExtractionPool:
+    """
+    Prozess-Pool für extract_text().
+
+    pdfplumber, python-docx, python-pptx und openpyxl sind reines Python bzw. halten den GIL,
+    daher laufen sie hier in eigenen Prozessen:
+    - Worker werden nach max_tasks_per_worker Dateien neu gestartet (kein Speicherleck über 100k Dateien)
+    - Speicherlimit pro Worker (MemoryError statt Absturz des Gesamtlaufs)
+    - Dateien, die länger als timeout Sekunden brauchen, werden abgebrochen und der Pool neu gestartet
+    """
+
+    def __init__(self, workers, max_tasks_per_worker=None, memory_limit_mb=None, timeout=None):
+        # None = aktuelle globale Einstellung (erst hier gelesen, damit Kommandozeilen-Parameter greifen)
+        self.workers = workers
+        self.max_tasks_per_worker = EXTRACT_MAX_TASKS_PER_WORKER if max_tasks_per_worker is None else max_tasks_per_worker
+        self.memory_limit_mb = EXTRACT_MEMORY_LIMIT_MB if memory_limit_mb is None else memory_limit_mb
+        self.timeout = EXTRACT_TIMEOUT if timeout is None else timeout
+        self._executor = None
+        self._lock = threading.Lock()
+        # Höchstens eine Datei pro Worker gleichzeitig einreichen: sonst wartet ein Auftrag in der
+        # Queue des Executors und die Wartezeit zählt bereits zum Timeout
+        self._slots = threading.BoundedSemaphore(max(1, workers))
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                from concurrent.futures import ProcessPoolExecutor
+                kwargs = {
+                    'max_workers': self.workers,
+                    'initializer': _init_extract_worker,
+                    'initargs': (self.memory_limit_mb,
+                                 {name: globals()[name] for name in _EXTRACT_WORKER_SETTINGS}),
+                }
+                if self.max_tasks_per_worker:
+                    if sys.version_info >= (3, 11):
+                        kwargs['max_tasks_per_child'] = self.max_tasks_per_worker
+                    else:
+                        print(f"  → Warnung: Neustart der Extraktions-Worker nach {self.max_tasks_per_worker} "
+                              f"Dateien erfordert Python 3.11+ (aktuell {sys.version.split()[0]}) - "
+                              f"Worker laufen ohne Neustart")
+                self._executor = ProcessPoolExecutor(**kwargs)
+            return self._executor
+
+    def _restart(self, executor):
+        """Beendet einen (hängenden oder defekten) Pool; der nächste Aufruf startet einen neuen."""
+        with self._lock:
+            if self._executor is not executor:
+                return  # Bereits von einem anderen Thread neu gestartet
+            self._executor = None
+
+        # ProcessPoolExecutor kann einzelne Worker nicht abbrechen - beende alle Prozesse
+        for process in list((getattr(executor, '_processes', None) or {}).values()):
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def extract(self, path):
+        """Wie extract_text(), aber in einem Worker-Prozess."""
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+        from concurrent.futures.process import BrokenProcessPool
+
+        with self._slots:
+            for attempt in range(2):
+                executor = self._get_executor()
+                future = executor.submit(extract_text, path)
+                try:
+                    return future.result(timeout=self.timeout)
+                except FutureTimeoutError:
+                    self._restart(executor)
+                    raise TimeoutError(f"Textextraktion nach {self.timeout}s abgebrochen")
+                except BrokenProcessPool:
+                    # Worker abgestürzt (z.B. Speicherlimit) oder Pool wegen Timeout einer
+                    # anderen Datei neu gestartet - einmal mit neuem Pool wiederholen
+                    self._restart(executor)
+                    if attempt == 1:
+                        raise
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+def run_extract_text(path):
+    """
+    Ruft extract_text() auf - im ExtractionPool falls aktiv, sonst direkt.
+    """
+    if _EXTRACTION_POOL is not None and not _IN_EXTRACT_WORKER:
+        return _EXTRACTION_POOL.extract(path)
+    return extract_text(path)
+
 def extract_text(path):
     """
     Extrahiert Text aus einer Datei.
@@ -776,6 +1523,82 @@ def is_file_accessible(file_path):
         print(f"Warnung: Konnte Dateizugriff nicht prüfen für {file_path}: {e}")
         return False
 
+class ExcludeMatcher:
+    """
+    Einmal kompilierte EXCLUDE_PATTERNS für CLI und GUIs.
+
+    Muster der Form "**/<Name>/**" werden zu einem einzigen regulären Ausdruck über
+    Verzeichnisnamen zusammengefasst. Damit können ausgeschlossene Verzeichnisse schon beim
+    Durchlaufen übersprungen werden (matches_dir), statt jede Datei darin zu prüfen.
+    Alle übrigen Muster werden wie bisher per fnmatch-Semantik gegen den relativen und den
+    absoluten Pfad geprüft (matches_path). Unter Windows ohne Beachtung der Groß-/Kleinschreibung.
+    """
+
+    def __init__(self, patterns, src_root=None):
+        import re
+        import fnmatch
+
+        self.patterns = tuple(patterns)
+        self.src_root = src_root
+        flags = re.IGNORECASE if is_windows() else 0
+
+        dir_globs = []
+        rel_globs = []
+        abs_globs = []
+        for pattern in self.patterns:
+            normalized = pattern.replace('\\', '/')
+            inner = normalized[3:-3] if normalized.startswith('**/') and normalized.endswith('/**') else None
+            if inner and '/' not in inner and '**' not in inner:
+                dir_globs.append(fnmatch.translate(inner))
+            else:
+                rel_globs.append(fnmatch.translate(normalized.lstrip('*/')))
+                abs_globs.append(fnmatch.translate(normalized))
+
+        def combine(globs):
+            return re.compile('|'.join(f'(?:{g})' for g in globs), flags) if globs else None
+
+        self._dir_re = combine(dir_globs)
+        self._rel_re = combine(rel_globs)
+        self._abs_re = combine(abs_globs)
+
+    def matches_dir(self, name):
+        """True wenn ein Verzeichnis mit diesem Namen komplett übersprungen werden soll."""
+        return self._dir_re is not None and self._dir_re.match(name) is not None
+
+    def matches_path(self, path):
+        """True wenn eine Datei (inkl. ihrer übergeordneten Verzeichnisse) ausgeschlossen ist."""
+        path_str = os.fspath(path).replace('\\', '/')
+        if self._dir_re is not None:
+            for part in path_str.split('/')[:-1]:
+                if part and self._dir_re.match(part):
+                    return True
+        if self._abs_re is not None and self._abs_re.match(path_str):
+            return True
+        if self._rel_re is not None and self.src_root:
+            rel_path = os.path.relpath(os.fspath(path), self.src_root).replace('\\', '/')
+            if self._rel_re.match(rel_path):
+                return True
+        return False
+
+    def prune_dirs(self, dirs):
+        """Entfernt ausgeschlossene Verzeichnisse aus einer os.walk-Liste (in place)."""
+        dirs[:] = [d for d in dirs if not self.matches_dir(d)]
+        return dirs
+
+_EXCLUDE_MATCHER = None
+
+def get_exclude_matcher():
+    """
+    Gibt den ExcludeMatcher für die aktuellen EXCLUDE_PATTERNS und SRC_ROOT zurück.
+    Wird nur neu kompiliert, wenn sich Muster oder Quellverzeichnis geändert haben.
+    """
+    global _EXCLUDE_MATCHER
+    matcher = _EXCLUDE_MATCHER
+    if matcher is None or matcher.patterns != tuple(EXCLUDE_PATTERNS) or matcher.src_root != SRC_ROOT:
+        matcher = ExcludeMatcher(EXCLUDE_PATTERNS, SRC_ROOT)
+        _EXCLUDE_MATCHER = matcher
+    return matcher
+
 def should_exclude_path(path):
     """
     Prüft ob ein Pfad basierend auf EXCLUDE_PATTERNS übersprungen werden soll.
@@ -786,48 +1609,210 @@ def should_exclude_path(path):
     Returns:
         True wenn Pfad ausgeschlossen werden soll, False sonst
     """
-    import fnmatch
-
-    path_str = str(path)
-    rel_path = os.path.relpath(path_str, SRC_ROOT)
-
-    for pattern in EXCLUDE_PATTERNS:
-        # Nutze fnmatch für Glob-Pattern-Matching
-        if fnmatch.fnmatch(rel_path, pattern.lstrip('**/')):
-            return True
-        # Prüfe auch absoluten Pfad
-        if fnmatch.fnmatch(path_str, pattern):
-            return True
-
-    return False
+    return get_exclude_matcher().matches_path(path)
 
-def calculate_content_hash(file_path):
+def calculate_content_hash(file_path, stat=None):
     """
     Berechnet SHA-256 Hash des Dateiinhalts für Duplikat-Erkennung.
+    Ergebnisse werden pro (Pfad, Größe, mtime_ns) zwischengespeichert, d.h. eine
+    unveränderte Datei wird pro Lauf nur einmal gelesen.
 
     Args:
         file_path: Pfad zur Datei
+        stat: Optional - bereits vorhandenes os.stat()-Ergebnis
 
     Returns:
         SHA-256 Hash als Hex-String
     """
     import hashlib
 
+    try:
+        if stat is None:
+            stat = os.stat(file_path)
+        cache_key = (os.fspath(file_path), stat.st_size, stat.st_mtime_ns)
+    except OSError as e:
+        print(f"  → Warnung: Konnte Hash nicht berechnen für {file_path}: {e}")
+        return None
+
+    with _HASH_CACHE_LOCK:
+        cached = _HASH_CACHE.get(cache_key)
+    if cached:
+        return cached
+
     hasher = hashlib.sha256()
     try:
         with open(file_path, 'rb') as f:
-            # Lese in Chunks für große Dateien
-            for chunk in iter(lambda: f.read(8192), b''):
-                hasher.update(chunk)
-        return hasher.hexdigest()
+            if HASH_USE_MMAP and stat.st_size > 0:
+                import mmap
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hasher.update(mapped)
+            else:
+                # Lese in großen Chunks in einen wiederverwendeten Puffer
+                buffer = bytearray(HASH_BUFFER_SIZE)
+                view = memoryview(buffer)
+                while True:
+                    n = f.readinto(buffer)
+                    if not n:
+                        break
+                    hasher.update(view[:n])
+        content_hash = hasher.hexdigest()
     except Exception as e:
         print(f"  → Warnung: Konnte Hash nicht berechnen für {file_path}: {e}")
         return None
 
+    with _HASH_CACHE_LOCK:
+        _HASH_CACHE[cache_key] = content_hash
+    return content_hash
+
+def seed_content_hash(file_path, stat, content_hash):
+    """
+    Übernimmt einen bereits bekannten Hash (z.B. aus dem Manifest) in den Hash-Cache,
+    sodass calculate_content_hash() die Datei nicht erneut liest.
+    """
+    if content_hash:
+        with _HASH_CACHE_LOCK:
+            _HASH_CACHE[(os.fspath(file_path), stat.st_size, stat.st_mtime_ns)] = content_hash
+
+def clear_hash_cache():
+    """Leert den Hash-Cache (zu Beginn jedes Laufs)."""
+    with _HASH_CACHE_LOCK:
+        _HASH_CACHE.clear()
+
+def calculate_partial_hash(file_path, file_size):
+    """
+    Berechnet einen SHA-256 über die ersten und letzten PARTIAL_HASH_BYTES einer Datei.
+    Dient als Vorfilter: nur bei gleichem Teil-Hash wird der volle Hash berechnet.
+
+    Returns:
+        Teil-Hash als Hex-String oder None bei Lesefehler
+    """
+    import hashlib
+
+    hasher = hashlib.sha256()
+    try:
+        with open(file_path, 'rb') as f:
+            if file_size <= 2 * PARTIAL_HASH_BYTES:
+                hasher.update(f.read())
+            else:
+                hasher.update(f.read(PARTIAL_HASH_BYTES))
+                f.seek(file_size - PARTIAL_HASH_BYTES)
+                hasher.update(f.read(PARTIAL_HASH_BYTES))
+        _DUPLICATE_STATS['partial_hashes'] += 1
+        return hasher.hexdigest()
+    except Exception as e:
+        print(f"  → Warnung: Konnte Teil-Hash nicht berechnen für {file_path}: {e}")
+        return None
+
+def _persist_duplicate_entry(file_path, file_size, partial_hash=None, content_hash=None):
+    """Schreibt den Stand einer Datei in den persistenten Duplikat-Index (falls aktiv)."""
+    if _DUPLICATE_INDEX is None:
+        return
+    try:
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        _DUPLICATE_INDEX.record_duplicate_entry(os.fspath(file_path), file_size, mtime_ns,
+                                                partial_hash, content_hash)
+    except Exception:
+        pass
+
+def _forget_indexed_file(file_path):
+    """Entfernt eine veraltete Datei aus früheren Läufen aus allen Duplikat-Strukturen."""
+    entry = _DUP_INDEX_ENTRIES.pop(file_path, None)
+    if entry is None:
+        return
+    size, _, partial_hash, content_hash = entry
+    if _SIZE_FIRST_SEEN.get(size) == file_path:
+        del _SIZE_FIRST_SEEN[size]
+    pending = _PARTIAL_HASH_CACHE.get(size, {}).get(partial_hash)
+    if pending and file_path in pending:
+        pending.remove(file_path)
+    if content_hash and _SIZE_HASH_CACHE.get(size, {}).get(content_hash) == file_path:
+        del _SIZE_HASH_CACHE[size][content_hash]
+    if _DUPLICATE_INDEX is not None:
+        _DUPLICATE_INDEX.forget_duplicate_entry(file_path)
+
+def _indexed_file_valid(file_path):
+    """
+    Prüft eine Datei aus dem persistenten Index lazy per mtime. Dateien aus dem
+    aktuellen Lauf gelten immer als gültig; veraltete Einträge werden entfernt.
+    """
+    entry = _DUP_INDEX_ENTRIES.get(file_path)
+    if entry is None:
+        return True
+    try:
+        if os.stat(file_path).st_mtime_ns == entry[1]:
+            return True
+    except OSError:
+        pass
+    _forget_indexed_file(file_path)
+    return False
+
+def load_duplicate_index(manifest):
+    """
+    Lädt den persistenten Duplikat-Index (size → hash → path) aus früheren Läufen.
+    Die Einträge werden erst bei Verwendung per mtime validiert, sodass der Start
+    keine Quelldateien anfasst.
+
+    Returns:
+        Anzahl geladener Einträge
+    """
+    global _DUPLICATE_INDEX
+
+    for cache in (_SIZE_HASH_CACHE, _SIZE_FIRST_SEEN, _PARTIAL_HASH_CACHE,
+                  _PARTIAL_FULL_HASHES, _SIZES_WITHOUT_PARTIAL, _DUP_INDEX_ENTRIES):
+        cache.clear()
+    _DUPLICATE_INDEX = manifest
+
+    count = 0
+    for path, size, mtime_ns, partial_hash, content_hash in manifest.iter_duplicate_entries():
+        _DUP_INDEX_ENTRIES[path] = (size, mtime_ns, partial_hash, content_hash)
+        count += 1
+        if content_hash:
+            _SIZE_HASH_CACHE.setdefault(size, {}).setdefault(content_hash, path)
+            if partial_hash:
+                _PARTIAL_FULL_HASHES.setdefault(size, {}).setdefault(partial_hash, set()).add(content_hash)
+            else:
+                _SIZES_WITHOUT_PARTIAL.add(size)
+            # Hash-Cache vorbelegen: unveränderte Dateien werden nicht erneut gelesen
+            with _HASH_CACHE_LOCK:
+                _HASH_CACHE[(path, size, mtime_ns)] = content_hash
+        elif partial_hash:
+            _PARTIAL_HASH_CACHE.setdefault(size, {}).setdefault(partial_hash, []).append(path)
+        else:
+            _SIZE_FIRST_SEEN.setdefault(size, path)
+    return count
+
+def close_duplicate_index():
+    """Trennt den persistenten Duplikat-Index (Schreibvorgänge laufen über das Manifest)."""
+    global _DUPLICATE_INDEX
+    _DUPLICATE_INDEX = None
+    _DUP_INDEX_ENTRIES.clear()
+
+def register_known_file(file_path, file_size, content_hash):
+    """
+    Trägt eine Datei mit bereits bekanntem Hash (z.B. aus dem Manifest) in die
+    Duplikat-Erkennung ein, ohne sie zu lesen.
+    """
+    if content_hash:
+        _SIZE_HASH_CACHE.setdefault(file_size, {}).setdefault(content_hash, file_path)
+        _SIZES_WITHOUT_PARTIAL.add(file_size)
+
+def _register_full_hash(file_path, file_size, partial_hash):
+    """Berechnet den vollen Hash einer Datei und trägt ihn ein. Gibt den Hash zurück."""
+    file_hash = calculate_content_hash(file_path)
+    if file_hash:
+        _DUPLICATE_STATS['full_hashes'] += 1
+        _SIZE_HASH_CACHE.setdefault(file_size, {}).setdefault(file_hash, file_path)
+        _PARTIAL_FULL_HASHES.setdefault(file_size, {}).setdefault(partial_hash, set()).add(file_hash)
+        _persist_duplicate_entry(file_path, file_size, partial_hash, file_hash)
+    return file_hash
+
 def is_duplicate_file(file_path, file_size):
     """
     Prüft ob eine Datei ein Duplikat einer bereits verarbeiteten Datei ist.
-    Verwendet Größe + Content-Hash für effiziente Duplikat-Erkennung.
+    Gestufte Prüfung, der volle Content-Hash wird nur bei Bedarf berechnet:
+    1. Dateigröße - neue Größe kann kein Duplikat sein (kein Lesen)
+    2. Teil-Hash über Anfang und Ende der Datei
+    3. Voller SHA-256 nur wenn auch die Teil-Hashes kollidieren
 
     Args:
         file_path: Pfad zur zu prüfenden Datei
@@ -836,70 +1821,239 @@ def is_duplicate_file(file_path, file_size):
     Returns:
         (is_duplicate, original_path) - Tuple mit Boolean und Pfad zum Original (oder None)
     """
-    global _SIZE_HASH_CACHE
+    file_path = os.fspath(file_path)
+
+    # Datei aus einem früheren Lauf: unverändert → gespeicherte Hashes gelten weiter
+    if file_path in _DUP_INDEX_ENTRIES and _indexed_file_valid(file_path):
+        content_hash = _DUP_INDEX_ENTRIES[file_path][3]
+        original_path = _SIZE_HASH_CACHE.get(file_size, {}).get(content_hash) if content_hash else None
+        if original_path and original_path != file_path and _indexed_file_valid(original_path):
+            return True, original_path
+        if content_hash:
+            # Früheres Original ist weggefallen - diese Datei übernimmt
+            _SIZE_HASH_CACHE.setdefault(file_size, {}).setdefault(content_hash, file_path)
+        return False, None
 
     # Schritt 1: Prüfe ob Dateigröße bereits bekannt
-    if file_size not in _SIZE_HASH_CACHE:
-        # Neue Größe - kann kein Duplikat sein
-        _SIZE_HASH_CACHE[file_size] = {}
-        file_hash = calculate_content_hash(file_path)
-        if file_hash:
-            _SIZE_HASH_CACHE[file_size][file_hash] = file_path
+    if (file_size not in _SIZE_FIRST_SEEN and file_size not in _PARTIAL_HASH_CACHE
+            and file_size not in _SIZE_HASH_CACHE):
+        # Neue Größe - kann kein Duplikat sein, Hash erst bei der nächsten Datei gleicher Größe
+        _SIZE_FIRST_SEEN[file_size] = file_path
+        _DUPLICATE_STATS['by_size'] += 1
+        _DECIDED_WITHOUT_FULL_HASH.add(file_path)
+        _persist_duplicate_entry(file_path, file_size)
+        return False, None
+
+    # Schritt 2: Größe existiert - vergleiche Teil-Hashes
+    partials = _PARTIAL_HASH_CACHE.setdefault(file_size, {})
+    first_path = _SIZE_FIRST_SEEN.pop(file_size, None)
+    if first_path is not None and _indexed_file_valid(first_path):
+        first_partial = calculate_partial_hash(first_path, file_size)
+        if first_partial:
+            partials.setdefault(first_partial, []).append(first_path)
+            _persist_duplicate_entry(first_path, file_size, first_partial)
+
+    partial_hash = calculate_partial_hash(file_path, file_size)
+    if not partial_hash:
+        # Hash-Berechnung fehlgeschlagen - behandle nicht als Duplikat
+        return False, None
+
+    pending = partials.get(partial_hash)
+    known_full = _PARTIAL_FULL_HASHES.get(file_size, {}).get(partial_hash)
+    if not pending and not known_full and file_size not in _SIZES_WITHOUT_PARTIAL:
+        # Kein anderer Inhalt mit diesem Anfang/Ende - kein Duplikat
+        partials.setdefault(partial_hash, []).append(file_path)
+        _DUPLICATE_STATS['by_partial'] += 1
+        _DECIDED_WITHOUT_FULL_HASH.add(file_path)
+        _persist_duplicate_entry(file_path, file_size, partial_hash)
         return False, None
 
-    # Schritt 2: Größe existiert - berechne Hash und prüfe
+    # Schritt 3: Teil-Hash kollidiert - volle Hashes berechnen (frühere Dateien zuerst,
+    # damit die zuerst gesehene Datei das Original bleibt)
+    for earlier_path in partials.pop(partial_hash, []):
+        if _indexed_file_valid(earlier_path):
+            _register_full_hash(earlier_path, file_size, partial_hash)
+
     file_hash = calculate_content_hash(file_path)
     if not file_hash:
         # Hash-Berechnung fehlgeschlagen - behandle nicht als Duplikat
         return False, None
+    _DUPLICATE_STATS['full_hashes'] += 1
 
-    # Schritt 3: Prüfe ob Hash bereits existiert
-    if file_hash in _SIZE_HASH_CACHE[file_size]:
-        original_path = _SIZE_HASH_CACHE[file_size][file_hash]
+    # Prüfe ob Hash bereits existiert
+    original_path = _SIZE_HASH_CACHE.get(file_size, {}).get(file_hash)
+    if original_path and original_path != file_path and _indexed_file_valid(original_path):
+        _persist_duplicate_entry(file_path, file_size, partial_hash, file_hash)
         return True, original_path
 
-    # Schritt 4: Neuer Hash für diese Größe - speichere
-    _SIZE_HASH_CACHE[file_size][file_hash] = file_path
+    # Neuer Hash für diese Größe - speichere
+    _SIZE_HASH_CACHE.setdefault(file_size, {})[file_hash] = file_path
+    _PARTIAL_FULL_HASHES.setdefault(file_size, {}).setdefault(partial_hash, set()).add(file_hash)
+    _persist_duplicate_entry(file_path, file_size, partial_hash, file_hash)
     return False, None
 
-def extract_contact_info_from_text(text):
+def get_duplicate_stats():
     """
-    Extrahiert URLs, E-Mail-Adressen und Telefonnummern aus Text mittels Regex.
-    Sehr schnell (keine LLM-Aufrufe), ideal für inkrementelle Updates.
+    Statistik der Duplikat-Erkennung.
 
-    Args:
-        text: Der zu durchsuchende Text
+    full_hashes_avoided zählt nur Dateien, die ohne vollen Hash entschieden und auch danach
+    (Validierung, Analyse) nicht vollständig gehasht wurden.
 
     Returns:
-        dict: {'urls': [...], 'emails': [...], 'phone_numbers': [...]}
+        dict: by_size / by_partial (ohne vollen Hash entschieden), partial_hashes, full_hashes,
+              full_hashes_avoided
     """
-    import re
+    stats = dict(_DUPLICATE_STATS)
+    # Diese Pfade stammen nie aus dem Manifest, ein Eintrag im Hash-Cache heißt also: gelesen
+    with _HASH_CACHE_LOCK:
+        hashed_paths = {key[0] for key in _HASH_CACHE}
+    stats['full_hashes_avoided'] = len(_DECIDED_WITHOUT_FULL_HASH - hashed_paths)
+    return stats
+
+# Vorkompilierte Pattern für extract_contact_info_from_text() und validate_phone_number()
+# URL: http(s)://, www., und gängige Domains
+# WICHTIG: Schließt Satzzeichen am Ende aus und stoppt bei @-Zeichen (E-Mail-Grenze)
+_URL_RE = re.compile(r'(?:https?://|www\.)(?:[A-Za-z0-9\-._~:/?#\[\]!$&\'()*+,;=%]+[A-Za-z0-9\-_~/?#\[\]$&*+=%]|[A-Za-z0-9\-._~:/?#\[\]!$&\'()*+,;=%])', re.IGNORECASE)
+_URL_TRAILING_WORD_RE = re.compile(r'-[A-Za-z]+$')
+# E-Mail: Striktes Pattern - nur alphanumerische Zeichen, ., _, %, +, - im local part
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9][A-Za-z0-9._%+-]*@[A-Za-z0-9][A-Za-z0-9.-]*\.[A-Za-z]{2,}\b')
+_EMAIL_LOCAL_SPLIT_RE = re.compile(r'[-\s]')
+_NON_DIGIT_RE = re.compile(r'\D')
+
+# Telefonnummern (verschiedene Formate)
+# Deutsche Formate: +49, 0049, (0), mit/ohne Leerzeichen, Bindestriche, Klammern
+# WICHTIG: Strenge Pattern um False Positives zu vermeiden (z.B. Projektnummern)
+PHONE_PATTERNS = [
+    r'\+49[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,10}',  # +49 30 12345678 oder +49(30)12345678
+    r'\+49[\s\-]?\d{2,4}[\s\-/]\d{6,10}',        # +49 30/12345678
+    r'0049[\s\-]?\d{2,4}[\s\-]?\d{6,10}',        # 0049 30 12345678
+    r'\(0\d{2,4}\)[\s\-]?\d{6,10}',              # (030) 12345678 (Mindest 6 Ziffern nach Vorwahl!)
+    r'0\d{2,4}[\s\-/]\d{6,10}',                # 030/12345678 (Mindest 6 Ziffern!)
+    r'0\d{9,11}',                               # 03012345678 (ohne Separator, mind. 10 Ziffern)
+]
+# Bei der Extraktion müssen die letzten beiden Formate an Wortgrenzen stehen
+_PHONE_EXTRACT_RES = [re.compile(p) for p in PHONE_PATTERNS[:4]] + \
+                     [re.compile(r'\b' + p + r'\b') for p in PHONE_PATTERNS[4:]]
+# Feste Präfixe der ersten vier Formate (Suche entfällt, wenn das Präfix nicht im Text vorkommt)
+_PHONE_PREFIXES = ['+49', '+49', '0049', '(0']
+# Gemeinsamer Kandidaten-Scan für die Formate ohne Präfix (beide beginnen mit \b0 und mind. 2 Ziffern)
+_PHONE_CANDIDATE_RE = re.compile(r'0\d\d')
+# Validierung: Nummer muss vollständig einem der Formate entsprechen
+_PHONE_VALIDATE_RE = re.compile('^(?:' + '|'.join(PHONE_PATTERNS) + ')$')
+# Kleingeschriebene URL-Präfixe (Suche im Text.lower() statt IGNORECASE an jeder Position)
+# "ſ" (langes s) entspricht bei IGNORECASE einem "s", bleibt beim lower() aber erhalten
+_URL_PREFIX_LOWER_RE = re.compile(r'http[sſ]?://|www\.')
+# Zeichen, die an eine E-Mail-Adresse angrenzen können, ohne eine Wortgrenze zu bilden
+_EMAIL_RUN_RE = re.compile(r'[\w.%+@-]*')
+
+def _find_urls(text):
+    """
+    Sucht URLs wie _URL_RE.findall(text), prüft aber nur Positionen mit URL-Präfix.
 
-    contact_info = {
-        'urls': [],
-        'emails': [],
-        'phone_numbers': []
-    }
+    Returns:
+        list: Gefundene URLs (roh, noch nicht bereinigt)
+    """
+    lower_text = text.lower()
+    if len(lower_text) != len(text):
+        # Sehr seltene Zeichen ändern beim lower() die Länge - dann klassisch suchen
+        return _URL_RE.findall(text)
+
+    urls = []
+    last_end = 0
+    for prefix in _URL_PREFIX_LOWER_RE.finditer(lower_text):
+        if prefix.start() < last_end:
+            continue
+        match = _URL_RE.match(text, prefix.start())
+        if match:
+            urls.append(match.group())
+            last_end = match.end()
+    return urls
 
-    if not text:
-        return contact_info
+def _find_emails(text):
+    """
+    Sucht E-Mail-Adressen wie _EMAIL_RE.findall(text), aber nur in den Zeichenfolgen rund um ein '@'.
 
-    # URL-Extraktion
-    # Findet http(s)://, www., und gängige Domains
-    # WICHTIG: Schließt Satzzeichen am Ende aus und stoppt bei @-Zeichen (E-Mail-Grenze)
-    url_pattern = r'(?:https?://|www\.)(?:[A-Za-z0-9\-._~:/?#\[\]!$&\'()*+,;=%]+[A-Za-z0-9\-_~/?#\[\]$&*+=%]|[A-Za-z0-9\-._~:/?#\[\]!$&\'()*+,;=%])'
-    raw_urls = re.findall(url_pattern, text, re.IGNORECASE)
+    Eine Adresse besteht nur aus Wortzeichen und ".%+@-". Jeder Ausschnitt endet an einem Zeichen
+    außerhalb dieser Menge, das auch kein Wortzeichen ist - Treffer und Wortgrenzen (\\b) sind
+    daher dieselben wie bei der Suche im Gesamttext.
 
-    # Bereinige URLs: Entferne trailing Satzzeichen und @ (stoppt bei E-Mail)
+    Returns:
+        list: Gefundene E-Mail-Adressen (roh, noch nicht bereinigt)
+    """
+    emails = []
+    window_end = 0
+    at_pos = text.find('@')
+    while at_pos != -1:
+        # Anfang der Zeichenfolge rückwärts suchen (höchstens bis zum vorherigen Ausschnitt)
+        start = at_pos
+        while start > window_end and (text[start - 1].isalnum() or text[start - 1] in '_.%+@-'):
+            start -= 1
+        window_end = _EMAIL_RUN_RE.match(text, at_pos).end()
+        emails.extend(_EMAIL_RE.findall(text, start, window_end))
+        at_pos = text.find('@', window_end)
+    return emails
+
+def _find_phone_candidates(text):
+    """
+    Sucht alle Formate aus PHONE_PATTERNS und liefert dieselben Treffer in derselben Reihenfolge
+    wie ein re.findall() pro Format nacheinander.
+
+    Formate mit festem Präfix werden nur gesucht, wenn das Präfix vorkommt. Die beiden Formate
+    ohne Präfix teilen sich einen Kandidaten-Scan; pro Format wird das Ende des letzten Treffers
+    gemerkt, so dass sich Treffer desselben Formats wie bei findall nicht überlappen.
+
+    Returns:
+        list: Gefundene Nummern im Originalformat (Format 1 zuerst, dann Format 2, ...)
+    """
+    found = []
+    for prefix, pattern in zip(_PHONE_PREFIXES, _PHONE_EXTRACT_RES):
+        found.append(pattern.findall(text) if prefix in text else [])
+
+    unprefixed = _PHONE_EXTRACT_RES[len(_PHONE_PREFIXES):]
+    unprefixed_found = [[] for _ in unprefixed]
+    last_end = [0] * len(unprefixed)
+    for candidate in _PHONE_CANDIDATE_RE.finditer(text):
+        pos = candidate.start()
+        for i, pattern in enumerate(unprefixed):
+            if pos < last_end[i]:
+                continue
+            match = pattern.match(text, pos)
+            if match:
+                unprefixed_found[i].append(match.group())
+                last_end[i] = match.end()
+
+    return [phone for matches in found + unprefixed_found for phone in matches]
+
+def extract_contact_info_from_text(text):
+    """
+    Extrahiert URLs, E-Mail-Adressen und Telefonnummern aus Text mittels Regex.
+    Sehr schnell (keine LLM-Aufrufe), ideal für inkrementelle Updates.
+
+    Args:
+        text: Der zu durchsuchende Text
+
+    Returns:
+        dict: {'urls': [...], 'emails': [...], 'phone_numbers': [...]}
+    """
+    contact_info = {
+        'urls': [],
+        'emails': [],
+        'phone_numbers': []
+    }
+
+    if not text:
+        return contact_info
+
+    # URL-Extraktion
     cleaned_urls = []
-    for url in raw_urls:
+    for url in _find_urls(text):
         # Stoppe bei @ (trennt URL von E-Mail)
         if '@' in url:
             url = url.split('@')[0]
-        # Entferne trailing Satzzeichen: ), ., ,, ;, :, !, und -Buchstaben (vor E-Mail local part)
-        url = re.sub(r'[).,;:!]+$', '', url)
+        # Entferne trailing Satzzeichen: ), ., ,, ;, :, !
+        url = url.rstrip(').,;:!')
         # Entferne "-Wort" Pattern am Ende (z.B. "-Hallo" vor E-Mail)
-        url = re.sub(r'-[A-Za-z]+$', '', url)
+        url = _URL_TRAILING_WORD_RE.sub('', url)
         # Nur URLs mit mindestens einem . im Domain-Teil
         if '.' in url and len(url) > 5:
             cleaned_urls.append(url)
@@ -907,20 +2061,15 @@ def extract_contact_info_from_text(text):
     contact_info['urls'] = list(set(cleaned_urls))  # Duplikate entfernen
 
     # E-Mail-Extraktion
-    # WICHTIG: Striktes Pattern - nur alphanumerische Zeichen, ., _, %, +, - im local part
-    # Kein www. oder andere URL-Prefixe vor dem @
-    email_pattern = r'\b[A-Za-z0-9][A-Za-z0-9._%+-]*@[A-Za-z0-9][A-Za-z0-9.-]*\.[A-Za-z]{2,}\b'
-    raw_emails = re.findall(email_pattern, text)
-
-    # Bereinige E-Mails: Entferne ungültige Prefixe
     cleaned_emails = []
-    for email in raw_emails:
+    for email in _find_emails(text):
         # Prüfe ob URL-Muster im local part (www., http)
         local_part = email.split('@')[0]
-        if 'www.' in local_part.lower() or 'http' in local_part.lower():
+        local_lower = local_part.lower()
+        if 'www.' in local_lower or 'http' in local_lower:
             # Extrahiere nur den Teil nach dem letzten '-' oder Leerzeichen
             # z.B. "BOOKPLAYGmbH-www.book-play.de-Hallo@book-play.de" -> "Hallo@book-play.de"
-            parts = re.split(r'[-\s]', local_part)
+            parts = _EMAIL_LOCAL_SPLIT_RE.split(local_part)
             if parts:
                 local_part = parts[-1]
                 email = f"{local_part}@{email.split('@')[1]}"
@@ -931,46 +2080,50 @@ def extract_contact_info_from_text(text):
 
     contact_info['emails'] = list(set(cleaned_emails))
 
-    # Telefonnummer-Extraktion (verschiedene Formate)
-    # Deutsche Formate: +49, 0049, (0), mit/ohne Leerzeichen, Bindestriche, Klammern
-    # WICHTIG: Strenge Pattern um False Positives zu vermeiden (z.B. Projektnummern)
-    phone_patterns = [
-        r'\+49[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,10}',  # +49 30 12345678 oder +49(30)12345678
-        r'\+49[\s\-]?\d{2,4}[\s\-/]\d{6,10}',        # +49 30/12345678
-        r'0049[\s\-]?\d{2,4}[\s\-]?\d{6,10}',        # 0049 30 12345678
-        r'\(0\d{2,4}\)[\s\-]?\d{6,10}',              # (030) 12345678 (Mindest 6 Ziffern nach Vorwahl!)
-        r'\b0\d{2,4}[\s\-/]\d{6,10}\b',              # 030/12345678 (Mindest 6 Ziffern!)
-        r'\b0\d{9,11}\b',                             # 03012345678 (ohne Separator, mind. 10 Ziffern)
-    ]
-
-    phone_numbers = []
-    for pattern in phone_patterns:
-        matches = re.findall(pattern, text)
-        phone_numbers.extend(matches)
-
-    # Bereinige und dedupliziere Telefonnummern
+    # Telefonnummern: alle Formate gemeinsam suchen, dann bereinigen und deduplizieren
     cleaned_phones = []
-    for phone in phone_numbers:
-        # Normalisiere: Entferne Leerzeichen für Vergleich
-        normalized = re.sub(r'[\s\-/()]', '', phone)
-        digits_only = re.sub(r'\D', '', normalized)
+    seen_phones = set()
+    for phone in _find_phone_candidates(text):
+        if phone in seen_phones:
+            continue
+        digits_only = _NON_DIGIT_RE.sub('', phone)
 
         # Strikte Validierung:
         # - Mindestens 8 Ziffern (echte Telefonnummern)
         # - Nicht nur 4-stellige Jahreszahlen (z.B. "2024")
         # - Nicht kurze Nummern wie "091-2024" (nur 7 Ziffern ohne führende 0)
-        if len(digits_only) >= 8:
-            # Prüfe ob es wie eine echte Telefonnummer aussieht
-            # Beginnt mit 0, +49, oder 0049?
-            if digits_only.startswith('0') or digits_only.startswith('49'):
-                # Behalte Originalformat für Lesbarkeit
-                if phone not in cleaned_phones:
-                    cleaned_phones.append(phone)
+        # - Beginnt mit 0, +49, oder 0049
+        if len(digits_only) >= 8 and (digits_only.startswith('0') or digits_only.startswith('49')):
+            # Behalte Originalformat für Lesbarkeit
+            seen_phones.add(phone)
+            cleaned_phones.append(phone)
 
     contact_info['phone_numbers'] = cleaned_phones
 
     return contact_info
 
+def extract_contact_info_batch(texts):
+    """
+    Extrahiert Kontaktinformationen aus mehreren Texten in einem Aufruf.
+
+    Identische Texte (z.B. Kopien derselben Datei) werden nur einmal durchsucht.
+
+    Args:
+        texts: Liste von Texten
+
+    Returns:
+        list: Ein dict wie bei extract_contact_info_from_text() pro Text (gleiche Reihenfolge)
+    """
+    results = {}
+    batch = []
+    for text in texts:
+        key = text or ""
+        if key not in results:
+            results[key] = extract_contact_info_from_text(key)
+        # Kopien, damit Aufrufer die Listen unabhängig voneinander ändern können
+        batch.append({field: list(values) for field, values in results[key].items()})
+    return batch
+
 def extract_entities_from_path(file_path):
     """
     Extrahiert potenzielle Firmen-/Projektnamen aus dem Dateipfad.
@@ -1037,6 +2190,171 @@ def extract_entities_from_path(file_path):
 
     return entities
 
+class LLMResponseCache:
+    """
+    Persistenter Cache für LLM-Antworten (SQLite unter DST_ROOT/.fileinventory).
+
+    Identische Eingaben (z.B. derselbe Vertrag als PDF und DOCX) kosten so nur eine Inferenz.
+    Die Größe ist auf max_bytes begrenzt; bei Überschreitung werden die am längsten nicht
+    mehr genutzten Einträge entfernt (LRU).
+    """
+
+    def __init__(self, db_path, max_bytes):
+        import sqlite3
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {}  # {kind: {'hits': n, 'misses': n}}
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                model TEXT,
+                response TEXT NOT NULL,
+                bytes INTEGER NOT NULL,
+                created TEXT,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM responses").fetchone()[0]
+
+    def _count(self, kind, field):
+        self.stats.setdefault(kind, {'hits': 0, 'misses': 0})[field] += 1
+
+    def get(self, key, kind):
+        """Gibt die gespeicherte Antwort zurück oder None."""
+        with self._lock:
+            row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count(kind, 'misses')
+                return None
+            self._count(kind, 'hits')
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            return row[0]
+
+    def put(self, key, kind, response):
+        """Speichert eine Antwort und hält den Cache unter max_bytes."""
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            old = self.conn.execute("SELECT bytes FROM responses WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, kind, model, response, bytes, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, MODEL_NAME, response, size, datetime.now().isoformat(), time.time())
+            )
+            self.total_bytes += size - (old[0] if old else 0)
+            if self.max_bytes and self.total_bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * 0.9))
+            self.conn.commit()
+
+    def _evict(self, target_bytes):
+        """Entfernt die am längsten ungenutzten Einträge, bis target_bytes erreicht ist."""
+        while self.total_bytes > target_bytes:
+            rows = self.conn.execute(
+                "SELECT key, bytes FROM responses ORDER BY last_used LIMIT 500"
+            ).fetchall()
+            if not rows:
+                self.total_bytes = 0
+                break
+            for key, size in rows:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.total_bytes -= size
+                if self.total_bytes <= target_bytes:
+                    break
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+_LLM_CACHES = {}  # {(pid, db_path): LLMResponseCache} - eine Verbindung pro Prozess
+_LLM_CACHES_LOCK = threading.Lock()
+
+def get_llm_cache():
+    """
+    Gibt den LLM-Antwort-Cache für DST_ROOT im aktuellen Prozess zurück.
+
+    Returns:
+        LLMResponseCache oder None (deaktiviert oder nicht nutzbar)
+    """
+    if not USE_LLM_CACHE:
+        return None
+    try:
+        db_path = os.path.join(get_state_dir(), "llm_cache.sqlite")
+        key = (os.getpid(), db_path)
+        with _LLM_CACHES_LOCK:
+            cache = _LLM_CACHES.get(key)
+            if cache is None:
+                cache = LLMResponseCache(db_path, LLM_CACHE_MAX_MB * 1024 * 1024)
+                _LLM_CACHES[key] = cache
+        return cache
+    except Exception as e:
+        print(f"  → Warnung: LLM-Cache nicht verfügbar: {e}")
+        return None
+
+def llm_cache_key(kind, prompts, temperature, max_tokens, input_text):
+    """
+    Cache-Schlüssel für eine LLM-Anfrage. Der Eingabetext wird vor dem Hashen
+    whitespace-normalisiert, die Prompt-Texte gehen direkt mit ein.
+    """
+    import hashlib
+
+    text_hash = hashlib.sha256(" ".join(input_text.split()).encode('utf-8')).hexdigest()
+    key_data = json.dumps([MODEL_NAME, kind, LLM_PROMPT_VERSION, temperature, max_tokens,
+                           list(prompts), text_hash], ensure_ascii=False)
+    return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
+
+def llm_cache_get(key, kind):
+    """Liest eine Antwort aus dem LLM-Cache (None bei Fehlversuch oder deaktiviertem Cache)."""
+    cache = get_llm_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(key, kind)
+    except Exception as e:
+        print(f"  → Warnung: LLM-Cache nicht lesbar: {e}")
+        return None
+
+def llm_cache_put(key, kind, response):
+    """Speichert eine Antwort im LLM-Cache (falls aktiv)."""
+    cache = get_llm_cache()
+    if cache is None or not response:
+        return
+    try:
+        cache.put(key, kind, response)
+    except Exception as e:
+        print(f"  → Warnung: LLM-Cache nicht beschreibbar: {e}")
+
+def print_llm_cache_stats(cache_stats=None):
+    """
+    Gibt Treffer und Fehlversuche des LLM-Caches im aktuellen Lauf aus.
+
+    Args:
+        cache_stats: Optional - aufsummierte Zähler {kind: {'hits', 'misses'}} aus den
+                     Worker-Prozessen (Wartungsläufe), sonst die des aktuellen Prozesses
+    """
+    cache = _LLM_CACHES.get((os.getpid(), os.path.join(DST_ROOT, STATE_DIR_NAME, "llm_cache.sqlite")))
+    if cache_stats is None:
+        cache_stats = cache.stats if cache is not None else {}
+    cache_stats = {kind: kind_stats for kind, kind_stats in cache_stats.items()
+                   if kind_stats.get('hits', 0) + kind_stats.get('misses', 0)}
+    if not cache_stats:
+        return
+    hits = sum(kind_stats.get('hits', 0) for kind_stats in cache_stats.values())
+    misses = sum(kind_stats.get('misses', 0) for kind_stats in cache_stats.values())
+    total = hits + misses
+    details = ", ".join(f"{kind}: {kind_stats.get('hits', 0)}/{kind_stats.get('hits', 0) + kind_stats.get('misses', 0)}"
+                        for kind, kind_stats in sorted(cache_stats.items()))
+    size = f", {cache.total_bytes / (1024 * 1024):.1f} MB belegt" if cache is not None else ""
+    print(f"LLM-Cache: {hits:,} Treffer, {misses:,} Fehlversuche "
+          f"({hits / total * 100:.1f}% Trefferquote; {details}){size}")
+
 def check_bankdata_context_with_llm(text):
     """
     Prüft via LLM, ob Bankdaten (IBAN/Kontonummern) im Kontext natürlicher oder juristischer Personen stehen.
@@ -1108,33 +2426,43 @@ Beispiele:
 - Rechnung von "Max Mustermann Steuerberater, IBAN..." → TYP: NATÜRLICHE_PERSON
 """
 
+    system_prompt = "Du bist ein DSGVO-Klassifizierungs-Experte. Analysiere sachlich und präzise."
+
     try:
-        payload = {
-            "model": MODEL_NAME,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "Du bist ein DSGVO-Klassifizierungs-Experte. Analysiere sachlich und präzise."
-                },
-                {
-                    "role": "user",
-                    "content": f"{prompt}\n\nTEXT:\n{analysis_text}"
-                }
-            ],
-            "temperature": 0.1,
-            "max_tokens": 200
-        }
+        # Identische Texte nur einmal analysieren (siehe LLMResponseCache)
+        cache_key = llm_cache_key('bankdata', (system_prompt, prompt), 0.1, 200, analysis_text)
+        result_text = llm_cache_get(cache_key, 'bankdata')
+
+        if result_text is None:
+            payload = {
+                "model": MODEL_NAME,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": system_prompt
+                    },
+                    {
+                        "role": "user",
+                        "content": f"{prompt}\n\nTEXT:\n{analysis_text}"
+                    }
+                ],
+                "temperature": 0.1,
+                "max_tokens": 200
+            }
 
-        response = requests.post(
-            LMSTUDIO_API_URL,
-            headers={"Content-Type": "application/json"},
-            json=payload,
-            timeout=30
-        )
+            with llm_request_slot():
+                response = requests.post(
+                    LMSTUDIO_API_URL,
+                    headers={"Content-Type": "application/json"},
+                    json=payload,
+                    timeout=30
+                )
 
-        if response.status_code == 200:
-            result_text = response.json()['choices'][0]['message']['content'].strip()
+            if response.status_code == 200:
+                result_text = response.json()['choices'][0]['message']['content'].strip()
+                llm_cache_put(cache_key, 'bankdata', result_text)
 
+        if result_text is not None:
             # Parse Antwort
             is_private = False
             confidence = 'niedrig'
@@ -1202,8 +2530,6 @@ def classify_sensitive_data(text, file_path=None):
             'matched_keywords': {kategorie: [keywords]}  # Gefundene Keywords pro Kategorie
         }
     """
-    import re
-
     result = {
         'contains_sensitive_data': False,
         'data_categories': [],
@@ -1221,16 +2547,18 @@ def classify_sensitive_data(text, file_path=None):
     highest_protection = None
     protection_levels = {'hoch': 1, 'sehr hoch': 2}
 
+    # Alle Keywords in einem Durchlauf finden (Word-Boundary für präzise Treffer)
+    found_keywords = set()
+    for match in _SENSITIVE_KEYWORD_RE.finditer(search_text):
+        keyword = match.group(1).lower()
+        if keyword not in found_keywords:
+            found_keywords.add(keyword)
+            found_keywords.update(_SENSITIVE_NESTED_KEYWORDS.get(keyword, ()))
+
     # Prüfe jede Kategorie
     for category_name, category_data in SENSITIVE_DATA_KEYWORDS.items():
-        matched_keywords = []
-
-        # Prüfe Keywords in dieser Kategorie
-        for keyword in category_data['keywords']:
-            # Verwende Word-Boundary für präzise Treffer
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            if re.search(pattern, search_text, re.IGNORECASE):
-                matched_keywords.append(keyword)
+        # Keywords in dieser Kategorie (Reihenfolge wie in SENSITIVE_DATA_KEYWORDS)
+        matched_keywords = [keyword for keyword in category_data['keywords'] if keyword in found_keywords]
 
         # Falls mindestens 1 Keyword gefunden wurde
         if matched_keywords:
@@ -1252,8 +2580,7 @@ def classify_sensitive_data(text, file_path=None):
 
     # ZUSÄTZLICHE PRÜFUNG: Bankdaten mit LLM-Kontext-Analyse
     # Prüfe ob Dokument IBAN/Kontonummer enthält
-    bankdata_pattern = r'\b(iban|kontonummer|bankverbindung|bic)\b'
-    if re.search(bankdata_pattern, search_text, re.IGNORECASE):
+    if _BANKDATA_KEYWORD_RE.search(search_text):
         # Führe LLM-basierte Kontext-Analyse durch
         bankdata_check = check_bankdata_context_with_llm(text)
 
@@ -1398,12 +2725,14 @@ WICHTIG:
 - Antworte AUF DEUTSCH
 - Verwende exakt das Format oben"""
 
+    system_prompt = "Du bist ein System zur Extraktion von Named Entities. Extrahiere nur tatsächlich vorhandene Namen in den angegebenen Kategorien."
+
     payload = {
         "model": MODEL_NAME,
         "messages": [
             {
                 "role": "system",
-                "content": "Du bist ein System zur Extraktion von Named Entities. Extrahiere nur tatsächlich vorhandene Namen in den angegebenen Kategorien."
+                "content": system_prompt
             },
             {
                 "role": "user",
@@ -1415,11 +2744,16 @@ WICHTIG:
     }
 
     try:
-        resp = requests.post(LMSTUDIO_API_URL, json=payload, timeout=120)
-        resp.raise_for_status()
+        # Identische Texte nur einmal analysieren (siehe LLMResponseCache)
+        cache_key = llm_cache_key('entities', (system_prompt, entity_prompt), 0.1, 500, truncated_text)
+        response_text = llm_cache_get(cache_key, 'entities')
+        if response_text is None:
+            resp = requests.post(LMSTUDIO_API_URL, json=payload, timeout=120)
+            resp.raise_for_status()
 
-        data = resp.json()
-        response_text = data["choices"][0]["message"]["content"]
+            data = resp.json()
+            response_text = data["choices"][0]["message"]["content"]
+            llm_cache_put(cache_key, 'entities', response_text)
 
         # Parse die strukturierte Antwort
         entities = parse_entity_response(response_text)
@@ -1644,60 +2978,337 @@ def summarize_image_with_lmstudio(image_path, file_ext):
 
 # Globaler Lern-Cache für erfolgreiche Context-Größen
 # Strategie: Graduelle Aufwärts-Exploration mit adaptivem Lernen
-# Struktur: {model_name: {'current_max': int, 'successes': [int], 'consecutive_ok': int, 'last_failed': int}}
+# Struktur: {"server_url|model_name": {'current_max': int, 'successes': [int], 'consecutive_ok': int, 'last_failed': int}}
+# Wird pro Server und Modell in DST_ROOT/.fileinventory/llm_state.json gesichert und beim
+# nächsten Lauf übernommen, damit nicht erneut per HTTP 400 nach der Grenze gesucht werden muss
 _LEARNED_MAX_CHARS = {}
+_LLM_STATE_LOCK = threading.Lock()
+LLM_STATE_FILE = "llm_state.json"
 
-def summarize_with_lmstudio(text, file_path=None, file_ext=None, max_chars=30000, summary_max_chars=1500):
-    # Adaptive Textkürzung mit automatischem Retry bei Context-Overflow
-    # ministral-3-14b-reasoning hat größeres Context-Fenster
-    # Start mit ~30000 Zeichen (~7500 Tokens), bei Fehler schrittweise reduzieren
+def _llm_state_key():
+    """Schlüssel für gelernte Werte: Server-URL und Modell (ein anderes Modell hat andere Grenzen)."""
+    return f"{LMSTUDIO_API_URL}|{MODEL_NAME}"
 
-    # Stelle sicher, dass file_ext ein String ist
-    if file_ext and not isinstance(file_ext, str):
-        raise TypeError(f"file_ext muss ein String sein, nicht {type(file_ext)}")
+def load_llm_state():
+    """
+    Liest den gesicherten Lernstand aller Server/Modelle.
 
-    # Prüfe ob es sich um eine Bilddatei handelt
-    is_image = file_ext and file_ext.lower() in {".png", ".jpg", ".jpeg"}
+    Returns:
+        dict: {"server_url|model_name": {"url", "model", "updated", <Bereich>: {...}}}
+    """
+    try:
+        with open(os.path.join(get_state_dir(), LLM_STATE_FILE), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return state.get('models', {}) if state.get('version') == 1 else {}
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return {}
 
-    if is_image and file_path:
-        # Für Bilder: Verwende Vision API
-        return summarize_image_with_lmstudio(file_path, file_ext)
+def save_llm_state(section, values):
+    """
+    Sichert einen Bereich (z.B. "context") des Lernstands für den aktuellen Server und das Modell.
+    Einträge anderer Server/Modelle bleiben erhalten.
+    """
+    key = _llm_state_key()
+    with _LLM_STATE_LOCK:
+        try:
+            models = load_llm_state()
+            entry = models.setdefault(key, {"url": LMSTUDIO_API_URL, "model": MODEL_NAME})
+            entry[section] = values
+            entry["updated"] = datetime.now().isoformat()
+
+            path = os.path.join(get_state_dir(), LLM_STATE_FILE)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": 1, "models": models}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"  → Warnung: Lernstand konnte nicht gespeichert werden: {e}")
 
-    # Entferne problematische Zeichen und normalisiere Whitespace
-    text = text.strip()
-    if not text:
-        raise ValueError("Text ist leer nach Bereinigung")
+def _get_learned_context(max_chars):
+    """
+    Gibt den Lernstand der Context-Größe für Server und Modell zurück.
+    Beim ersten Zugriff im Lauf wird der gesicherte Stand geladen, sonst konservativ gestartet.
+    Ein Stand, der mit einem anderen --max-tokens gelernt wurde, wird verworfen.
+    """
+    key = _llm_state_key()
+    learned_data = _LEARNED_MAX_CHARS.get(key)
+    if learned_data is not None:
+        return learned_data
+
+    with _LLM_STATE_LOCK:
+        saved = load_llm_state().get(key, {}).get('context')
+    if saved and saved.get('max_context_tokens') != MAX_CONTEXT_TOKENS:
+        print(f"  → Hinweis: Gelernte Context-Größe für {MODEL_NAME} stammt von einem anderen "
+              f"Context-Limit und wird neu ermittelt")
+        saved = None
+    if saved and saved.get('current_max'):
+        learned_data = {
+            'current_max': min(int(saved['current_max']), max_chars),
+            'successes': list(saved.get('successes', []))[-10:],
+            'consecutive_ok': int(saved.get('consecutive_ok', 0)),
+            'last_failed': saved.get('last_failed')
+        }
+        message = (f"  → Gelernte Context-Größe für {MODEL_NAME} übernommen: "
+                   f"{learned_data['current_max']:,} Zeichen")
+        if learned_data['last_failed']:
+            message += f" (Fehlergrenze: {learned_data['last_failed']:,})"
+    else:
+        learned_data = {
+            'current_max': max_chars // 2,  # Start konservativ bei 50% vom Maximum
+            'successes': [],                # Liste der letzten 10 erfolgreichen Größen
+            'consecutive_ok': 0,            # Zähler für aufeinanderfolgende Erfolge
+            'last_failed': None             # Letzte fehlgeschlagene Größe (obere Grenze)
+        }
+        message = None
 
-    # Wenn der Text kürzer als die Zielgröße ist, kopiere ihn direkt
-    if len(text) <= summary_max_chars:
-        print(f"Text ({len(text)} Zeichen) ist kürzer als Zielgröße ({summary_max_chars}), kopiere Original")
-        return text
+    # setdefault statt Zuweisung, da im Pipeline-Modus mehrere Threads gleichzeitig starten
+    result = _LEARNED_MAX_CHARS.setdefault(key, learned_data)
+    if message and result is learned_data:
+        print(message)
+    return result
+
+def _save_learned_context(learned_data):
+    """Sichert den Lernstand nach einer Änderung (Erfolg oder Context-Overflow)."""
+    save_llm_state("context", {
+        'max_context_tokens': MAX_CONTEXT_TOKENS,
+        'current_max': learned_data['current_max'],
+        'successes': list(learned_data['successes']),
+        'consecutive_ok': learned_data['consecutive_ok'],
+        'last_failed': learned_data['last_failed']
+    })
+
+class TokenBudget:
+    """
+    Bemisst Prompts in Tokens statt mit einer festen Annahme von Zeichen pro Token.
+
+    Exakte Zählung über TOKENIZER_FILE oder den /tokenize-Endpoint des Servers (einmal pro Lauf
+    geprüft). Ohne beides werden Zeichen pro Token für Eingabe und Antwort aus den "usage"-Angaben
+    der Antworten kalibriert (laufender Mittelwert) und in llm_state.json gesichert.
+    """
+
+    # Zusätzliche Tokens pro Chat-Nachricht (Rollen- und Template-Markierungen)
+    MESSAGE_OVERHEAD_TOKENS = 8
+    # Ab so vielen Kalibrierungswerten gilt die Schätzung als verlässlich
+    MIN_SAMPLES = 3
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokenizer = None
+        self._endpoint_url = None
+        self._exact = None  # None = noch nicht geprüft
+
+        with _LLM_STATE_LOCK:
+            saved = load_llm_state().get(_llm_state_key(), {}).get('tokens') or {}
+        self.input_chars_per_token = float(saved.get('input_chars_per_token') or DEFAULT_CHARS_PER_TOKEN)
+        self.output_chars_per_token = float(saved.get('output_chars_per_token') or DEFAULT_OUTPUT_CHARS_PER_TOKEN)
+        self.input_samples = int(saved.get('input_samples', 0))
+        self.output_samples = int(saved.get('output_samples', 0))
+
+    def _check_exact(self):
+        """Prüft einmalig, ob ein lokaler Tokenizer oder der /tokenize-Endpoint verfügbar ist."""
+        if self._exact is not None:
+            return self._exact
+        with self._lock:
+            if self._exact is None:
+                self._exact = self._probe_exact()
+        return self._exact
+
+    def _probe_exact(self):
+        if TOKENIZER_FILE:
+            try:
+                from tokenizers import Tokenizer
+                self._tokenizer = Tokenizer.from_file(os.path.expanduser(TOKENIZER_FILE))
+                print(f"  → Token-Budget: lokaler Tokenizer {TOKENIZER_FILE}")
+                return True
+            except ImportError:
+                print("  → Warnung: Für --tokenizer wird das Paket 'tokenizers' benötigt (pip install tokenizers)")
+            except Exception as e:
+                print(f"  → Warnung: Tokenizer nicht ladbar: {e}")
+        if USE_TOKENIZE_ENDPOINT:
+            self._endpoint_url = LMSTUDIO_API_URL.split('/v1/')[0] + '/tokenize'
+            if self._count_endpoint("Test") is not None:
+                print(f"  → Token-Budget: Server-Endpoint {self._endpoint_url}")
+                return True
+            self._endpoint_url = None
+        return False
+
+    def _count_endpoint(self, text):
+        try:
+            resp = requests.post(self._endpoint_url, json={"content": text}, timeout=60)
+            if resp.status_code != 200:
+                return None
+            tokens = resp.json().get("tokens")
+            return len(tokens) if isinstance(tokens, list) else None
+        except (requests.exceptions.RequestException, ValueError, AttributeError):
+            return None
+
+    @property
+    def exact(self):
+        return self._check_exact()
+
+    @property
+    def reliable(self):
+        """True wenn exakt gezählt wird oder die Kalibrierung genug Werte hat."""
+        return self.exact or self.input_samples >= self.MIN_SAMPLES
+
+    def count(self, text):
+        """
+        Returns:
+            int: Anzahl Tokens (exakt) oder None, wenn nicht exakt gezählt werden kann
+        """
+        if not self._check_exact():
+            return None
+        if self._tokenizer is not None:
+            return len(self._tokenizer.encode(text, add_special_tokens=False).ids)
+        tokens = self._count_endpoint(text)
+        if tokens is None:
+            print("  → Warnung: /tokenize-Endpoint nicht mehr erreichbar, nutze Kalibrierung")
+            self._exact, self._endpoint_url = False, None
+        return tokens
+
+    def estimate_tokens(self, text_or_chars):
+        """Tokens eines Textes (exakt falls möglich) bzw. geschätzt aus einer Zeichenanzahl."""
+        if isinstance(text_or_chars, str):
+            tokens = self.count(text_or_chars)
+            if tokens is not None:
+                return tokens
+            text_or_chars = len(text_or_chars)
+        return int(text_or_chars / self.input_chars_per_token) + 1
+
+    def chars_for_tokens(self, tokens):
+        """Geschätzte Zeichenanzahl für tokens Eingabe-Tokens."""
+        return max(0, int(tokens * self.input_chars_per_token))
+
+    def output_tokens(self, chars):
+        """
+        max_tokens für eine Antwort von etwa chars Zeichen.
+        Der gemessene Mittelwert lässt keinen Spielraum; eine abgeschnittene Antwort zerstört das
+        JSON der kombinierten Analyse. Daher wird höchstens mit dem Standardwert gerechnet.
+        """
+        return int(chars / min(self.output_chars_per_token, DEFAULT_OUTPUT_CHARS_PER_TOKEN)) + 1
+
+    def payload_overhead(self, payload):
+        """Tokens eines Payloads ohne Dokumenttext (Prompts und Nachrichten-Markierungen)."""
+        messages = payload.get("messages", [])
+        prompt_text = "\n".join(message.get("content", "") for message in messages
+                                if isinstance(message.get("content"), str))
+        return self.estimate_tokens(prompt_text) + self.MESSAGE_OVERHEAD_TOKENS * len(messages)
+
+    def fit_chars(self, text, max_tokens):
+        """
+        Länge des längsten Textanfangs, der in max_tokens passt.
+        Exakt: per Zählung mit proportionaler Korrektur, sonst über die Kalibrierung.
+        """
+        if max_tokens <= 0:
+            return 0
+        estimate = self.chars_for_tokens(max_tokens)
+        if not self._check_exact():
+            return min(len(text), estimate)
+
+        chars = min(len(text), int(estimate * 1.25))
+        best = 0
+        for _ in range(4):
+            tokens = self.count(text[:chars])
+            if tokens is None:
+                return max(best, min(len(text), estimate))
+            if tokens <= max_tokens:
+                best = max(best, chars)
+                if chars == len(text) or tokens >= max_tokens * 0.97:
+                    break
+                chars = min(len(text), int(chars * max_tokens / max(tokens, 1) * 0.99))
+                if chars <= best:
+                    break
+            else:
+                chars = int(chars * max_tokens / tokens * 0.98)
+        return best
+
+    def observe(self, prompt_chars, completion_chars, usage):
+        """
+        Kalibriert Zeichen pro Token aus den usage-Angaben einer Antwort und sichert den Stand.
+        """
+        if not isinstance(usage, dict):
+            return
+        prompt_tokens = usage.get("prompt_tokens") or 0
+        completion_tokens = usage.get("completion_tokens") or 0
+        with self._lock:
+            changed = False
+            if prompt_tokens >= 50 and prompt_chars:
+                ratio = min(8.0, max(1.0, prompt_chars / prompt_tokens))
+                self.input_samples += 1
+                weight = max(0.1, 1 / self.input_samples)  # Mittelwert, später gleitend
+                self.input_chars_per_token += (ratio - self.input_chars_per_token) * weight
+                changed = True
+            if completion_tokens >= 20 and completion_chars:
+                ratio = min(8.0, max(0.5, completion_chars / completion_tokens))
+                self.output_samples += 1
+                weight = max(0.1, 1 / self.output_samples)
+                self.output_chars_per_token += (ratio - self.output_chars_per_token) * weight
+                changed = True
+            values = {
+                'input_chars_per_token': round(self.input_chars_per_token, 4),
+                'output_chars_per_token': round(self.output_chars_per_token, 4),
+                'input_samples': self.input_samples,
+                'output_samples': self.output_samples
+            }
+        if changed:
+            save_llm_state("tokens", values)
+
+_TOKEN_BUDGETS = {}  # {"server_url|model_name": TokenBudget}
+_TOKEN_BUDGETS_LOCK = threading.Lock()
+
+def get_token_budget():
+    """Gibt das Token-Budget für den aktuellen Server und das Modell zurück."""
+    key = _llm_state_key()
+    with _TOKEN_BUDGETS_LOCK:
+        budget = _TOKEN_BUDGETS.get(key)
+        if budget is None:
+            budget = TokenBudget()
+            _TOKEN_BUDGETS[key] = budget
+    return budget
+
+def request_with_adaptive_context(text, build_payload, summary_max_chars, label="Zusammenfassung", timeout=300):
+    """
+    Schickt eine LLM-Anfrage mit adaptiv gekürztem Text.
+
+    Der Text wird per TokenBudget so gekürzt, dass Prompt, Text und max_tokens in
+    MAX_CONTEXT_TOKENS passen. Solange das Budget noch nicht verlässlich ist (keine exakte Zählung,
+    zu wenig Kalibrierung), startet die Textlänge bei der für Server und Modell gelernten
+    Context-Größe (mit gradueller Aufwärts-Exploration). Bei Context-Overflow wird schrittweise
+    reduziert. Gemeinsame Retry-Logik für summarize_with_lmstudio() und analyze_with_lmstudio_combined().
 
+    Args:
+        text: Vollständiger (bereinigter) Text
+        build_payload: Funktion, die aus dem gekürzten Text den Request-Payload erstellt
+        summary_max_chars: Zielgröße der Zusammenfassung (Untergrenze für Kürzungen)
+        label: Bezeichnung für Fehlermeldungen
+
+    Returns:
+        str: Antworttext des Modells
+    """
     # Versuche mit verschiedenen Textlängen, falls Context zu groß ist
-    # Berechne retry_lengths basierend auf MAX_CONTEXT_TOKENS
-    # Annahme: ~4 Zeichen pro Token (konservativ für deutsche Texte)
-    chars_per_token = 4
-    max_chars = (MAX_CONTEXT_TOKENS - 1000) * chars_per_token  # Reserve 1000 Tokens für Prompt und Antwort
+    # Token-Budget für den Text: Context minus Prompt, Antwort (max_tokens) und 2% Reserve
+    budget = get_token_budget()
+    skeleton = build_payload("")
+    text_tokens = (MAX_CONTEXT_TOKENS - budget.payload_overhead(skeleton)
+                   - int(skeleton.get("max_tokens") or 0) - MAX_CONTEXT_TOKENS // 50)
+    max_chars = budget.chars_for_tokens(text_tokens)
 
     actual_text_length = len(text)
 
     # Adaptive Lernlogik mit gradueller Aufwärts-Exploration
-    global _LEARNED_MAX_CHARS
-
-    # Initialisiere Lern-Struktur für dieses Modell
-    if MODEL_NAME not in _LEARNED_MAX_CHARS:
-        _LEARNED_MAX_CHARS[MODEL_NAME] = {
-            'current_max': max_chars // 2,  # Start konservativ bei 50% vom Maximum
-            'successes': [],                # Liste der letzten 10 erfolgreichen Größen
-            'consecutive_ok': 0,            # Zähler für aufeinanderfolgende Erfolge
-            'last_failed': None             # Letzte fehlgeschlagene Größe (obere Grenze)
-        }
-
-    learned_data = _LEARNED_MAX_CHARS[MODEL_NAME]
+    # Lern-Struktur für Server und Modell (aus dem letzten Lauf übernommen, falls vorhanden)
+    learned_data = _get_learned_context(max_chars)
 
     # Berechne Startpunkt basierend auf Lernhistorie
     # Wenn wir mehrere Erfolge hatten, versuche schrittweise nach oben zu gehen
-    if learned_data['consecutive_ok'] >= 3:
+    if budget.reliable:
+        # Text so kürzen, dass er beim ersten Versuch in den Context passt
+        start_chars = budget.fit_chars(text, text_tokens)
+        if learned_data['last_failed'] and start_chars >= learned_data['last_failed']:
+            # Der Server hat diese Größe schon abgelehnt (z.B. mit kleinerem Context geladen)
+            start_chars = min(start_chars, learned_data['current_max'])
+        print(f"  → Token-Budget: {text_tokens:,} Tokens für den Text ({start_chars:,} Zeichen)")
+    elif learned_data['consecutive_ok'] >= 3:
         # Nach 3 aufeinanderfolgenden Erfolgen: Erhöhe um 10%
         exploration_max = int(learned_data['current_max'] * 1.10)
         # Aber nicht über bekannte Fehlergrenze hinaus
@@ -1738,43 +3349,26 @@ def summarize_with_lmstudio(text, file_path=None, file_ext=None, max_chars=30000
     # Sortiere absteigend
     retry_lengths = sorted(list(set(retry_lengths)), reverse=True)
 
-    # Hole dateityp-spezifischen Prompt
-    user_prompt = get_prompt_for_filetype(file_ext, summary_max_chars) if file_ext else get_prompt_for_filetype("", summary_max_chars)
-
-    # Berechne max_tokens basierend auf Zielgröße
-    # ~2.5 Zeichen pro Token für deutsche Texte
-    max_tokens = int(summary_max_chars / 2.5) + 50  # +50 für Keywords
-
     for attempt, current_max_chars in enumerate(retry_lengths, 1):
         truncated_text = text[:current_max_chars]
 
-        payload = {
-            "model": MODEL_NAME,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "Du bist ein Wissensextraktionssystem für semantische Suche. Erstelle informationsdichte Zusammenfassungen in reinem Fließtext ohne Meta-Kommentare (z.B. 'Zusammenfassung:', 'Diese Datei...'), ohne Markdown-Formatierung (**, ##, -) und ohne Überschriften. Fokussiere auf Fakten, Zahlen, Namen und Fachbegriffe. Beginne direkt mit dem Inhalt."
-                },
-                {
-                    "role": "user",
-                    "content": f"{user_prompt}\n\nDokument:\n{truncated_text}"
-                },
-            ],
-            "temperature": 0.3,
-            "max_tokens": max_tokens,  # Dynamisch basierend auf SUMMARY_MAX_CHARS
-        }
+        payload = build_payload(truncated_text)
 
         try:
-            resp = requests.post(LMSTUDIO_API_URL, json=payload, timeout=300)
+            resp = requests.post(LMSTUDIO_API_URL, json=payload, timeout=timeout)
             resp.raise_for_status()
 
-            # Erfolg! Gib die Zusammenfassung zurück
+            # Erfolg! Gib die Antwort zurück
             data = resp.json()
-            summary = data["choices"][0]["message"]["content"]
+            content = data["choices"][0]["message"]["content"]
+            budget.observe(
+                sum(len(message.get("content", "")) for message in payload.get("messages", [])
+                    if isinstance(message.get("content"), str)),
+                len(content or ""),
+                data.get("usage")
+            )
 
             # Adaptive Lernlogik: Aktualisiere basierend auf Erfolg
-            learned_data = _LEARNED_MAX_CHARS[MODEL_NAME]
-
             if attempt == 1:
                 # Erfolg beim ersten Versuch
                 learned_data['consecutive_ok'] += 1
@@ -1798,8 +3392,9 @@ def summarize_with_lmstudio(text, file_path=None, file_ext=None, max_chars=30000
             learned_data['successes'].append(current_max_chars)
             if len(learned_data['successes']) > 10:
                 learned_data['successes'].pop(0)
+            _save_learned_context(learned_data)
 
-            return summary
+            return content
 
         except requests.exceptions.HTTPError as e:
             # Prüfe ob es ein Context-Overflow-Fehler ist
@@ -1816,18 +3411,17 @@ def summarize_with_lmstudio(text, file_path=None, file_ext=None, max_chars=30000
 
                 if is_context_error:
                     # Lernlogik: Speichere Fehlergrenze
-                    learned_data = _LEARNED_MAX_CHARS[MODEL_NAME]
-
                     # Merke diese Größe als "zu groß"
                     if learned_data['last_failed'] is None or current_max_chars < learned_data['last_failed']:
                         learned_data['last_failed'] = current_max_chars
 
                     # Reset consecutive successes
                     learned_data['consecutive_ok'] = 0
+                    _save_learned_context(learned_data)
 
                     if attempt < len(retry_lengths):
                         # Berechne geschätzte Tokens für Debug-Ausgabe
-                        estimated_tokens = current_max_chars // 4
+                        estimated_tokens = budget.estimate_tokens(current_max_chars)
                         print(f"  ✗ Context-Limit erreicht ({current_max_chars:,} Zeichen ≈ {estimated_tokens:,} Tokens)")
                         print(f"     Grenze gespeichert, versuche mit weniger...")
                         continue  # Nächster Versuch mit weniger Text
@@ -1842,7 +3436,7 @@ def summarize_with_lmstudio(text, file_path=None, file_ext=None, max_chars=30000
             except (ValueError, KeyError, json.JSONDecodeError):
                 # Kein JSON oder kein error-Feld - könnte trotzdem Context-Fehler sein
                 if resp.status_code == 400 and attempt < len(retry_lengths):
-                    estimated_tokens = current_max_chars // 4
+                    estimated_tokens = budget.estimate_tokens(current_max_chars)
                     print(f"  → HTTP 400 Fehler ({current_max_chars:,} Zeichen ≈ {estimated_tokens:,} Tokens), versuche mit weniger...")
                     print(f"     Response: {resp.text[:150]}...")  # Erste 150 Zeichen der Response
                     continue
@@ -1852,48 +3446,317 @@ def summarize_with_lmstudio(text, file_path=None, file_ext=None, max_chars=30000
                     raise
 
     # Falls alle Versuche fehlschlagen
-    raise ValueError("Zusammenfassung fehlgeschlagen nach allen Retry-Versuchen")
+    raise ValueError(f"{label} fehlgeschlagen nach allen Retry-Versuchen")
 
-def process_file(src_file):
-    """
-    Verarbeitet eine einzelne Datei und erstellt eine JSON-Zusammenfassung.
+def summarize_with_lmstudio(text, file_path=None, file_ext=None, max_chars=30000, summary_max_chars=1500):
+    # Adaptive Textkürzung mit automatischem Retry bei Context-Overflow
+    # ministral-3-14b-reasoning hat größeres Context-Fenster
+    # Start mit ~30000 Zeichen (~7500 Tokens), bei Fehler schrittweise reduzieren
 
-    Returns:
-        dict: OCR-Informationen falls verfügbar, sonst None
-    """
-    rel_path = os.path.relpath(src_file, SRC_ROOT)
-    dst_dir = os.path.join(DST_ROOT, os.path.dirname(rel_path))
-    os.makedirs(dst_dir, exist_ok=True)
+    # Stelle sicher, dass file_ext ein String ist
+    if file_ext and not isinstance(file_ext, str):
+        raise TypeError(f"file_ext muss ein String sein, nicht {type(file_ext)}")
 
-    # Summary-Datei neben die Quelle legen, aber unter D:\LLM
-    dst_file = os.path.join(dst_dir, os.path.basename(src_file) + ".json")
+    # Prüfe ob es sich um eine Bilddatei handelt
+    is_image = file_ext and file_ext.lower() in {".png", ".jpg", ".jpeg"}
 
-    # Prüfe ob Datei existiert und valide ist
-    if os.path.exists(dst_file):
-        if validate_json_file(dst_file, src_file):
-            print("Überspringe (valide Summary existiert):", dst_file)
-            # Lese OCR-Info aus existierender JSON-Datei für Statistik
-            try:
-                with open(dst_file, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-                    return existing_data.get('ocr_info', None)
-            except:
-                return None
-        else:
-            print("Lösche fehlerhafte oder veraltete JSON-Datei:", dst_file)
-            try:
-                os.remove(dst_file)
-            except Exception as e:
-                print(f"Fehler beim Löschen von {dst_file}: {e}")
-                return None
+    if is_image and file_path:
+        # Für Bilder: Verwende Vision API
+        return summarize_image_with_lmstudio(file_path, file_ext)
 
-    path_obj = pathlib.Path(src_file)
+    # Entferne problematische Zeichen und normalisiere Whitespace
+    text = text.strip()
+    if not text:
+        raise ValueError("Text ist leer nach Bereinigung")
+
+    # Wenn der Text kürzer als die Zielgröße ist, kopiere ihn direkt
+    if len(text) <= summary_max_chars:
+        print(f"Text ({len(text)} Zeichen) ist kürzer als Zielgröße ({summary_max_chars}), kopiere Original")
+        return text
+
+    # Hole dateityp-spezifischen Prompt
+    user_prompt = get_prompt_for_filetype(file_ext, summary_max_chars) if file_ext else get_prompt_for_filetype("", summary_max_chars)
+
+    # Berechne max_tokens basierend auf Zielgröße (kalibrierte Zeichen pro Token, anfangs 2.5)
+    max_tokens = get_token_budget().output_tokens(summary_max_chars) + 50  # +50 für Keywords
+
+    system_prompt = "Du bist ein Wissensextraktionssystem für semantische Suche. Erstelle informationsdichte Zusammenfassungen in reinem Fließtext ohne Meta-Kommentare (z.B. 'Zusammenfassung:', 'Diese Datei...'), ohne Markdown-Formatierung (**, ##, -) und ohne Überschriften. Fokussiere auf Fakten, Zahlen, Namen und Fachbegriffe. Beginne direkt mit dem Inhalt."
+
+    # Identische Texte nur einmal zusammenfassen (siehe LLMResponseCache). Die Kürzung hängt von
+    # der gelernten Context-Größe ab, daher ist der vollständige Text Teil des Schlüssels.
+    # max_tokens ändert sich mit der Kalibrierung, der Schlüssel nutzt daher die Zielgröße.
+    cache_key = llm_cache_key('summary', (system_prompt, user_prompt), 0.3, summary_max_chars, text)
+    cached_summary = llm_cache_get(cache_key, 'summary')
+    if cached_summary is not None:
+        print("  ✓ Zusammenfassung aus LLM-Cache")
+        return cached_summary
+
+    summary = request_with_adaptive_context(
+        text,
+        lambda truncated_text: {
+            "model": MODEL_NAME,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": f"{user_prompt}\n\nDokument:\n{truncated_text}"
+                },
+            ],
+            "temperature": 0.3,
+            "max_tokens": max_tokens,  # Dynamisch basierend auf SUMMARY_MAX_CHARS
+        },
+        summary_max_chars
+    )
+    llm_cache_put(cache_key, 'summary', summary)
+    return summary
+
+def analyze_with_lmstudio_combined(text, file_ext=None, summary_max_chars=1500):
+    """
+    Erstellt Zusammenfassung, Schlüsselbegriffe und Named Entities mit einer einzigen LLM-Anfrage.
+
+    Das Modell antwortet mit einem JSON-Objekt; der Text wird wie bei summarize_with_lmstudio()
+    adaptiv gekürzt. Nur für Textdokumente (Bilder laufen weiterhin über die Vision API).
+
+    Args:
+        text: Der zu analysierende Text
+        file_ext: Optional - Dateierweiterung für den dateityp-spezifischen Prompt
+        summary_max_chars: Zielgröße der Zusammenfassung
+
+    Returns:
+        dict: {'summary': str, 'keywords': [...], 'entities': {...}} oder None,
+              wenn die Antwort nicht als JSON gelesen werden konnte
+    """
+    text = text.strip()
+    if not text:
+        raise ValueError("Text ist leer nach Bereinigung")
+
+    type_prompt = get_prompt_for_filetype(file_ext or "", summary_max_chars)
+
+    combined_prompt = f"""{type_prompt}
+
+Extrahiere zusätzlich alle Named Entities aus dem Dokument:
+- firmen: Namen von Firmen, Gesellschaften, Unternehmen
+- personen: Vollständige Namen von Personen (Vor- und Nachname wenn möglich)
+- institutionen: Behörden, Ämter, staatliche Einrichtungen, Bildungseinrichtungen
+- organisationen: Vereine, Verbände, NGOs, andere Organisationen
+Nur tatsächlich im Text vorkommende Namen, keine generischen Begriffe, keine Duplikate.
+
+AUSGABEFORMAT: Antworte ausschließlich mit einem JSON-Objekt (ohne Markdown, ohne Erklärungen):
+{{"zusammenfassung": "...", "schluesselbegriffe": ["..."], "firmen": ["..."], "personen": ["..."], "institutionen": ["..."], "organisationen": ["..."]}}
+Abweichend vom Format oben: Die Schlüsselbegriffe gehören NUR in "schluesselbegriffe", keine "Schlüsselbegriffe:"-Zeile in der Zusammenfassung.
+Leere Kategorien als leere Liste []."""
+
+    system_prompt = "Du bist ein Wissensextraktionssystem für semantische Suche. Du antwortest ausschließlich mit gültigem JSON. Die Zusammenfassung ist reiner Fließtext ohne Meta-Kommentare und ohne Markdown-Formatierung. Extrahiere nur tatsächlich vorhandene Namen."
+
+    # Zusammenfassung wie bisher + ca. 500 Tokens für Schlüsselbegriffe und Entities
+    max_tokens = get_token_budget().output_tokens(summary_max_chars) + 500
+
+    # Schlüssel mit der Zielgröße statt max_tokens (siehe summarize_with_lmstudio)
+    cache_key = llm_cache_key('combined', (system_prompt, combined_prompt), 0.2, summary_max_chars, text)
+    cached_response = llm_cache_get(cache_key, 'combined')
+    if cached_response is not None:
+        result = parse_combined_response(cached_response)
+        if result is not None:
+            print("  ✓ Kombinierte Analyse aus LLM-Cache")
+            return result
+
+    response_text = request_with_adaptive_context(
+        text,
+        lambda truncated_text: {
+            "model": MODEL_NAME,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": f"{combined_prompt}\n\nDokument:\n{truncated_text}"
+                },
+            ],
+            "temperature": 0.2,
+            "max_tokens": max_tokens,
+        },
+        summary_max_chars,
+        label="Kombinierte Analyse"
+    )
+
+    result = parse_combined_response(response_text)
+    if result is None:
+        print(f"  → Warnung: Kombinierte Antwort nicht lesbar: {response_text[:100]}")
+        return None
+
+    # Nur lesbare Antworten cachen, damit ein Fehlversuch beim nächsten Lauf wiederholt wird
+    llm_cache_put(cache_key, 'combined', response_text)
+    return result
+
+def parse_combined_response(response_text):
+    """
+    Parst die JSON-Antwort von analyze_with_lmstudio_combined().
+
+    Toleriert vorangestellte Reasoning-Blöcke (<think>...</think>) und Markdown-Codeblöcke.
+
+    Returns:
+        dict: {'summary': str, 'keywords': [...], 'entities': {'companies', 'persons',
+              'institutions', 'organizations'}} oder None bei ungültiger Antwort
+    """
+    import re
+
+    if not response_text:
+        return None
+
+    cleaned = re.sub(r'<think>.*?</think>', '', response_text, flags=re.DOTALL)
+    start = cleaned.find('{')
+    end = cleaned.rfind('}')
+    if start == -1 or end <= start:
+        return None
+
+    try:
+        data = json.loads(cleaned[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    summary = data.get('zusammenfassung') or data.get('summary')
+    if not isinstance(summary, str) or not summary.strip():
+        return None
+
+    def as_list(value):
+        # Modelle liefern gelegentlich kommagetrennte Strings statt Listen
+        if isinstance(value, str):
+            value = value.split(',')
+        if not isinstance(value, list):
+            return []
+        items = [str(item).strip() for item in value if item is not None and str(item).strip()]
+        return list(dict.fromkeys(items))  # Erhält Reihenfolge und entfernt Duplikate
+
+    summary = summary.strip()
+    keywords = as_list(data.get('schluesselbegriffe', data.get('keywords')))
+    if not keywords:
+        # Modell hat die Keyword-Zeile doch in die Zusammenfassung geschrieben
+        summary, keywords = split_summary_keywords(summary)
+
+    return {
+        'summary': summary,
+        'keywords': keywords,
+        'entities': {
+            'companies': as_list(data.get('firmen')),
+            'persons': as_list(data.get('personen')),
+            'institutions': as_list(data.get('institutionen')),
+            'organizations': as_list(data.get('organisationen'))
+        }
+    }
+
+def split_summary_keywords(summary):
+    """
+    Trennt die Schlüsselbegriff-Zeile vom Ende einer Zusammenfassung ab.
+
+    Args:
+        summary: Zusammenfassung vom LLM (Schlüsselbegriffe in der letzten Zeile)
+
+    Returns:
+        tuple: (summary_text, keywords)
+    """
+    import re
+
+    keywords = []
+    summary_text = summary
+
+    # Muster für verschiedene Keyword-Marker (auch mit Absatz/Newline davor)
+    keyword_patterns = [
+        r'\n\s*Schlüsselbegriffe:\s*(.+?)$',
+        r'\n\s*Keywords?:\s*(.+?)$',
+        r'\n\s*Zentrale Begriffe:\s*(.+?)$',
+        # Fallback: Suche auch ohne Newline am Anfang
+        r'Schlüsselbegriffe:\s*(.+?)$',
+        r'Keywords?:\s*(.+?)$',
+    ]
+
+    for pattern in keyword_patterns:
+        match = re.search(pattern, summary, re.IGNORECASE | re.MULTILINE)
+        if match:
+            keyword_string = match.group(1).strip()
+            # Extrahiere kommagetrennte Keywords
+            if ',' in keyword_string:
+                keywords = [kw.strip() for kw in keyword_string.split(',') if kw.strip()]
+                # Entferne die Keyword-Zeile aus der Zusammenfassung
+                summary_text = re.sub(pattern, '', summary, flags=re.IGNORECASE | re.MULTILINE).strip()
+                break
+
+    # Fallback: Wenn keine Keywords gefunden wurden, versuche letzte Zeile
+    if not keywords:
+        lines = summary.strip().split('\n')
+        if len(lines) > 1:
+            # Letzte Zeile könnte die Keywords enthalten
+            last_line = lines[-1].strip()
+            # Prüfe ob die letzte Zeile hauptsächlich aus kommagetrennten Wörtern besteht
+            if ',' in last_line and len(last_line) < 300:
+                # Extrahiere Keywords
+                keywords = [kw.strip() for kw in last_line.split(',') if kw.strip()]
+                # Entferne die Keyword-Zeile aus der Zusammenfassung
+                summary_text = '\n'.join(lines[:-1]).strip()
+
+    return summary_text, keywords
+
+def process_file(src_file):
+    """
+    Verarbeitet eine einzelne Datei und erstellt eine JSON-Zusammenfassung.
+
+    Returns:
+        dict: OCR-Informationen falls verfügbar, sonst None
+    """
+    document, result = prepare_document(src_file)
+    if document is None:
+        return result
+    return analyze_document(document)
+
+def prepare_document(src_file):
+    """
+    Erste Stufe von process_file(): Prüfungen und Textextraktion (ohne LLM).
+
+    Returns:
+        tuple: (document, result)
+            - document: dict mit extrahiertem Text für analyze_document(),
+              oder None wenn die Datei nicht (erneut) analysiert werden muss
+            - result: Rückgabewert für process_file() falls document None ist
+    """
+    rel_path = os.path.relpath(src_file, SRC_ROOT)
+    dst_dir = os.path.join(DST_ROOT, os.path.dirname(rel_path))
+    os.makedirs(dst_dir, exist_ok=True)
+
+    # Summary-Datei neben die Quelle legen, aber unter D:\LLM
+    dst_file = os.path.join(dst_dir, os.path.basename(src_file) + ".json")
+
+    # Prüfe ob Datei existiert und valide ist
+    if os.path.exists(dst_file):
+        if validate_json_file(dst_file, src_file):
+            print("Überspringe (valide Summary existiert):", dst_file)
+            # Lese OCR-Info aus existierender JSON-Datei für Statistik
+            try:
+                with open(dst_file, 'r', encoding='utf-8') as f:
+                    existing_data = json.load(f)
+                    return None, existing_data.get('ocr_info', None)
+            except:
+                return None, None
+        else:
+            print("Lösche fehlerhafte oder veraltete JSON-Datei:", dst_file)
+            try:
+                os.remove(dst_file)
+            except Exception as e:
+                print(f"Fehler beim Löschen von {dst_file}: {e}")
+                return None, None
+
+    path_obj = pathlib.Path(src_file)
     print("Verarbeite:", src_file)
 
     # Prüfe ob Datei zugänglich ist
     if not is_file_accessible(src_file):
         print(f"Überspringe Datei, da nicht zugänglich: {src_file}")
-        return None
+        return None, None
 
     # Für Bilddateien: Prüfe Mindestgröße (ignoriere kleine Icons)
     file_ext = path_obj.suffix.lower()
@@ -1902,13 +3765,13 @@ def process_file(src_file):
             file_size = os.path.getsize(src_file)
             if file_size < MIN_IMAGE_SIZE:
                 print(f"Überspringe kleine Bilddatei ({file_size} Bytes < {MIN_IMAGE_SIZE} Bytes): {src_file}")
-                return None
+                return None, None
         except OSError as e:
             print(f"Fehler beim Prüfen der Dateigröße: {e}")
-            return None
+            return None, None
 
     try:
-        result = extract_text(path_obj)
+        result = run_extract_text(path_obj)
         # Stelle sicher, dass wir ein Tuple bekommen
         if isinstance(result, tuple) and len(result) == 2:
             text, ocr_info = result
@@ -1920,12 +3783,12 @@ def process_file(src_file):
                 ocr_info = None
             else:
                 print(f"Fehler: Kann Text nicht extrahieren, unbekanntes Format: {result}")
-                return None
+                return None, None
     except Exception as e:
         print(f"Fehler beim Extrahieren von Text aus {src_file}: {e}")
         import traceback
         traceback.print_exc()
-        return None
+        return None, None
 
     # file_ext wurde bereits oben definiert (Zeile 425)
     is_image = file_ext in {".png", ".jpg", ".jpeg"}
@@ -1933,11 +3796,11 @@ def process_file(src_file):
     # Stelle sicher, dass text ein String ist
     if not isinstance(text, str):
         print(f"Fehler: Text ist kein String sondern {type(text)}: {text}")
-        return None
+        return None, None
 
     if not is_image and not text.strip():
         # Prüfe ob das Problem fehlende OCR-Unterstützung ist
-        if ocr_info and not ocr_info.get('used_ocr') and not OCR_AVAILABLE:
+        if ocr_info and not ocr_info.get('used_ocr') and not ocr_available():
             # Dies ist wahrscheinlich eine gescannte PDF ohne verfügbares OCR
             print("!" * 70)
             print("ÜBERSPRUNGEN: Gescannte PDF ohne OCR-Unterstützung")
@@ -1951,19 +3814,60 @@ def process_file(src_file):
             print("!" * 70)
         else:
             print("Kein Text extrahiert, überspringe:", src_file)
-        return None
+        return None, None
 
     if not is_image:
         print(f"Text extrahiert: {len(text)} Zeichen")
 
+    document = {
+        'src_file': src_file,
+        'rel_path': rel_path,
+        'dst_file': dst_file,
+        'file_ext': file_ext,
+        'text': text,
+        'ocr_info': ocr_info,
+    }
+    return document, None
+
+def analyze_document(document):
+    """
+    Zweite Stufe von process_file(): LLM-Zusammenfassung, Entity-Extraktion,
+    DSGVO-Klassifizierung und Schreiben der JSON-Datei.
+
+    Args:
+        document: dict aus prepare_document()
+
+    Returns:
+        dict: OCR-Informationen falls verfügbar, sonst None
+    """
+    src_file = document['src_file']
+    rel_path = document['rel_path']
+    dst_file = document['dst_file']
+    file_ext = document['file_ext']
+    text = document['text']
+    ocr_info = document['ocr_info']
+    path_obj = pathlib.Path(src_file)
+
     try:
         # Debug: Prüfe file_ext Typ
         if not isinstance(file_ext, str):
             print(f"FEHLER: file_ext hat falschen Typ: {type(file_ext)}, Wert: {file_ext}")
             return None
 
-        # Übergebe file_path und file_ext für dateityp-spezifische Verarbeitung
-        summary = summarize_with_lmstudio(text, file_path=src_file, file_ext=file_ext, summary_max_chars=SUMMARY_MAX_CHARS)
+        # Kombinierter Modus: eine Anfrage für Zusammenfassung, Schlüsselbegriffe und Entities
+        # (nur für Texte, die tatsächlich zusammengefasst werden; Bilder laufen über die Vision API)
+        combined = None
+        if (COMBINED_LLM and file_ext.lower() not in {".png", ".jpg", ".jpeg"}
+                and len(text.strip()) > SUMMARY_MAX_CHARS):
+            combined = analyze_with_lmstudio_combined(text, file_ext=file_ext, summary_max_chars=SUMMARY_MAX_CHARS)
+            if combined is None:
+                print("  → Fallback auf getrennte Anfragen für Zusammenfassung und Entities")
+
+        if combined is not None:
+            summary = combined['summary']
+        else:
+            # Übergebe file_path und file_ext für dateityp-spezifische Verarbeitung
+            summary = summarize_with_lmstudio(text, file_path=src_file, file_ext=file_ext, summary_max_chars=SUMMARY_MAX_CHARS)
 
         # Zeige die ersten 100 Zeichen der Zusammenfassung
         summary_preview = summary[:100] + "..." if len(summary) > 100 else summary
@@ -1992,8 +3896,11 @@ def process_file(src_file):
 
     # Extrahiere Named Entities aus dem Text
     # Dies geschieht für ALLE Texte, egal ob kurz oder lang
-    print("Extrahiere Named Entities...")
-    entities = extract_entities_with_lmstudio(text, file_path=src_file, file_ext=file_ext)
+    if combined is not None:
+        entities = combined['entities']
+    else:
+        print("Extrahiere Named Entities...")
+        entities = extract_entities_with_lmstudio(text, file_path=src_file, file_ext=file_ext)
 
     # Extrahiere zusätzliche Entities aus dem Dateipfad
     path_entities = extract_entities_from_path(src_file)
@@ -2023,48 +3930,13 @@ def process_file(src_file):
 
     # Extrahiere Schlüsselbegriffe aus der Zusammenfassung
     # Die Schlüsselbegriffe sollten am Ende der Zusammenfassung stehen
-    keywords = []
-    summary_text = summary
-
-    # Suche nach Keyword-Markern wie "Schlüsselbegriffe:", "Keywords:", etc.
-    import re
-
-    # Muster für verschiedene Keyword-Marker (auch mit Absatz/Newline davor)
-    keyword_patterns = [
-        r'\n\s*Schlüsselbegriffe:\s*(.+?)$',
-        r'\n\s*Keywords?:\s*(.+?)$',
-        r'\n\s*Zentrale Begriffe:\s*(.+?)$',
-        # Fallback: Suche auch ohne Newline am Anfang
-        r'Schlüsselbegriffe:\s*(.+?)$',
-        r'Keywords?:\s*(.+?)$',
-    ]
-
-    for pattern in keyword_patterns:
-        match = re.search(pattern, summary, re.IGNORECASE | re.MULTILINE)
-        if match:
-            keyword_string = match.group(1).strip()
-            # Extrahiere kommagetrennte Keywords
-            if ',' in keyword_string:
-                keywords = [kw.strip() for kw in keyword_string.split(',') if kw.strip()]
-                # Entferne die Keyword-Zeile aus der Zusammenfassung
-                summary_text = re.sub(pattern, '', summary, flags=re.IGNORECASE | re.MULTILINE).strip()
-                break
-
-    # Fallback: Wenn keine Keywords gefunden wurden, versuche letzte Zeile
-    if not keywords:
-        lines = summary.strip().split('\n')
-        if len(lines) > 1:
-            # Letzte Zeile könnte die Keywords enthalten
-            last_line = lines[-1].strip()
-            # Prüfe ob die letzte Zeile hauptsächlich aus kommagetrennten Wörtern besteht
-            if ',' in last_line and len(last_line) < 300:
-                # Extrahiere Keywords
-                keywords = [kw.strip() for kw in last_line.split(',') if kw.strip()]
-                # Entferne die Keyword-Zeile aus der Zusammenfassung
-                summary_text = '\n'.join(lines[:-1]).strip()
+    if combined is not None:
+        summary_text, keywords = summary, combined['keywords']
+    else:
+        summary_text, keywords = split_summary_keywords(summary)
 
-    # Berechne Content-Hash für Änderungserkennung
-    content_hash = calculate_content_hash(src_file)
+    # Berechne Content-Hash für Änderungserkennung (meist bereits im Hash-Cache)
+    content_hash = calculate_content_hash(src_file, stat)
 
     # Klassifiziere sensible/schutzbedürftige Daten gemäß DSGVO/BDSG
     print("Klassifiziere DSGVO-relevante Inhalte...")
@@ -2123,6 +3995,15 @@ def process_file(src_file):
 
     with open(dst_file, "w", encoding="utf-8") as f:
         json.dump(metadata, f, ensure_ascii=False, indent=2)
+    update_search_index(dst_file, metadata)
+
+    # Text für spätere Wartungsläufe ablegen (Bilder haben nur einen Platzhalter)
+    if file_ext.lower() not in {".png", ".jpg", ".jpeg"}:
+        save_source_text(content_hash, text)
+
+    if _MANIFEST is not None and content_hash:
+        _MANIFEST.record(rel_path, stat, content_hash,
+                         used_ocr=bool(ocr_info and ocr_info.get('used_ocr')))
 
     print(f"Summary erfolgreich erstellt: {dst_file}")
 
@@ -2139,10 +4020,8 @@ def validate_phone_number(phone):
     Returns:
         True wenn gültig, False wenn ungültig
     """
-    import re
-
     # Normalisiere für Prüfung
-    digits_only = re.sub(r'\D', '', phone)
+    digits_only = _NON_DIGIT_RE.sub('', phone)
 
     # Prüfe Mindestlänge (8 Ziffern)
     if len(digits_only) < 8:
@@ -2152,22 +4031,8 @@ def validate_phone_number(phone):
     if not (digits_only.startswith('0') or digits_only.startswith('49')):
         return False
 
-    # Prüfe gegen Pattern (mindestens eins muss matchen)
-    phone_patterns = [
-        r'\+49[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,10}',
-        r'\+49[\s\-]?\d{2,4}[\s\-/]\d{6,10}',
-        r'0049[\s\-]?\d{2,4}[\s\-]?\d{6,10}',
-        r'\(0\d{2,4}\)[\s\-]?\d{6,10}',
-        r'0\d{2,4}[\s\-/]\d{6,10}',
-        r'0\d{9,11}',
-    ]
-
-    for pattern in phone_patterns:
-        # Nutze search statt fullmatch für flexiblere Matching
-        if re.search(f'^{pattern}$', phone.strip()):
-            return True
-
-    return False
+    # Prüfe gegen PHONE_PATTERNS (mindestens eins muss die ganze Nummer abdecken)
+    return _PHONE_VALIDATE_RE.search(phone.strip()) is not None
 
 def update_json_with_contact_info(json_path, src_file_path):
     """
@@ -2183,92 +4048,142 @@ def update_json_with_contact_info(json_path, src_file_path):
         True wenn Update durchgeführt wurde, False wenn nicht nötig
     """
     try:
-        # Lese JSON
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # Prüfe ob Kontaktfelder fehlen oder ungültige Telefonnummern enthalten
-        entities = data.get('entities', {})
-
-        # Prüfe fehlende Felder
-        needs_extraction = (
-            'urls' not in entities or
-            'emails' not in entities or
-            'phone_numbers' not in entities
-        )
-
-        # Prüfe vorhandene Telefonnummern auf Validität
-        needs_phone_validation = False
-        invalid_phones = []
-        if 'phone_numbers' in entities and entities['phone_numbers']:
-            for phone in entities['phone_numbers']:
-                if not validate_phone_number(phone):
-                    invalid_phones.append(phone)
-                    needs_phone_validation = True
-
-        # Wenn nichts zu tun ist, überspringe
-        if not needs_extraction and not needs_phone_validation:
+        pending = prepare_contact_update(json_path, src_file_path)
+        if pending is None:
             return False
+        return apply_contact_update(pending, extract_contact_info_from_text(pending['text']))
 
-        # Extrahiere Text aus Quelldatei (verwende existierende Funktionen)
-        path_obj = pathlib.Path(src_file_path)
-        file_ext = path_obj.suffix.lower()
+    except Exception as e:
+        print(f"Fehler beim Nachtragen der Kontaktinformationen: {e}")
+        return False
 
-        # Nutze die bestehenden Extract-Funktionen
-        if file_ext == ".pdf":
-            text, _ = extract_text_pdf(src_file_path)
-        elif file_ext in {".docx", ".doc"}:
-            text = extract_text_docx(src_file_path)
-        elif file_ext in {".pptx", ".ppt"}:
-            text = extract_text_pptx(src_file_path)
-        elif file_ext in {".xlsx", ".xls", ".xlsm", ".xltx"}:
-            text = extract_text_xlsx(src_file_path)
-        elif file_ext in {".txt", ".md"}:
-            text = extract_text_txt(src_file_path)
-        else:
-            # Bilder oder unbekannt - überspringe
-            return False
+def prepare_contact_update(json_path, src_file_path):
+    """
+    Erster Schritt von update_json_with_contact_info(): prüft die JSON-Datei und lädt den Text.
 
-        # Extrahiere Kontaktinformationen (wenn nötig)
-        if needs_extraction or needs_phone_validation:
-            contact_info = extract_contact_info_from_text(text)
-
-            # Aktualisiere fehlende Felder
-            if 'urls' not in entities:
-                entities['urls'] = contact_info['urls']
-            if 'emails' not in entities:
-                entities['emails'] = contact_info['emails']
-
-            # Telefonnummern: Entweder nachtragen oder neu extrahieren (wenn ungültige gefunden)
-            if 'phone_numbers' not in entities:
-                entities['phone_numbers'] = contact_info['phone_numbers']
-            elif needs_phone_validation:
-                # Entferne ungültige und füge neu extrahierte hinzu
-                valid_existing = [p for p in entities['phone_numbers'] if validate_phone_number(p)]
-                # Kombiniere mit neu extrahierten (ohne Duplikate)
-                all_phones = valid_existing + [p for p in contact_info['phone_numbers'] if p not in valid_existing]
-                entities['phone_numbers'] = all_phones
-
-                if invalid_phones:
-                    print(f"  🧹 Entfernt {len(invalid_phones)} ungültige Telefonnummern: {invalid_phones[:3]}{'...' if len(invalid_phones) > 3 else ''}")
-
-            # Speichere aktualisierte JSON
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-            if needs_extraction:
-                print(f"  ⚡ Kontaktinformationen nachgetragen: {len(contact_info['urls'])} URLs, "
-                      f"{len(contact_info['emails'])} E-Mails, {len(contact_info['phone_numbers'])} Telefonnummern")
-            elif needs_phone_validation:
-                print(f"  ✓ Telefonnummern validiert: {len(entities['phone_numbers'])} gültig, {len(invalid_phones)} entfernt")
+    Getrennt von apply_contact_update(), damit cleanup_invalid_phone_numbers() die Texte
+    mehrerer Dateien gesammelt an extract_contact_info_batch() übergeben kann.
 
-            return True
+    Args:
+        json_path: Pfad zur JSON-Datei
+        src_file_path: Pfad zur Quelldatei (zum Text-Extrahieren)
 
-        return False
+    Returns:
+        dict: Zwischenstand für apply_contact_update(), oder None wenn nichts zu tun ist
+    """
+    # Lese JSON
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    # Prüfe ob Kontaktfelder fehlen oder ungültige Telefonnummern enthalten
+    entities = data.get('entities', {})
+
+    # Prüfe fehlende Felder
+    needs_extraction = (
+        'urls' not in entities or
+        'emails' not in entities or
+        'phone_numbers' not in entities
+    )
 
-    except Exception as e:
-        print(f"Fehler beim Nachtragen der Kontaktinformationen: {e}")
-        return False
+    # Prüfe vorhandene Telefonnummern auf Validität
+    needs_phone_validation = False
+    invalid_phones = []
+    if 'phone_numbers' in entities and entities['phone_numbers']:
+        for phone in entities['phone_numbers']:
+            if not validate_phone_number(phone):
+                invalid_phones.append(phone)
+                needs_phone_validation = True
+
+    # Wenn nichts zu tun ist, überspringe
+    if not needs_extraction and not needs_phone_validation:
+        return None
+
+    # Extrahiere Text aus Quelldatei (verwende existierende Funktionen)
+    path_obj = pathlib.Path(src_file_path)
+    file_ext = path_obj.suffix.lower()
+
+    # Zuerst im Text-Store nachsehen - die Quelle wird nur bei geändertem Inhalt geparst
+    text = load_source_text(data, src_file_path)
+    from_store = text is not None
+
+    # Nutze die bestehenden Extract-Funktionen
+    if text is not None:
+        pass
+    elif file_ext == ".pdf":
+        text, _ = extract_text_pdf(src_file_path)
+    elif file_ext in {".docx", ".doc"}:
+        text = extract_text_docx(src_file_path)
+    elif file_ext in {".pptx", ".ppt"}:
+        text = extract_text_pptx(src_file_path)
+    elif file_ext in {".xlsx", ".xls", ".xlsm", ".xltx"}:
+        text = extract_text_xlsx(src_file_path)
+    elif file_ext in {".txt", ".md"}:
+        text = extract_text_txt(src_file_path)
+    else:
+        # Bilder oder unbekannt - überspringe
+        return None
+
+    if not from_store:
+        store_extracted_text(src_file_path, text)
+
+    return {
+        'json_path': json_path,
+        'data': data,
+        'entities': entities,
+        'text': text,
+        'needs_extraction': needs_extraction,
+        'needs_phone_validation': needs_phone_validation,
+        'invalid_phones': invalid_phones
+    }
+
+def apply_contact_update(pending, contact_info):
+    """
+    Zweiter Schritt von update_json_with_contact_info(): übernimmt die extrahierten
+    Kontaktinformationen und speichert die JSON-Datei.
+
+    Args:
+        pending: dict aus prepare_contact_update()
+        contact_info: dict aus extract_contact_info_from_text() für pending['text']
+
+    Returns:
+        True (JSON wurde aktualisiert)
+    """
+    entities = pending['entities']
+    needs_extraction = pending['needs_extraction']
+    needs_phone_validation = pending['needs_phone_validation']
+    invalid_phones = pending['invalid_phones']
+
+    # Aktualisiere fehlende Felder
+    if 'urls' not in entities:
+        entities['urls'] = contact_info['urls']
+    if 'emails' not in entities:
+        entities['emails'] = contact_info['emails']
+
+    # Telefonnummern: Entweder nachtragen oder neu extrahieren (wenn ungültige gefunden)
+    if 'phone_numbers' not in entities:
+        entities['phone_numbers'] = contact_info['phone_numbers']
+    elif needs_phone_validation:
+        # Entferne ungültige und füge neu extrahierte hinzu
+        valid_existing = [p for p in entities['phone_numbers'] if validate_phone_number(p)]
+        # Kombiniere mit neu extrahierten (ohne Duplikate)
+        all_phones = valid_existing + [p for p in contact_info['phone_numbers'] if p not in valid_existing]
+        entities['phone_numbers'] = all_phones
+
+        if invalid_phones:
+            print(f"  🧹 Entfernt {len(invalid_phones)} ungültige Telefonnummern: {invalid_phones[:3]}{'...' if len(invalid_phones) > 3 else ''}")
+
+    # Speichere aktualisierte JSON
+    with open(pending['json_path'], 'w', encoding='utf-8') as f:
+        json.dump(pending['data'], f, ensure_ascii=False, indent=2)
+    update_search_index(pending['json_path'], pending['data'])
+
+    if needs_extraction:
+        print(f"  ⚡ Kontaktinformationen nachgetragen: {len(contact_info['urls'])} URLs, "
+              f"{len(contact_info['emails'])} E-Mails, {len(contact_info['phone_numbers'])} Telefonnummern")
+    elif needs_phone_validation:
+        print(f"  ✓ Telefonnummern validiert: {len(entities['phone_numbers'])} gültig, {len(invalid_phones)} entfernt")
+
+    return True
 
 def update_json_with_dsgvo_classification(json_path, src_file_path):
     """
@@ -2298,10 +4213,17 @@ def update_json_with_dsgvo_classification(json_path, src_file_path):
         path_obj = pathlib.Path(src_file_path)
         file_ext = path_obj.suffix.lower()
 
-        # Nutze die bestehenden Extract-Funktionen
+        # Zuerst im Text-Store nachsehen - die Quelle wird nur bei geändertem Inhalt geparst
         text = ""
+        if file_ext not in {".png", ".jpg", ".jpeg"}:
+            text = load_source_text(data, src_file_path) or ""
+        from_store = bool(text)
+
+        # Nutze die bestehenden Extract-Funktionen
         try:
-            if file_ext == ".pdf":
+            if text:
+                pass
+            elif file_ext == ".pdf":
                 text, _ = extract_text_pdf(src_file_path)
             elif file_ext in {".docx", ".doc"}:
                 text = extract_text_docx(src_file_path)
@@ -2322,6 +4244,9 @@ def update_json_with_dsgvo_classification(json_path, src_file_path):
             print(f"Fehler beim Text-Extrahieren für DSGVO-Klassifizierung: {e}")
             return False
 
+        if not from_store and file_ext not in {".png", ".jpg", ".jpeg"}:
+            store_extracted_text(src_file_path, text)
+
         if not text or not text.strip():
             # Kein Text verfügbar - verwende Summary als Fallback
             text = data.get('summary', '')
@@ -2345,6 +4270,7 @@ def update_json_with_dsgvo_classification(json_path, src_file_path):
         # Speichere aktualisierte JSON
         with open(json_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        update_search_index(json_path, data)
 
         # Zeige Ergebnis mit Dateinamen
         filename = os.path.basename(src_file_path)
@@ -2402,8 +4328,13 @@ def validate_json_file(json_path, src_file_path=None):
                         print(f"Zeitstempel geändert in {json_path} - Neuverarbeitung erforderlich")
                         return False
                 else:
-                    # Hash-basierte Prüfung (bevorzugte Methode)
-                    current_hash = calculate_content_hash(src_file_path)
+                    # Gleiche Größe und Änderungszeit: gespeicherten Hash übernehmen, ohne die
+                    # Quelle zu lesen (wie load_source_text); sonst Hash-basierte Prüfung
+                    stat = os.stat(src_file_path)
+                    if (stat.st_size == data.get('size') and
+                            datetime.fromtimestamp(stat.st_mtime).isoformat() == data.get('modified')):
+                        seed_content_hash(src_file_path, stat, data.get('content_hash'))
+                    current_hash = calculate_content_hash(src_file_path, stat)
                     if current_hash and data.get('content_hash') != current_hash:
                         print(f"Dateiinhalt geändert in {json_path} - Neuverarbeitung erforderlich")
                         return False
@@ -2444,6 +4375,220 @@ def validate_json_file(json_path, src_file_path=None):
         print(f"Fehler beim Validieren von {json_path}: {e}")
         return False
 
+def get_state_dir():
+    """Gibt das Zustandsverzeichnis unter DST_ROOT zurück (wird bei Bedarf angelegt)."""
+    state_dir = os.path.join(DST_ROOT, STATE_DIR_NAME)
+    os.makedirs(state_dir, exist_ok=True)
+    return state_dir
+
+def _text_store_path(content_hash):
+    """Pfad einer Textdatei im Text-Store (zweistufig nach Hash-Präfix verteilt)."""
+    return os.path.join(get_state_dir(), "text", content_hash[:2], content_hash + ".txt.gz")
+
+def save_source_text(content_hash, text):
+    """
+    Legt den extrahierten Text einer Quelldatei gzip-komprimiert im Text-Store ab.
+    Gleicher Inhalt (gleicher Hash) wird nur einmal gespeichert.
+    """
+    if not USE_TEXT_STORE or not content_hash or not text:
+        return
+    import gzip
+    try:
+        path = _text_store_path(content_hash)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"  → Warnung: Text konnte nicht im Text-Store gespeichert werden: {e}")
+
+def _read_text_store(content_hash):
+    import gzip
+    try:
+        with gzip.open(_text_store_path(content_hash), 'rt', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, EOFError):
+        return None
+
+def load_source_text(data, src_file_path):
+    """
+    Liefert den extrahierten Text zu einer JSON-Ausgabe aus dem Text-Store.
+
+    Stimmen Größe und Änderungszeit der Quelle mit der JSON überein, wird die Quelle nicht
+    angefasst. Andernfalls wird ihr Content-Hash geprüft; nur wenn sich der Inhalt geändert
+    hat (oder kein Text gespeichert ist), muss der Aufrufer neu extrahieren.
+
+    Args:
+        data: Geladene JSON-Daten (mit content_hash, size, modified)
+        src_file_path: Pfad zur Quelldatei
+
+    Returns:
+        str oder None
+    """
+    content_hash = data.get('content_hash')
+    if not USE_TEXT_STORE or not content_hash:
+        return None
+    if not os.path.exists(_text_store_path(content_hash)):
+        return None
+    try:
+        stat = os.stat(src_file_path)
+        unchanged = (stat.st_size == data.get('size') and
+                     datetime.fromtimestamp(stat.st_mtime).isoformat() == data.get('modified'))
+        if not unchanged and calculate_content_hash(src_file_path, stat) != content_hash:
+            return None
+    except OSError:
+        return None
+    return _read_text_store(content_hash)
+
+def store_extracted_text(src_file_path, text):
+    """
+    Legt in einem Wartungslauf neu extrahierten Text im Text-Store ab, damit der nächste
+    Lauf die Quelle nicht erneut parsen muss (z.B. für Dateien, die vor Einführung des
+    Text-Stores oder per Manifest übersprungen verarbeitet wurden).
+    Schlüssel ist der aktuelle Content-Hash der Quelle (im Lauf meist bereits berechnet).
+    """
+    if not USE_TEXT_STORE or not text or not text.strip():
+        return
+    content_hash = calculate_content_hash(src_file_path)
+    if content_hash:
+        save_source_text(content_hash, text)
+
+class FileManifest:
+    """
+    Persistentes Manifest aller verarbeiteten Quelldateien (SQLite unter DST_ROOT/.fileinventory).
+
+    Pro relativem Pfad werden Größe, mtime_ns, Inode, Content-Hash, JSON-Status und
+    Pipeline-Version gespeichert. Stimmen Größe, mtime und Inode mit dem aktuellen stat()
+    überein, gilt die JSON-Datei ohne erneutes Lesen und Hashen der Quelle als valide.
+    """
+
+    COMMIT_INTERVAL = 500  # Schreibvorgänge pro Commit
+
+    def __init__(self, db_path):
+        import sqlite3
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                rel_path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER,
+                content_hash TEXT,
+                json_status TEXT NOT NULL,
+                pipeline_version INTEGER NOT NULL,
+                used_ocr INTEGER NOT NULL DEFAULT 0,
+                updated TEXT
+            )
+        """)
+        # Duplikat-Index: absolute Pfade, damit auch Duplikate über mehrere Quellwurzeln erkannt werden
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS duplicate_index (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                partial_hash TEXT,
+                content_hash TEXT
+            )
+        """)
+        self.conn.commit()
+
+    @classmethod
+    def open_default(cls):
+        """Öffnet das Manifest unter DST_ROOT."""
+        return cls(os.path.join(get_state_dir(), "manifest.sqlite"))
+
+    def lookup(self, rel_path):
+        """Gibt den Manifest-Eintrag als dict zurück oder None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT size, mtime_ns, inode, content_hash, json_status, pipeline_version, used_ocr "
+                "FROM files WHERE rel_path = ?", (rel_path,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ('size', 'mtime_ns', 'inode', 'content_hash', 'json_status', 'pipeline_version', 'used_ocr')
+        return dict(zip(keys, row))
+
+    def lookup_unchanged(self, rel_path, stat):
+        """
+        Gibt den Eintrag zurück, wenn die Datei laut stat() unverändert und valide verarbeitet ist.
+        """
+        entry = self.lookup(rel_path)
+        if (entry is None
+                or entry['json_status'] != 'valid'
+                or entry['pipeline_version'] != PIPELINE_VERSION
+                or entry['size'] != stat.st_size
+                or entry['mtime_ns'] != stat.st_mtime_ns):
+            return None
+        # Inode nur vergleichen, wenn das Dateisystem einen liefert (Netzlaufwerke teils 0)
+        if entry['inode'] and stat.st_ino and entry['inode'] != stat.st_ino:
+            return None
+        return entry
+
+    def record(self, rel_path, stat, content_hash, json_status='valid', used_ocr=False):
+        """Speichert den aktuellen Stand einer Quelldatei."""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files "
+                "(rel_path, size, mtime_ns, inode, content_hash, json_status, pipeline_version, used_ocr, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (rel_path, stat.st_size, stat.st_mtime_ns, stat.st_ino, content_hash,
+                 json_status, PIPELINE_VERSION, int(bool(used_ocr)), datetime.now().isoformat())
+            )
+            self._count_write()
+
+    def _count_write(self):
+        self._pending += 1
+        if self._pending >= self.COMMIT_INTERVAL:
+            self.conn.commit()
+            self._pending = 0
+
+    def iter_duplicate_entries(self):
+        """Liefert alle Einträge des Duplikat-Index als (path, size, mtime_ns, partial_hash, content_hash)."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT path, size, mtime_ns, partial_hash, content_hash FROM duplicate_index ORDER BY rowid"
+            ).fetchall()
+        return rows
+
+    def record_duplicate_entry(self, path, size, mtime_ns, partial_hash=None, content_hash=None):
+        """Speichert/aktualisiert einen Eintrag des Duplikat-Index (vorhandene Hashes bleiben erhalten)."""
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO duplicate_index (path, size, mtime_ns, partial_hash, content_hash) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET "
+                "partial_hash = CASE WHEN mtime_ns = excluded.mtime_ns "
+                "THEN COALESCE(excluded.partial_hash, partial_hash) ELSE excluded.partial_hash END, "
+                "content_hash = CASE WHEN mtime_ns = excluded.mtime_ns "
+                "THEN COALESCE(excluded.content_hash, content_hash) ELSE excluded.content_hash END, "
+                "size = excluded.size, mtime_ns = excluded.mtime_ns",
+                (path, size, mtime_ns, partial_hash, content_hash)
+            )
+            self._count_write()
+
+    def forget_duplicate_entry(self, path):
+        """Entfernt einen veralteten Eintrag aus dem Duplikat-Index."""
+        with self._lock:
+            self.conn.execute("DELETE FROM duplicate_index WHERE path = ?", (path,))
+            self._count_write()
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+# Aktives Manifest während walk_and_process (None = keine Manifest-Nutzung)
+_MANIFEST = None
+
 def check_user_input():
     """
     Prüft ob eine Taste gedrückt wurde (nicht-blockierend).
@@ -2501,6 +4646,12 @@ def ask_on_lmstudio_error(error_message, file_path):
     Fragt den Benutzer, wie bei LM Studio Fehlern verfahren werden soll.
     Returns: 'abort', 'skip_prompts', oder 'continue'
     """
+    # Im Pipeline-Modus können mehrere Threads gleichzeitig Fehler melden -
+    # es darf immer nur eine Abfrage auf der Konsole aktiv sein
+    with _PROMPT_LOCK:
+        return _ask_on_lmstudio_error(error_message, file_path)
+
+def _ask_on_lmstudio_error(error_message, file_path):
     global ERROR_HANDLING_MODE
 
     # Wenn bereits eine Entscheidung getroffen wurde
@@ -2562,7 +4713,18 @@ def check_ocr_functionality():
     Returns: (is_available, error_message)
     """
     if not OCR_AVAILABLE:
-        return False, "pytesseract oder Pillow nicht installiert"
+        # Ohne pytesseract wird das Tesseract-Binary direkt aufgerufen
+        cmd = get_tesseract_cmd()
+        if not cmd:
+            return False, "Tesseract nicht gefunden und pytesseract/Pillow nicht installiert"
+        try:
+            import subprocess
+            completed = subprocess.run([cmd, "--version"], capture_output=True, timeout=30)
+            output = (completed.stdout or completed.stderr).decode('utf-8', 'replace')
+            version = output.splitlines()[0] if output else "unbekannte Version"
+            return True, f"{version} verfügbar (Aufruf ohne pytesseract)"
+        except Exception as e:
+            return False, f"OCR-Fehler: {str(e)}"
 
     try:
         # Versuche tesseract Version zu prüfen
@@ -2597,7 +4759,360 @@ def format_time(seconds):
     else:
         return f"{secs}s"
 
+class DirectoryScanner:
+    """
+    Paralleler, streamender Verzeichnis-Scan mit os.scandir.
+
+    Unterverzeichnisse werden von mehreren Threads gleichzeitig gelesen. Relevante Dateien
+    (Endung in extensions) werden beim Iterieren sofort geliefert, während der Scan noch läuft,
+    und zwar in derselben sortierten Reihenfolge wie bei os.walk (Verzeichnisse in Preorder).
+    Für die Statistik werden pro Endung nur Anzahl und Größe gezählt, keine Pfade gespeichert.
+    Die Größe stammt aus DirEntry.stat(); Größe, mtime_ns und Inode werden mitgeliefert und
+    weiterverwendet. Der Scan läuft der Verarbeitung höchstens SCAN_LOOKAHEAD Dateien voraus.
+
+    Verwendung:
+        scanner = DirectoryScanner(SRC_ROOT, EXTENSIONS)
+        scanner.start()
+        for full_path, stat in scanner:
+            ...
+    """
+
+    class _Node:
+        """Ein Verzeichnis im Scan-Baum; done wird gesetzt sobald files/children feststehen."""
+        __slots__ = ('path', 'files', 'children', 'done')
+
+        def __init__(self, path):
+            self.path = path
+            self.files = []
+            self.children = []
+            self.done = threading.Event()
+
+    class _FileStat:
+        """Die benötigten Felder aus DirEntry.stat() (ein volles stat-Ergebnis ist deutlich größer)."""
+        __slots__ = ('st_size', 'st_mtime_ns', 'st_ino')
+
+        def __init__(self, st):
+            self.st_size = st.st_size
+            self.st_mtime_ns = st.st_mtime_ns
+            self.st_ino = st.st_ino
+
+    def __init__(self, root, extensions, threads=None, exclude=None, lookahead=None):
+        self.root = root
+        self.extensions = set(extensions)
+        self.exclude = exclude  # ExcludeMatcher: ausgeschlossene Verzeichnisse werden nicht betreten
+        self.threads = max(1, threads if threads is not None else SCAN_THREADS)
+        self.lookahead = max(1, lookahead if lookahead is not None else SCAN_LOOKAHEAD)
+        self.file_stats = {}  # {extension: {'count': n, 'size': bytes}}
+        self.dir_count = 0
+        self.file_count = 0
+        self.relevant_count = 0
+        self.excluded_dirs = 0
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+        # Priorität = Position im Verzeichnisbaum (Preorder), damit zuerst gelesen wird,
+        # was der Verbraucher als Nächstes braucht
+        self._work = queue.PriorityQueue()
+        self._pending = 0
+        # Gegendruck: gefundene, noch nicht gelieferte Dateien; Worker warten bei vollem Puffer.
+        # Wartet der Verbraucher selbst auf ein Verzeichnis, darf ein Worker es trotzdem lesen
+        self._capacity = threading.Condition(self._lock)
+        self._buffered = 0
+        self._bypass = 0
+        self._stopped = threading.Event()
+        self._root_node = self._Node(root)
+        self._workers = []
+
+    def start(self):
+        """Startet die Scan-Threads."""
+        self._pending = 1
+        self._work.put(((), self._root_node))
+        for i in range(self.threads):
+            t = threading.Thread(target=self._worker, name=f"scan-{i}", daemon=True)
+            t.start()
+            self._workers.append(t)
+        return self
+
+    def stop(self):
+        """Bricht den Scan ab (z.B. bei Benutzerabbruch)."""
+        self._stopped.set()
+        with self._capacity:
+            self._capacity.notify_all()
+        for _ in self._workers:
+            self._work.put(((float('inf'),), None))
+
+    def _worker(self):
+        while not self._stopped.is_set():
+            with self._capacity:
+                while (self._buffered >= self.lookahead and not self._bypass
+                       and not self._stopped.is_set()):
+                    self._capacity.wait()
+                if self._buffered >= self.lookahead and self._bypass:
+                    self._bypass -= 1
+            # Die Queue liefert das früheste Verzeichnis, also das, auf das der Verbraucher wartet
+            key, node = self._work.get()
+            if node is None:
+                break
+            try:
+                self._scan(key, node)
+            finally:
+                node.done.set()
+                with self._lock:
+                    self._pending -= 1
+                    last = self._pending == 0
+                if last:
+                    self.finished.set()
+                    self.stop()
+
+    def _scan(self, key, node):
+        files = []
+        subdirs = []
+        stats = {}
+        file_count = 0
+        excluded_dirs = 0
+        try:
+            with os.scandir(node.path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            # Wie os.walk: symbolische Links auf Verzeichnisse nicht verfolgen
+                            if entry.is_symlink():
+                                continue
+                            if self.exclude is not None and self.exclude.matches_dir(entry.name):
+                                excluded_dirs += 1
+                            else:
+                                subdirs.append(entry.name)
+                            continue
+                    except OSError:
+                        continue
+
+                    file_count += 1
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    try:
+                        st = self._FileStat(entry.stat())
+                        ext_stats = stats.setdefault(ext, [0, 0])
+                        ext_stats[0] += 1
+                        ext_stats[1] += st.st_size
+                    except OSError:
+                        # Überspringe Dateien, auf die nicht zugegriffen werden kann (nur Statistik)
+                        st = None
+                    if ext in self.extensions:
+                        files.append((entry.name, st))
+        except OSError:
+            # Verzeichnis nicht lesbar - wie os.walk stillschweigend überspringen
+            pass
+
+        # Sortiere Verzeichnisse und Dateien alphabetisch
+        files.sort(key=lambda item: item[0])
+        subdirs.sort()
+        node.files = [(os.path.join(node.path, name), st) for name, st in files]
+        node.children = [self._Node(os.path.join(node.path, name)) for name in subdirs]
+
+        with self._lock:
+            self.dir_count += 1
+            self.file_count += file_count
+            self.relevant_count += len(files)
+            self._buffered += len(files)
+            self.excluded_dirs += excluded_dirs
+            for ext, (count, size) in stats.items():
+                ext_stats = self.file_stats.setdefault(ext, {'count': 0, 'size': 0})
+                ext_stats['count'] += count
+                ext_stats['size'] += size
+            self._pending += len(node.children)
+        for i, child in enumerate(node.children):
+            self._work.put((key + (i,), child))
+
+    def __iter__(self):
+        """Liefert (Pfad, stat) aller relevanten Dateien in sortierter Reihenfolge."""
+        stack = [self._root_node]
+        while stack:
+            node = stack.pop()
+            if not node.done.is_set():
+                with self._capacity:
+                    self._bypass += 1
+                    self._capacity.notify()
+                while not node.done.wait(0.1):
+                    if self._stopped.is_set() and not self.finished.is_set():
+                        return
+                with self._capacity:
+                    self._bypass = 0
+            files, node.files = node.files, None
+            children, node.children = node.children, None
+            for item in files:
+                with self._capacity:
+                    self._buffered -= 1
+                    if self._buffered == self.lookahead - 1:
+                        self._capacity.notify_all()
+                yield item
+            stack.extend(reversed(children))
+
+def print_extension_stats(file_stats):
+    """Gibt die Statistik der Dateiendungen ({ext: {'count', 'size'}}) als Tabelle aus."""
+    print("\n" + "=" * 80)
+    print("STATISTIK DER DATEIENDUNGEN")
+    print("=" * 80)
+    print(f"{'Endung':<18} {'Anzahl':>8} {'Größe (MB)':>12} {'Ø Größe (KB)':>14}  {'Status':<15}")
+    print("-" * 80)
+
+    # Sortiere nach Anzahl der Dateien (absteigend)
+    sorted_stats = sorted(file_stats.items(), key=lambda x: x[1]['count'], reverse=True)
+
+    for ext, stats in sorted_stats:
+        count = stats['count']
+        total_size_mb = stats['size'] / (1024 * 1024)
+        avg_size_kb = (stats['size'] / count) / 1024 if count > 0 else 0
+
+        # Markiere ob dieser Typ analysiert wird
+        ext_display = ext if ext else "(keine)"
+        will_analyze = "→ WIRD ANALYSIERT" if ext in EXTENSIONS else ""
+
+        print(f"{ext_display:<18} {count:>8,} {total_size_mb:>12.2f} {avg_size_kb:>14.2f}  {will_analyze:<15}")
+
+    print("=" * 80)
+
+class ProcessingPipeline:
+    """
+    Pipeline-Modus für walk_and_process().
+
+    Stufe 1 (EXTRACT_THREADS Threads): prepare_document() - Prüfungen und Textextraktion
+    Stufe 2 (LLM_CONCURRENCY Threads): analyze_document() - LLM-Anfragen und JSON-Ausgabe
+
+    Die Stufen sind über begrenzte Queues verbunden, damit die Extraktion dem LLM
+    nicht beliebig weit vorausläuft. Die JSON-Ausgabe ist identisch zum sequentiellen
+    Modus, da dieselben Funktionen verwendet werden.
+
+    Ergebnisse werden als Tupel (src_file, tag, result, error) geliefert:
+    - result: Rückgabewert wie bei process_file()
+    - error: Exception der Verarbeitung oder None
+    """
+
+    _STOP = object()
+
+    def __init__(self, extract_threads, llm_concurrency, queue_size=None):
+        self.extract_threads = max(1, extract_threads)
+        self.llm_concurrency = max(1, llm_concurrency)
+        self.extract_queue = queue.Queue(maxsize=queue_size or self.extract_threads * 2)
+        self.llm_queue = queue.Queue(maxsize=queue_size or self.llm_concurrency * 2)
+        self.result_queue = queue.Queue()
+        self.aborted = threading.Event()
+        self._lock = threading.Lock()
+        self._extract_alive = self.extract_threads
+        self._llm_alive = self.llm_concurrency
+        self._finished = False
+
+        for i in range(self.extract_threads):
+            threading.Thread(target=self._extract_worker, name=f"extract-{i + 1}", daemon=True).start()
+        for i in range(self.llm_concurrency):
+            threading.Thread(target=self._llm_worker, name=f"llm-{i + 1}", daemon=True).start()
+
+    def submit(self, src_file, tag=None):
+        """Reiht eine Datei ein (blockiert, solange die Extraktions-Queue voll ist)."""
+        self.extract_queue.put((src_file, tag))
+
+    def close(self):
+        """Signalisiert, dass keine weiteren Dateien folgen."""
+        for _ in range(self.extract_threads):
+            self.extract_queue.put(self._STOP)
+
+    def abort(self):
+        """Verwirft noch nicht begonnene Dateien (laufende Anfragen werden beendet)."""
+        self.aborted.set()
+
+    def results(self, block=False):
+        """
+        Liefert fertige Ergebnisse.
+
+        Args:
+            block: False = nur bereits vorliegende Ergebnisse, True = bis alle Dateien fertig sind
+        """
+        while not self._finished:
+            try:
+                item = self.result_queue.get(block=block)
+            except queue.Empty:
+                return
+            if item is self._STOP:
+                self._finished = True
+                return
+            yield item
+
+    def _extract_worker(self):
+        while True:
+            item = self.extract_queue.get()
+            if item is self._STOP:
+                break
+            src_file, tag = item
+            if self.aborted.is_set():
+                continue
+            try:
+                document, result = prepare_document(src_file)
+            except BaseException as e:
+                self.result_queue.put((src_file, tag, None, e))
+                continue
+            if document is None:
+                self.result_queue.put((src_file, tag, result, None))
+            else:
+                self.llm_queue.put((document, tag))
+
+        with self._lock:
+            self._extract_alive -= 1
+            last = self._extract_alive == 0
+        if last:
+            for _ in range(self.llm_concurrency):
+                self.llm_queue.put(self._STOP)
+
+    def _llm_worker(self):
+        while True:
+            item = self.llm_queue.get()
+            if item is self._STOP:
+                break
+            document, tag = item
+            if self.aborted.is_set():
+                continue
+            try:
+                result = analyze_document(document)
+                self.result_queue.put((document['src_file'], tag, result, None))
+            except BaseException as e:
+                self.result_queue.put((document['src_file'], tag, None, e))
+
+        with self._lock:
+            self._llm_alive -= 1
+            last = self._llm_alive == 0
+        if last:
+            self.result_queue.put(self._STOP)
+
 def walk_and_process():
+    global _EXTRACTION_POOL, _MANIFEST
+
+    # Textextraktion in Worker-Prozessen (Pool startet erst bei der ersten Datei)
+    if EXTRACT_WORKERS > 0:
+        _EXTRACTION_POOL = ExtractionPool(EXTRACT_WORKERS)
+
+    clear_hash_cache()
+
+    if USE_MANIFEST:
+        try:
+            _MANIFEST = FileManifest.open_default()
+        except Exception as e:
+            print(f"Warnung: Manifest konnte nicht geöffnet werden, validiere alle JSON-Dateien: {e}")
+        if _MANIFEST is not None:
+            try:
+                load_duplicate_index(_MANIFEST)
+            except Exception as e:
+                print(f"Warnung: Duplikat-Index konnte nicht geladen werden: {e}")
+                close_duplicate_index()
+
+    try:
+        _walk_and_process()
+    finally:
+        if _EXTRACTION_POOL is not None:
+            _EXTRACTION_POOL.shutdown()
+            _EXTRACTION_POOL = None
+        shutdown_pdf_page_pool()
+        close_duplicate_index()
+        if _MANIFEST is not None:
+            _MANIFEST.close()
+            _MANIFEST = None
+
+def _walk_and_process():
     global ERROR_HANDLING_MODE
 
     # Setze Fehlerbehandlungsmodus zurück für neuen Durchlauf
@@ -2641,104 +5156,18 @@ def walk_and_process():
         print(f"    {PLATFORM.platform_name}:  {PLATFORM.tesseract_install_cmd}")
         print("    Python: pip install pytesseract pillow")
 
-    # Zähle zunächst alle zu verarbeitenden Dateien mit Fortschrittsanzeige
-    print("\nScanne Verzeichnis...")
-    all_files = []
-    dir_count = 0
-    file_count = 0
-    last_line_length = 0  # Tracke die Länge der letzten Zeile
-    file_stats = {}  # Statistik: {extension: {'count': n, 'size': bytes, 'files': [paths]}}
-
-    # Nutze os.walk und zeige Fortschritt mit \r (carriage return)
-    for root, dirs, files in os.walk(SRC_ROOT):
-        # Sortiere Verzeichnisse und Dateien alphabetisch
-        dirs.sort()
-        files.sort()
-
-        dir_count += 1
-
-        # Zähle relevante Dateien in diesem Verzeichnis
-        relevant_files = 0
-        for name in files:
-            file_count += 1
-            ext = os.path.splitext(name)[1].lower()
-            full_path = os.path.join(root, name)
-
-            # Sammle Statistiken für alle Dateien
-            try:
-                file_size = os.path.getsize(full_path)
-                if ext not in file_stats:
-                    file_stats[ext] = {'count': 0, 'size': 0, 'files': []}
-                file_stats[ext]['count'] += 1
-                file_stats[ext]['size'] += file_size
-                file_stats[ext]['files'].append(full_path)
-            except (OSError, PermissionError):
-                # Überspringe Dateien, auf die nicht zugegriffen werden kann
-                pass
-
-            if ext in EXTENSIONS:
-                all_files.append(full_path)
-                relevant_files += 1
-
-        # Zeige Fortschritt (überschreibe vorherige Zeile mit \r)
-        if dir_count % 10 == 0 or relevant_files > 0:
-            rel_path = os.path.relpath(root, SRC_ROOT)
-            if len(rel_path) > 50:
-                rel_path = "..." + rel_path[-47:]
-
-            # Erstelle die Ausgabezeile
-            line = f"  Verzeichnisse: {dir_count:,} | Dateien gescannt: {file_count:,} | Relevante Dateien: {len(all_files):,} | {rel_path}"
-
-            # Füge Leerzeichen hinzu, um alte längere Zeilen vollständig zu überschreiben
-            if len(line) < last_line_length:
-                line = line + " " * (last_line_length - len(line))
-
-            # Merke die aktuelle Zeilenlänge für das nächste Update
-            last_line_length = len(line)
-
-            # Schreibe mit \r am Anfang (Cursor an Zeilenanfang) ohne Zeilenumbruch
-            sys.stdout.write(f"\r{line}")
-            sys.stdout.flush()
-
-    # Finaler Status mit Zeilenumbruch
-    final_line = f"  Verzeichnisse: {dir_count:,} | Dateien gescannt: {file_count:,} | Relevante Dateien: {len(all_files):,}"
-    if len(final_line) < last_line_length:
-        final_line = final_line + " " * (last_line_length - len(final_line))
-    sys.stdout.write(f"\r{final_line}\n")
-    sys.stdout.flush()
-
-    # Zeige Statistik nach Dateiendungen
-    print("\n" + "=" * 80)
-    print("STATISTIK DER DATEIENDUNGEN")
-    print("=" * 80)
-    print(f"{'Endung':<18} {'Anzahl':>8} {'Größe (MB)':>12} {'Ø Größe (KB)':>14}  {'Status':<15}")
-    print("-" * 80)
-
-    # Sortiere nach Anzahl der Dateien (absteigend)
-    sorted_stats = sorted(file_stats.items(), key=lambda x: x[1]['count'], reverse=True)
-
-    for ext, stats in sorted_stats:
-        count = stats['count']
-        total_size_mb = stats['size'] / (1024 * 1024)
-        avg_size_kb = (stats['size'] / count) / 1024 if count > 0 else 0
-
-        # Markiere ob dieser Typ analysiert wird
-        ext_display = ext if ext else "(keine)"
-        will_analyze = "→ WIRD ANALYSIERT" if ext in EXTENSIONS else ""
-
-        print(f"{ext_display:<18} {count:>8,} {total_size_mb:>12.2f} {avg_size_kb:>14.2f}  {will_analyze:<15}")
-
-    print("=" * 80)
-
-    total_files = len(all_files)
-    print(f"\nGefunden: {total_files} Dateien zum Verarbeiten")
+    # Verzeichnis-Scan läuft parallel im Hintergrund, Dateien werden sofort verarbeitet
+    print(f"\nScanne Verzeichnis ({SCAN_THREADS} Threads, Verarbeitung startet sofort)...")
     print("\nHinweis: Drücken Sie Enter während der Verarbeitung,")
     print("         um anzuhalten und zu wählen, ob Sie fortfahren möchten.")
     print("=" * 70)
+    scanner = DirectoryScanner(SRC_ROOT, EXTENSIONS, exclude=get_exclude_matcher()).start()
 
-    if total_files == 0:
-        print("Keine Dateien gefunden.")
-        return
+    def total_label():
+        # Gesamtzahl ist erst nach Ende des Scans bekannt ("+" = Scan läuft noch)
+        if scanner.finished.is_set():
+            return f"{scanner.relevant_count}"
+        return f"{scanner.relevant_count}+"
 
     # Verarbeite Dateien mit Fortschrittsanzeige
     processed = 0
@@ -2750,14 +5179,95 @@ def walk_and_process():
     duplicates = 0  # Zähler für Duplikate
     start_time = time.time()
 
-    for idx, full_path in enumerate(all_files, 1):
+    # Pipeline-Modus: Extraktion und LLM-Anfragen parallel (siehe ProcessingPipeline)
+    pipeline = None
+    if LLM_CONCURRENCY > 0:
+        # Mindestens ein Extraktions-Thread pro Worker-Prozess, damit alle Prozesse ausgelastet sind
+        extract_threads = max(EXTRACT_THREADS, EXTRACT_WORKERS)
+        pipeline = ProcessingPipeline(extract_threads, LLM_CONCURRENCY)
+        print(f"Pipeline-Modus: {extract_threads} Extraktions-Threads, "
+              f"{LLM_CONCURRENCY} parallele LLM-Anfragen")
+    if EXTRACT_WORKERS > 0:
+        print(f"Textextraktion in {EXTRACT_WORKERS} Worker-Prozessen "
+              f"(Neustart nach {EXTRACT_MAX_TASKS_PER_WORKER} Dateien, "
+              f"Limit {EXTRACT_MEMORY_LIMIT_MB} MB, Timeout {EXTRACT_TIMEOUT}s)")
+    if pipeline or EXTRACT_WORKERS > 0:
+        print("=" * 70)
+
+    def print_progress(idx, full_path):
+        # Berechne Zeitschätzung
+        elapsed = time.time() - start_time
+        # Berechne Durchschnitt nur für tatsächlich verarbeitete Dateien
+        actually_processed = processed + recreated
+        # Zeige aktuellen Dateipfad (relativ für bessere Lesbarkeit)
+        current_rel_path = os.path.relpath(full_path, SRC_ROOT)
+        print(f"\n📄 Datei: {current_rel_path}")
+
+        total_files = max(scanner.relevant_count, idx)
+        if actually_processed > 0:
+            avg_time_per_file = elapsed / actually_processed
+            remaining_files = total_files - idx
+            estimated_remaining = avg_time_per_file * remaining_files
+
+            print(f"[{idx}/{total_label()}] Fortschritt: {(idx/total_files)*100:.1f}%")
+            print(f"Neu: {processed} | Neu erstellt: {recreated} | Übersprungen: {skipped} | Fehler: {errors}")
+            print(f"Duplikate: {duplicates} | Ausgeschlossen: {excluded} | OCR: {ocr_count}")
+            print(f"Verstrichene Zeit: {format_time(elapsed)}")
+            print(f"Geschätzte Restzeit: {format_time(estimated_remaining)}")
+            print(f"Geschätzte Gesamtzeit: {format_time(elapsed + estimated_remaining)}")
+            print(f"Durchschnitt: {avg_time_per_file:.2f}s pro Datei")
+            print("=" * 70)
+        else:
+            print(f"[{idx}/{total_label()}] Fortschritt: {(idx/total_files)*100:.1f}%")
+            print(f"Neu: {processed} | Neu erstellt: {recreated} | Übersprungen: {skipped} | Fehler: {errors}")
+            print(f"Duplikate: {duplicates} | Ausgeschlossen: {excluded} | OCR: {ocr_count}")
+            print("=" * 70)
+
+    def collect_pipeline_results(idx, block=False):
+        # Übernimmt fertige Dateien aus der Pipeline in die Statistik
+        nonlocal processed, recreated, errors, ocr_count
+        for src_file, tag, ocr_info, error in pipeline.results(block=block):
+            if isinstance(error, SystemExit):
+                # Benutzer hat bei einem LM Studio-Fehler "Abbrechen" gewählt
+                pipeline.abort()
+                raise error
+            if error is not None:
+                errors += 1
+                print("Fehler bei", src_file, "->", error)
+                continue
+            if tag == "recreated":
+                recreated += 1
+            else:
+                processed += 1
+            if ocr_info and ocr_info.get('used_ocr'):
+                ocr_count += 1
+            print_progress(idx, src_file)
+
+    scan_reported = False
+
+    def report_scan():
+        # Scan-Statistik einmalig ausgeben, sobald der Scan abgeschlossen ist
+        nonlocal scan_reported
+        scan_reported = True
+        print(f"\nScan abgeschlossen: Verzeichnisse: {scanner.dir_count:,} | "
+              f"Dateien gescannt: {scanner.file_count:,} | Relevante Dateien: {scanner.relevant_count:,}")
+        print_extension_stats(scanner.file_stats)
+
+    idx = 0
+    for idx, (full_path, src_stat) in enumerate(scanner, 1):
+        if not scan_reported and scanner.finished.is_set():
+            report_scan()
+
         # Prüfe auf Tasteneingabe
         if check_user_input():
             if not ask_continue():
+                scanner.stop()
+                if pipeline:
+                    pipeline.abort()
                 print("\n" + "=" * 70)
                 print("VERARBEITUNG VOM BENUTZER ABGEBROCHEN")
                 print("=" * 70)
-                print(f"Verarbeitet bis Datei {idx}/{total_files}")
+                print(f"Verarbeitet bis Datei {idx}/{total_label()}")
                 print(f"Neu verarbeitet: {processed}")
                 print(f"Neu erstellt (vorher fehlerhaft): {recreated}")
                 print(f"Übersprungen (valide): {skipped}")
@@ -2768,6 +5278,13 @@ def walk_and_process():
                 print("=" * 70)
                 return
 
+        if pipeline:
+            try:
+                collect_pipeline_results(idx)
+            except SystemExit:
+                scanner.stop()
+                raise
+
         try:
             # Schritt 1: Prüfe ob Pfad ausgeschlossen werden soll
             if should_exclude_path(full_path):
@@ -2776,9 +5293,29 @@ def walk_and_process():
                     print(f"Ausgeschlossen (Pattern-Match): {os.path.relpath(full_path, SRC_ROOT)}")
                 continue
 
-            # Schritt 2: Prüfe auf Duplikate (basierend auf Content-Hash)
+            rel_path = os.path.relpath(full_path, SRC_ROOT)
+
+            # Schritt 2: Unveränderte Dateien laut Manifest sofort überspringen (nur stat, kein Hash)
+            if _MANIFEST is not None:
+                try:
+                    if src_stat is None:
+                        src_stat = os.stat(full_path)
+                    entry = _MANIFEST.lookup_unchanged(rel_path, src_stat)
+                except OSError:
+                    entry = None
+                # Gelöschte JSON-Dateien werden trotz Manifest-Eintrag neu erzeugt
+                if entry is not None and os.path.exists(os.path.join(DST_ROOT, rel_path + ".json")):
+                    seed_content_hash(full_path, src_stat, entry['content_hash'])
+                    register_known_file(full_path, src_stat.st_size, entry['content_hash'])
+                    skipped += 1
+                    if entry['used_ocr']:
+                        ocr_count += 1
+                    print_progress(idx, full_path)
+                    continue
+
+            # Schritt 3: Prüfe auf Duplikate (basierend auf Content-Hash)
             try:
-                file_size = os.path.getsize(full_path)
+                file_size = src_stat.st_size if src_stat is not None else os.path.getsize(full_path)
                 is_dup, original_path = is_duplicate_file(full_path, file_size)
                 if is_dup:
                     duplicates += 1
@@ -2789,8 +5326,7 @@ def walk_and_process():
             except OSError:
                 pass  # Bei Fehler: Fahre normal fort
 
-            # Schritt 3: Prüfe ob bereits existiert und valide ist
-            rel_path = os.path.relpath(full_path, SRC_ROOT)
+            # Schritt 4: Prüfe ob bereits existiert und valide ist
             dst_dir = os.path.join(DST_ROOT, os.path.dirname(rel_path))
             dst_file = os.path.join(dst_dir, os.path.basename(full_path) + ".json")
 
@@ -2810,11 +5346,26 @@ def walk_and_process():
                             existing_data = json.load(f)
                             ocr_info = existing_data.get('ocr_info', None)
                     except:
-                        pass
+                        existing_data = {}
+
+                    # Im Manifest vermerken, damit der nächste Lauf ohne Hashen überspringt
+                    if _MANIFEST is not None and existing_data.get('content_hash'):
+                        try:
+                            _MANIFEST.record(rel_path, os.stat(full_path), existing_data['content_hash'],
+                                             used_ocr=bool(ocr_info and ocr_info.get('used_ocr')))
+                        except OSError:
+                            pass
+                elif pipeline:
+                    # Fehlerhafte oder veraltete Datei wird in prepare_document gelöscht und neu erstellt
+                    pipeline.submit(full_path, "recreated")
+                    continue
                 else:
                     # Fehlerhafte oder veraltete Datei wird in process_file gelöscht und neu erstellt
                     ocr_info = process_file(full_path)
                     recreated += 1
+            elif pipeline:
+                pipeline.submit(full_path, "processed")
+                continue
             else:
                 ocr_info = process_file(full_path)
                 processed += 1
@@ -2823,38 +5374,25 @@ def walk_and_process():
             if ocr_info and ocr_info.get('used_ocr'):
                 ocr_count += 1
 
-            # Berechne Zeitschätzung
-            elapsed = time.time() - start_time
-            if idx > 0:
-                # Berechne Durchschnitt nur für tatsächlich verarbeitete Dateien
-                actually_processed = processed + recreated
-                # Zeige aktuellen Dateipfad (relativ für bessere Lesbarkeit)
-                current_rel_path = os.path.relpath(full_path, SRC_ROOT)
-                print(f"\n📄 Datei: {current_rel_path}")
-
-                if actually_processed > 0:
-                    avg_time_per_file = elapsed / actually_processed
-                    remaining_files = total_files - idx
-                    estimated_remaining = avg_time_per_file * remaining_files
-
-                    print(f"[{idx}/{total_files}] Fortschritt: {(idx/total_files)*100:.1f}%")
-                    print(f"Neu: {processed} | Neu erstellt: {recreated} | Übersprungen: {skipped} | Fehler: {errors}")
-                    print(f"Duplikate: {duplicates} | Ausgeschlossen: {excluded} | OCR: {ocr_count}")
-                    print(f"Verstrichene Zeit: {format_time(elapsed)}")
-                    print(f"Geschätzte Restzeit: {format_time(estimated_remaining)}")
-                    print(f"Geschätzte Gesamtzeit: {format_time(elapsed + estimated_remaining)}")
-                    print(f"Durchschnitt: {avg_time_per_file:.2f}s pro Datei")
-                    print("=" * 70)
-                else:
-                    print(f"[{idx}/{total_files}] Fortschritt: {(idx/total_files)*100:.1f}%")
-                    print(f"Neu: {processed} | Neu erstellt: {recreated} | Übersprungen: {skipped} | Fehler: {errors}")
-                    print(f"Duplikate: {duplicates} | Ausgeschlossen: {excluded} | OCR: {ocr_count}")
-                    print("=" * 70)
+            print_progress(idx, full_path)
 
         except Exception as e:
             errors += 1
             print("Fehler bei", full_path, "->", e)
 
+    # Warte auf die restlichen Dateien in der Pipeline
+    if pipeline:
+        pipeline.close()
+        collect_pipeline_results(idx, block=True)
+
+    if not scan_reported:
+        report_scan()
+    total_files = scanner.relevant_count
+
+    if total_files == 0:
+        print("Keine Dateien gefunden.")
+        return
+
     # Abschlussbericht
     total_time = time.time() - start_time
     print("\n" + "=" * 70)
@@ -2873,84 +5411,339 @@ def walk_and_process():
     actually_processed = processed + recreated
     if actually_processed > 0:
         print(f"Durchschnitt: {total_time/actually_processed:.2f}s pro Datei (nur verarbeitete)")
+    print_llm_cache_stats()
+    dup_stats = get_duplicate_stats()
+    if dup_stats['by_size'] + dup_stats['by_partial'] > 0:
+        print(f"Duplikat-Prüfung: {dup_stats['by_size']:,} per Größe, {dup_stats['by_partial']:,} per Teil-Hash "
+              f"entschieden, davon {dup_stats['full_hashes_avoided']:,} ohne vollen Hash; "
+              f"{dup_stats['full_hashes']:,} volle Hashes berechnet")
     if duplicates > 0:
         print(f"\nℹ Hinweis: {duplicates} Duplikate wurden automatisch erkannt und übersprungen")
     if excluded > 0:
         print(f"ℹ Hinweis: {excluded} Dateien in ausgeschlossenen Verzeichnissen übersprungen")
+    if scanner.excluded_dirs > 0:
+        print(f"ℹ Hinweis: {scanner.excluded_dirs} ausgeschlossene Verzeichnisse wurden nicht durchsucht")
     print("=" * 70)
 
-def cleanup_invalid_phone_numbers():
+def collect_json_files(exclude_dir=None):
     """
-    Bereinigt alle vorhandenen JSON-Dateien und entfernt ungültige Kontaktinformationen.
-    Re-extrahiert URLs, E-Mails und Telefonnummern aus Quelldateien wenn nötig.
-    Entfernt: URLs mit Satzzeichen, E-Mails mit URL-Präfix, ungültige Telefonnummern.
-    """
-    print("\n" + "=" * 80)
-    print("BEREINIGUNG: UNGÜLTIGE KONTAKTINFORMATIONEN ENTFERNEN")
-    print("=" * 80)
-    print(f"Durchsuche: {DST_ROOT}")
-    print("=" * 80 + "\n")
+    Sammelt alle JSON-Dateien unter DST_ROOT in stabiler Reihenfolge (ohne Zustandsverzeichnis).
 
-    # Sammle alle JSON-Dateien
+    Args:
+        exclude_dir: Optional - Verzeichnis, das nicht durchsucht wird (z.B. DST_ROOT/database)
+
+    Returns:
+        list: Absolute Pfade der JSON-Dateien
+    """
     all_json_files = []
     for root, dirs, files in os.walk(DST_ROOT):
-        # Sortiere für konsistente Reihenfolge
-        dirs.sort()
+        # Sortiere für konsistente Reihenfolge (Voraussetzung für das Fortsetzen per Checkpoint)
+        dirs[:] = sorted(d for d in dirs
+                         if d != STATE_DIR_NAME and os.path.join(root, d) != exclude_dir)
         files.sort()
 
         for name in files:
             if name.endswith('.json'):
-                full_path = os.path.join(root, name)
-                all_json_files.append(full_path)
-
-    total_files = len(all_json_files)
-    print(f"Gefunden: {total_files:,} JSON-Dateien\n")
+                all_json_files.append(os.path.join(root, name))
+    return all_json_files
 
-    if total_files == 0:
-        print("Keine JSON-Dateien gefunden.")
-        return
+def source_file_for_json(json_file):
+    """
+    Bestimmt die Quelldatei zu einer JSON-Datei.
+    JSON-Dateien enden mit ".original_extension.json".
+    """
+    rel_path = os.path.relpath(json_file, DST_ROOT)
+    src_rel_path = rel_path.replace('.json', '')  # Entferne .json
+    return os.path.join(SRC_ROOT, src_rel_path)
+
+def _merge_bulk_stats(total, stats):
+    """Addiert Zähler (auch verschachtelte dicts wie Kategorien) aus stats in total."""
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            _merge_bulk_stats(total.setdefault(key, {}), value)
+        else:
+            total[key] = total.get(key, 0) + value
 
-    # Statistiken
-    files_cleaned = 0
-    total_invalid_removed = 0
-    files_with_invalid = 0
-    start_time = time.time()
+def _dsgvo_update_chunk(json_files):
+    """
+    Worker-Auftrag für --update-dsgvo: klassifiziert einen Block von JSON-Dateien.
 
-    for idx, json_file in enumerate(all_json_files, 1):
+    Returns:
+        dict: Zähler {'updated', 'sensitive', 'categories': {kategorie: anzahl}}
+    """
+    stats = {'updated': 0, 'sensitive': 0, 'categories': {}}
+    for json_file in json_files:
         try:
-            # Bestimme Quelldatei
-            # JSON-Dateien enden mit ".original_extension.json"
-            rel_path = os.path.relpath(json_file, DST_ROOT)
-            src_rel_path = rel_path.replace('.json', '')  # Entferne .json
-            src_file = os.path.join(SRC_ROOT, src_rel_path)
-
+            src_file = source_file_for_json(json_file)
             if not os.path.exists(src_file):
                 continue
 
-            # Rufe update_json_with_contact_info auf (prüft und bereinigt automatisch)
-            was_updated = update_json_with_contact_info(json_file, src_file)
-
-            if was_updated:
-                files_cleaned += 1
+            # Rufe DSGVO-Update auf
+            if not update_json_with_dsgvo_classification(json_file, src_file):
+                continue
+            stats['updated'] += 1
 
-            # Fortschritt anzeigen
-            if idx % 100 == 0 or idx == total_files:
-                elapsed = time.time() - start_time
-                progress = (idx / total_files) * 100
-                print(f"\rFortschritt: {idx:,}/{total_files:,} ({progress:.1f}%) - "
-                      f"Bereinigt: {files_cleaned:,} - Zeit: {elapsed:.1f}s", end="", flush=True)
+            # Lese JSON um zu prüfen ob sensible Daten gefunden wurden
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    dsgvo = json.load(f).get('dsgvo_classification', {})
+                if dsgvo.get('contains_sensitive_data'):
+                    stats['sensitive'] += 1
+                    # Sammle Kategorien für Statistik
+                    for category in dsgvo.get('data_categories', []):
+                        stats['categories'][category] = stats['categories'].get(category, 0) + 1
+            except Exception:
+                pass
 
         except Exception as e:
             print(f"\nFehler bei {json_file}: {e}")
+    return stats
 
-    # Abschlussbericht
-    total_time = time.time() - start_time
-    print(f"\n\n" + "=" * 80)
+def _contact_cleanup_chunk(json_files):
+    """
+    Worker-Auftrag für --cleanup-phones: prüft einen Block von JSON-Dateien und durchsucht
+    die Texte gesammelt mit extract_contact_info_batch().
+
+    Returns:
+        dict: Zähler {'updated'}
+    """
+    stats = {'updated': 0}
+    pending_updates = []
+    for json_file in json_files:
+        try:
+            src_file = source_file_for_json(json_file)
+            if os.path.exists(src_file):
+                # Prüft die JSON und lädt den Text (Bereinigung erfolgt für den ganzen Block)
+                pending = prepare_contact_update(json_file, src_file)
+                if pending is not None:
+                    pending_updates.append(pending)
+        except Exception as e:
+            print(f"\nFehler bei {json_file}: {e}")
+
+    batch = extract_contact_info_batch([pending['text'] for pending in pending_updates])
+    for pending, contact_info in zip(pending_updates, batch):
+        try:
+            if apply_contact_update(pending, contact_info):
+                stats['updated'] += 1
+        except Exception as e:
+            print(f"\nFehler bei {pending['json_path']}: {e}")
+    return stats
+
+# Wartungsaufträge für run_bulk_update() (Name wird an die Worker-Prozesse übergeben)
+BULK_UPDATE_TASKS = {
+    'dsgvo': _dsgvo_update_chunk,
+    'contacts': _contact_cleanup_chunk,
+}
+
+# Globale Einstellungen, die zusätzlich in die Wartungs-Worker übernommen werden
+_MAINTENANCE_WORKER_SETTINGS = _EXTRACT_WORKER_SETTINGS + ('USE_TEXT_STORE', 'USE_LLM_CACHE', 'LLM_CACHE_MAX_MB',
+                                                           'USE_SEARCH_INDEX', 'LLM_CONCURRENCY')
+
+def _run_bulk_update_chunk(task_name, json_files):
+    """
+    Führt einen Wartungsauftrag aus BULK_UPDATE_TASKS aus (im Worker-Prozess oder lokal).
+    Die LLM-Cache-Treffer des Auftrags werden unter 'llm_cache' mitgeliefert, da die Zähler
+    sonst im Worker-Prozess bleiben (siehe print_llm_cache_stats).
+    """
+    cache = get_llm_cache()
+    before = {kind: dict(counts) for kind, counts in cache.stats.items()} if cache is not None else {}
+    stats = BULK_UPDATE_TASKS[task_name](json_files)
+    if cache is not None:
+        delta = {}
+        for kind, counts in cache.stats.items():
+            previous = before.get(kind, {})
+            delta[kind] = {field: counts[field] - previous.get(field, 0) for field in ('hits', 'misses')}
+        if any(counts['hits'] or counts['misses'] for counts in delta.values()):
+            stats['llm_cache'] = delta
+    return stats
+
+def _load_bulk_checkpoint(checkpoint_path, task_name, json_files):
+    """
+    Liest den Checkpoint eines abgebrochenen Wartungslaufs.
+
+    Returns:
+        dict oder None (kein passender Checkpoint)
+    """
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if checkpoint.get('task') != task_name:
+        return None
+
+    # Fortsetzen hinter der zuletzt abgeschlossenen Datei - sie wird per Pfad gesucht,
+    # da seit dem Abbruch JSON-Dateien hinzugekommen oder verschwunden sein können
+    last_file = checkpoint.get('last_file')
+    next_index = checkpoint.get('next_index', 0)
+    if not last_file or next_index <= 0:
+        return None
+    last_path = os.path.join(DST_ROOT, last_file)
+    if next_index <= len(json_files) and json_files[next_index - 1] == last_path:
+        return checkpoint
+    try:
+        checkpoint['next_index'] = json_files.index(last_path) + 1
+        return checkpoint
+    except ValueError:
+        return None
+
+def _save_bulk_checkpoint(checkpoint_path, checkpoint):
+    """Schreibt den Checkpoint atomar (tmp-Datei + os.replace)."""
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, checkpoint_path)
+
+def run_bulk_update(task_name, json_files, progress_text, workers=None, chunk_files=None):
+    """
+    Führt einen Wartungsauftrag aus BULK_UPDATE_TASKS für alle JSON-Dateien aus.
+
+    Die Dateien werden in Blöcken von chunk_files auf einen Prozess-Pool verteilt. Nach jedem
+    lückenlos abgeschlossenen Block wird ein Checkpoint unter DST_ROOT/.fileinventory geschrieben;
+    ein abgebrochener Lauf setzt beim nächsten Aufruf dort fort (Zähler inklusive).
+
+    Args:
+        task_name: Schlüssel in BULK_UPDATE_TASKS
+        json_files: Liste aus collect_json_files()
+        progress_text: Funktion stats -> str für die Fortschrittsanzeige
+        workers: Anzahl Worker-Prozesse (Standard: MAINTENANCE_WORKERS)
+        chunk_files: Dateien pro Auftrag (Standard: MAINTENANCE_CHUNK_FILES)
+
+    Returns:
+        tuple: (stats, Gesamtzeit in Sekunden inkl. früherer Teilläufe)
+    """
+    workers = max(1, workers or MAINTENANCE_WORKERS)
+    chunk_files = max(1, chunk_files or MAINTENANCE_CHUNK_FILES)
+    total_files = len(json_files)
+    checkpoint_path = os.path.join(get_state_dir(), f"maintenance_{task_name}.json")
+
+    stats = {}
+    start_index = 0
+    previous_time = 0.0
+    checkpoint = _load_bulk_checkpoint(checkpoint_path, task_name, json_files)
+    if checkpoint is not None:
+        start_index = checkpoint['next_index']
+        stats = checkpoint.get('stats', {})
+        previous_time = checkpoint.get('elapsed', 0.0)
+        print(f"Setze abgebrochenen Lauf fort: {start_index:,}/{total_files:,} Dateien bereits erledigt\n")
+
+    chunks = [(index, json_files[index:index + chunk_files])
+              for index in range(start_index, total_files, chunk_files)]
+    start_time = time.time()
+    done_files = start_index
+    last_checkpoint = start_time
+
+    def report():
+        elapsed = time.time() - start_time
+        rate = (done_files - start_index) / elapsed if elapsed > 0 else 0.0
+        progress = (done_files / total_files) * 100 if total_files else 100.0
+        print(f"\rFortschritt: {done_files:,}/{total_files:,} ({progress:.1f}%) - {progress_text(stats)} - "
+              f"{rate:.1f} Dateien/s - Zeit: {previous_time + elapsed:.1f}s", end="", flush=True)
+
+    def chunk_done(index, chunk, chunk_stats):
+        nonlocal done_files, last_checkpoint
+        _merge_bulk_stats(stats, chunk_stats)
+        done_files = index + len(chunk)
+        report()
+        # Checkpoint höchstens alle 2 Sekunden schreiben
+        now = time.time()
+        if now - last_checkpoint >= 2 or done_files == total_files:
+            _save_bulk_checkpoint(checkpoint_path, {
+                'task': task_name,
+                'next_index': done_files,
+                'last_file': os.path.relpath(json_files[done_files - 1], DST_ROOT),
+                'total_files': total_files,
+                'stats': stats,
+                'elapsed': previous_time + now - start_time,
+                'updated': datetime.now().isoformat()
+            })
+            last_checkpoint = now
+
+    if workers <= 1 or len(chunks) <= 1:
+        for index, chunk in chunks:
+            chunk_done(index, chunk, _run_bulk_update_chunk(task_name, chunk))
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        print(f"Verteile {total_files - start_index:,} Dateien auf {workers} Prozesse "
+              f"({chunk_files} Dateien pro Auftrag)\n")
+        # LLM-Anfragen (z.B. Bankdaten-Prüfung bei --update-dsgvo) aller Worker zusammen auf
+        # LLM_CONCURRENCY begrenzen (mindestens 1) - der lokale Server bearbeitet sie sonst nur
+        # nacheinander und die wartenden Anfragen laufen in ihren Timeout
+        llm_semaphore = multiprocessing.Semaphore(max(1, LLM_CONCURRENCY))
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_maintenance_worker,
+            initargs=({name: globals()[name] for name in _MAINTENANCE_WORKER_SETTINGS}, llm_semaphore)
+        )
+        try:
+            # Höchstens 2 Aufträge pro Worker gleichzeitig einreichen; Ergebnisse werden in
+            # Reihenfolge übernommen, damit der Checkpoint keine Lücken überspringt
+            pending = []
+            chunk_iter = iter(chunks)
+            for index, chunk in chunk_iter:
+                pending.append((index, chunk, executor.submit(_run_bulk_update_chunk, task_name, chunk)))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                index, chunk, future = pending.pop(0)
+                chunk_done(index, chunk, future.result())
+                next_chunk = next(chunk_iter, None)
+                if next_chunk is not None:
+                    pending.append((next_chunk[0], next_chunk[1],
+                                    executor.submit(_run_bulk_update_chunk, task_name, next_chunk[1])))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    if not chunks and total_files:
+        report()
+
+    # Lauf vollständig - Checkpoint entfernen, damit der nächste Aufruf von vorne beginnt
+    try:
+        os.remove(checkpoint_path)
+    except OSError:
+        pass
+
+    return stats, previous_time + time.time() - start_time
+
+def cleanup_invalid_phone_numbers():
+    """
+    Bereinigt alle vorhandenen JSON-Dateien und entfernt ungültige Kontaktinformationen.
+    Re-extrahiert URLs, E-Mails und Telefonnummern aus Quelldateien wenn nötig.
+    Entfernt: URLs mit Satzzeichen, E-Mails mit URL-Präfix, ungültige Telefonnummern.
+    Läuft parallel und setzt nach einem Abbruch fort (siehe run_bulk_update).
+    """
+    print("\n" + "=" * 80)
+    print("BEREINIGUNG: UNGÜLTIGE KONTAKTINFORMATIONEN ENTFERNEN")
+    print("=" * 80)
+    print(f"Durchsuche: {DST_ROOT}")
+    print("=" * 80 + "\n")
+
+    # Sammle alle JSON-Dateien
+    all_json_files = collect_json_files()
+
+    total_files = len(all_json_files)
+    print(f"Gefunden: {total_files:,} JSON-Dateien\n")
+
+    if total_files == 0:
+        print("Keine JSON-Dateien gefunden.")
+        return
+
+    stats, total_time = run_bulk_update(
+        'contacts', all_json_files,
+        lambda stats: f"Bereinigt: {stats.get('updated', 0):,}"
+    )
+
+    # Abschlussbericht
+    print(f"\n\n" + "=" * 80)
     print("BEREINIGUNG ABGESCHLOSSEN")
     print("=" * 80)
     print(f"Gescannte Dateien: {total_files:,}")
-    print(f"Bereinigte Dateien: {files_cleaned:,}")
+    print(f"Bereinigte Dateien: {stats.get('updated', 0):,}")
     print(f"Gesamtzeit: {format_time(total_time)}")
+    if total_time > 0:
+        print(f"Durchsatz: {total_files / total_time:.1f} Dateien/s")
     print("=" * 80)
 
 def update_all_jsons_with_dsgvo():
@@ -2958,7 +5751,8 @@ def update_all_jsons_with_dsgvo():
     Aktualisiert alle vorhandenen JSON-Dateien mit DSGVO-Klassifizierung.
     Analysiert Dokumente auf besonders schutzbedürftige personenbezogene Daten
     gemäß Art. 9 DSGVO und § 26 BDSG.
-    Sehr schnell - nur Regex, kein LLM.
+    Sehr schnell - nur Regex, kein LLM. Läuft parallel und setzt nach einem Abbruch fort
+    (siehe run_bulk_update).
     """
     print("\n" + "=" * 80)
     print("DSGVO-UPDATE: KLASSIFIZIERUNG BESONDERS SCHUTZBEDÜRFTIGER DATEN")
@@ -2968,16 +5762,7 @@ def update_all_jsons_with_dsgvo():
     print("=" * 80 + "\n")
 
     # Sammle alle JSON-Dateien
-    all_json_files = []
-    for root, dirs, files in os.walk(DST_ROOT):
-        # Sortiere für konsistente Reihenfolge
-        dirs.sort()
-        files.sort()
-
-        for name in files:
-            if name.endswith('.json'):
-                full_path = os.path.join(root, name)
-                all_json_files.append(full_path)
+    all_json_files = collect_json_files()
 
     total_files = len(all_json_files)
     print(f"Gefunden: {total_files:,} JSON-Dateien\n")
@@ -2986,61 +5771,20 @@ def update_all_jsons_with_dsgvo():
         print("Keine JSON-Dateien gefunden.")
         return
 
-    # Statistiken
-    files_updated = 0
-    files_with_sensitive_data = 0
-    sensitive_categories = {}
-    start_time = time.time()
-
-    for idx, json_file in enumerate(all_json_files, 1):
-        try:
-            # Bestimme Quelldatei
-            # JSON-Dateien enden mit ".original_extension.json"
-            rel_path = os.path.relpath(json_file, DST_ROOT)
-            src_rel_path = rel_path.replace('.json', '')  # Entferne .json
-            src_file = os.path.join(SRC_ROOT, src_rel_path)
-
-            if not os.path.exists(src_file):
-                continue
-
-            # Rufe DSGVO-Update auf
-            was_updated = update_json_with_dsgvo_classification(json_file, src_file)
-
-            if was_updated:
-                files_updated += 1
-
-                # Lese JSON um zu prüfen ob sensible Daten gefunden wurden
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        dsgvo = data.get('dsgvo_classification', {})
-                        if dsgvo.get('contains_sensitive_data'):
-                            files_with_sensitive_data += 1
-                            # Sammle Kategorien für Statistik
-                            for category in dsgvo.get('data_categories', []):
-                                sensitive_categories[category] = sensitive_categories.get(category, 0) + 1
-                except:
-                    pass
-
-            # Fortschritt anzeigen
-            if idx % 50 == 0 or idx == total_files:
-                elapsed = time.time() - start_time
-                progress = (idx / total_files) * 100
-                print(f"\rFortschritt: {idx:,}/{total_files:,} ({progress:.1f}%) - "
-                      f"Aktualisiert: {files_updated:,} - Sensible Daten: {files_with_sensitive_data:,} - "
-                      f"Zeit: {elapsed:.1f}s", end="", flush=True)
-
-        except Exception as e:
-            print(f"\nFehler bei {json_file}: {e}")
+    stats, total_time = run_bulk_update(
+        'dsgvo', all_json_files,
+        lambda stats: (f"Aktualisiert: {stats.get('updated', 0):,} - "
+                       f"Sensible Daten: {stats.get('sensitive', 0):,}")
+    )
+    sensitive_categories = stats.get('categories', {})
 
     # Abschlussbericht
-    total_time = time.time() - start_time
     print(f"\n\n" + "=" * 80)
     print("DSGVO-UPDATE ABGESCHLOSSEN")
     print("=" * 80)
     print(f"Gescannte Dateien: {total_files:,}")
-    print(f"Aktualisierte Dateien: {files_updated:,}")
-    print(f"Dateien mit sensiblen Daten: {files_with_sensitive_data:,}")
+    print(f"Aktualisierte Dateien: {stats.get('updated', 0):,}")
+    print(f"Dateien mit sensiblen Daten: {stats.get('sensitive', 0):,}")
 
     if sensitive_categories:
         print(f"\nGefundene Kategorien besonders schutzbedürftiger Daten:")
@@ -3048,17 +5792,31 @@ def update_all_jsons_with_dsgvo():
             print(f"  • {category}: {count:,} Dokumente")
 
     print(f"\nGesamtzeit: {format_time(total_time)}")
+    if total_time > 0:
+        print(f"Durchsatz: {total_files / total_time:.1f} Dateien/s")
+    print_llm_cache_stats(stats.get('llm_cache', {}))
     print("=" * 80)
 
-def create_combined_database(max_size_mb=30, output_dir=None):
+def create_combined_database(max_size_mb=30, output_dir=None, incremental=False, fmt="json"):
     """
     Erstellt kombinierte JSON-Datenbank-Dateien aus allen einzelnen JSON-Dateien.
     Teilt die Datenbank in mehrere Dateien auf, wenn die Größe max_size_mb überschreitet.
 
+    In output_dir wird zusätzlich database_manifest.json geschrieben (welche JSON-Datei in
+    welcher Datenbank-Datei steht, und welche Datenbank-Dateien sich im letzten Lauf geändert haben).
+
     Args:
         max_size_mb: Maximale Größe pro Datenbankdatei in MB
         output_dir: Ausgabeverzeichnis für Datenbankdateien (Standard: DST_ROOT/database)
+        incremental: Nur Datenbank-Dateien neu schreiben, deren JSON-Dateien sich geändert haben
+        fmt: Ausgabeformat aus DATABASE_FORMATS:
+             json (eingerücktes JSON), jsonl/jsonl.gz/jsonl.zst (ein Dokument pro Zeile),
+             sqlite (eine Datei file_database.sqlite mit Tabellen für Entities und Keywords)
     """
+    if fmt == "jsonl.zst" and zstandard is None:
+        print("Fehler: Für --format jsonl.zst wird das Paket 'zstandard' benötigt (pip install zstandard)")
+        return
+
     if output_dir is None:
         output_dir = os.path.join(DST_ROOT, "database")
 
@@ -3071,6 +5829,8 @@ def create_combined_database(max_size_mb=30, output_dir=None):
     print(f"Quellverzeichnis: {DST_ROOT}")
     print(f"Ausgabeverzeichnis: {output_dir}")
     print(f"Maximale Größe pro Datei: {max_size_mb} MB")
+    print(f"Format: {fmt}")
+    print(f"Modus: {'inkrementell' if incremental else 'vollständig'}")
     print("=" * 80)
 
     # Sammle alle JSON-Dateien
@@ -3082,7 +5842,7 @@ def create_combined_database(max_size_mb=30, output_dir=None):
             continue
 
         # Sortiere für konsistente Reihenfolge
-        dirs.sort()
+        dirs[:] = sorted(d for d in dirs if d != STATE_DIR_NAME)
         files.sort()
 
         for name in files:
@@ -3097,16 +5857,6 @@ def create_combined_database(max_size_mb=30, output_dir=None):
         print("Keine JSON-Dateien gefunden. Bitte führen Sie zuerst die normale Verarbeitung durch.")
         return
 
-    # Lade und kombiniere JSON-Dateien
-    print("\nLade und kombiniere Dateien...")
-    max_size_bytes = max_size_mb * 1024 * 1024
-
-    current_batch = []
-    current_size = 0
-    batch_number = 1
-    total_size = 0
-    failed_files = 0
-
     # Metadaten für die Datenbank
     database_metadata = {
         "created": datetime.now().isoformat(),
@@ -3118,113 +5868,1404 @@ def create_combined_database(max_size_mb=30, output_dir=None):
     }
 
     start_time = time.time()
+    if fmt == "sqlite":
+        # Eine SQLite-Datei statt größenbegrenzter Datenbank-Dateien
+        _create_sqlite_database(output_dir, all_json_files, database_metadata, incremental, start_time)
+        return
 
-    for idx, json_file in enumerate(all_json_files, 1):
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Schätze die Größe dieses Eintrags
-            entry_json = json.dumps(data, ensure_ascii=False)
-            entry_size = len(entry_json.encode('utf-8'))
-
-            # Prüfe ob wir eine neue Datei starten müssen
-            # Reserviere 2000 Bytes für Metadaten und JSON-Struktur
-            if current_size + entry_size + 2000 > max_size_bytes and current_batch:
-                # Schreibe aktuelle Batch
-                write_database_file(output_dir, batch_number, current_batch, database_metadata, max_size_mb)
-                total_size += current_size
-                batch_number += 1
-                current_batch = []
-                current_size = 0
-
-            # Füge zu aktueller Batch hinzu
-            current_batch.append(data)
-            current_size += entry_size
-
-            # Fortschrittsanzeige
-            if idx % 100 == 0 or idx == total_files:
-                progress = (idx / total_files) * 100
-                print(f"\rFortschritt: {idx:,}/{total_files:,} ({progress:.1f}%) - "
-                      f"Batch {batch_number}: {len(current_batch):,} Dateien, "
-                      f"{current_size / (1024*1024):.2f} MB", end="", flush=True)
-
-        except json.JSONDecodeError as e:
-            failed_files += 1
-            print(f"\nWarnung: Fehlerhafte JSON-Datei übersprungen: {json_file}")
-            print(f"  Fehler: {e}")
-        except Exception as e:
-            failed_files += 1
-            print(f"\nWarnung: Fehler beim Lesen von {json_file}: {e}")
+    if fmt == "json":
+        writer = DatabaseWriter(output_dir, database_metadata, max_size_mb)
+    else:
+        writer = JsonlDatabaseWriter(output_dir, database_metadata, max_size_mb,
+                                     compression=fmt.split(".")[1] if "." in fmt else None)
+
+    manifest = load_database_manifest(output_dir)
+    previous_batches = manifest.get('batches', []) if manifest else []
+    if incremental and manifest is not None and (manifest.get('max_size_mb') != max_size_mb
+                                                 or manifest.get('json_directory') != DST_ROOT
+                                                 or manifest.get('format', 'json') != fmt):
+        print("\nHinweis: Datenbank wurde mit anderen Einstellungen erstellt - vollständiger Neuaufbau")
+        manifest = None
+    elif incremental and manifest is None:
+        print("\nHinweis: Kein Datenbank-Manifest gefunden - vollständiger Neuaufbau")
+
+    try:
+        if incremental and manifest is not None:
+            print("\nPrüfe Änderungen...")
+            kept_batches, failed = _update_database_incremental(writer, manifest, all_json_files)
+        else:
+            print("\nLade und kombiniere Dateien...")
+            kept_batches, failed = [], _write_database_full(writer, all_json_files)
+    except BaseException:
+        # Abbruch: angefangene Datei verwerfen, bereits abgeschlossene bleiben erhalten
+        writer.abort()
+        raise
 
     print()  # Neue Zeile nach Fortschrittsanzeige
 
-    # Schreibe letzte Batch
-    if current_batch:
-        write_database_file(output_dir, batch_number, current_batch, database_metadata, max_size_mb)
-        total_size += current_size
+    batches = sorted(kept_batches + writer.files, key=lambda batch: batch['batch_number'])
+    current_files = {batch['file'] for batch in batches}
+    changed_batches = [batch['file'] for batch in writer.files]
+    removed_batches = [batch['file'] for batch in previous_batches if batch['file'] not in current_files]
+
+    # Nicht mehr benötigte Datenbank-Dateien aus dem letzten Lauf entfernen
+    for filename in removed_batches:
+        try:
+            os.remove(os.path.join(output_dir, filename))
+        except OSError:
+            pass
+
+    save_database_manifest(output_dir, {
+        "version": 1,
+        "updated": datetime.now().isoformat(),
+        "json_directory": DST_ROOT,
+        "max_size_mb": max_size_mb,
+        "format": fmt,
+        # Bei JSONL stehen die Metadaten nur hier (jede Zeile ist ein Dokument)
+        "metadata": database_metadata,
+        "batches": batches,
+        "failed": failed,
+        # Für RAG-Uploads: nur diese Dateien müssen neu hochgeladen bzw. entfernt werden
+        "changed_batches": changed_batches,
+        "removed_batches": removed_batches
+    })
 
     # Abschlussbericht
     elapsed = time.time() - start_time
-    total_documents = sum(len(current_batch) if i == batch_number else 0 for i in range(1, batch_number + 1))
-
-    # Berechne korrekte Gesamtanzahl Dokumente
-    total_documents = total_files - failed_files
+    batch_count = max(1, len(batches))
+    total_size = sum(batch['bytes'] for batch in batches)
+    total_documents = sum(batch['documents'] for batch in batches)
 
     print("\n" + "=" * 80)
     print("DATENBANK-ERSTELLUNG ABGESCHLOSSEN")
     print("=" * 80)
     print(f"Verarbeitete Dokumente: {total_documents:,}")
-    print(f"Fehlerhafte Dateien: {failed_files:,}")
-    print(f"Anzahl Datenbank-Dateien: {batch_number}")
+    print(f"Fehlerhafte Dateien: {len(failed):,}")
+    print(f"Anzahl Datenbank-Dateien: {len(batches)}")
+    if incremental:
+        print(f"Neu geschrieben: {len(changed_batches)}, unverändert: {len(kept_batches)}, "
+              f"entfernt: {len(removed_batches)}")
     print(f"Gesamtgröße: {total_size / (1024*1024):.2f} MB")
-    print(f"Durchschnittliche Größe pro Datei: {(total_size / batch_number) / (1024*1024):.2f} MB")
+    print(f"Durchschnittliche Größe pro Datei: {(total_size / batch_count) / (1024*1024):.2f} MB")
     print(f"Ausgabeverzeichnis: {output_dir}")
     print(f"Laufzeit: {format_time(elapsed)}")
     print("=" * 80)
 
     # Liste der erstellten Dateien
-    print("\nErstellte Datenbank-Dateien:")
-    for i in range(1, batch_number + 1):
-        filename = f"file_database_{i:03d}.json"
-        filepath = os.path.join(output_dir, filename)
-        if os.path.exists(filepath):
-            size_mb = os.path.getsize(filepath) / (1024 * 1024)
-            print(f"  {filename}: {size_mb:.2f} MB")
+    print("\nErstellte Datenbank-Dateien:" if not incremental else "\nDatenbank-Dateien:")
+    for batch in batches:
+        marker = " (neu geschrieben)" if incremental and batch['file'] in changed_batches else ""
+        print(f"  {batch['file']}: {batch['bytes'] / (1024 * 1024):.2f} MB{marker}")
     print("=" * 80)
 
-def write_database_file(output_dir, batch_number, documents, metadata, max_size_mb):
+def _print_database_progress(idx, total_files, writer):
+    """Fortschrittsanzeige für die Datenbank-Erstellung."""
+    if idx % 100 == 0 or idx == total_files:
+        progress = (idx / total_files) * 100
+        print(f"\rFortschritt: {idx:,}/{total_files:,} ({progress:.1f}%) - "
+              f"Batch {writer.batch_number}: {writer.documents_in_batch:,} Dateien, "
+              f"{writer.batch_bytes / (1024*1024):.2f} MB", end="", flush=True)
+
+def _report_database_read_error(json_file, error):
+    if isinstance(error, json.JSONDecodeError):
+        print(f"\nWarnung: Fehlerhafte JSON-Datei übersprungen: {json_file}")
+        print(f"  Fehler: {error}")
+    else:
+        print(f"\nWarnung: Fehler beim Lesen von {json_file}: {error}")
+
+def _write_database_full(writer, json_files):
     """
-    Schreibt eine Datenbank-Datei mit Metadaten und Dokumenten.
+    Schreibt alle JSON-Dateien neu in Datenbank-Dateien ab file_database_001.json.
 
-    Args:
-        output_dir: Ausgabeverzeichnis
-        batch_number: Nummer der Batch (für Dateinamen)
-        documents: Liste der Dokumente
-        metadata: Metadaten für die Datenbank
-        max_size_mb: Maximale Größe (für Metadaten)
-    """
-    filename = f"file_database_{batch_number:03d}.json"
-    filepath = os.path.join(output_dir, filename)
-
-    # Erweitere Metadaten
-    batch_metadata = metadata.copy()
-    batch_metadata["batch_number"] = batch_number
-    batch_metadata["documents_in_batch"] = len(documents)
-    batch_metadata["max_size_mb"] = max_size_mb
-
-    # Erstelle Datenbank-Struktur
-    database = {
-        "metadata": batch_metadata,
-        "documents": documents
-    }
+    Returns:
+        list: Manifest-Einträge der nicht lesbaren JSON-Dateien
+    """
+    failed = []
+    total_files = len(json_files)
+    for idx, (json_file, entry, error, member) in enumerate(iter_database_entries(json_files, writer.encode_document), 1):
+        if error is not None:
+            _report_database_read_error(json_file, error)
+            if member is not None:
+                failed.append(member)
+        else:
+            writer.add(entry, member)
+        _print_database_progress(idx, total_files, writer)
+
+    # Schreibe letzte Batch
+    writer.close()
+    return failed
 
-    # Schreibe Datei
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(database, f, ensure_ascii=False, indent=2)
+def _update_database_incremental(writer, manifest, json_files):
+    """
+    Aktualisiert eine bestehende Datenbank anhand von database_manifest.json.
+
+    - Datenbank-Dateien, deren JSON-Dateien unverändert sind (Pfad, mtime, Größe), bleiben bestehen
+    - Dateien mit geänderten oder gelöschten Mitgliedern werden unter gleicher Nummer neu geschrieben;
+      was nicht mehr hineinpasst, wandert wie neue JSON-Dateien ans Ende
+    - Neue JSON-Dateien werden an die letzte Datenbank-Datei angehängt (ggf. mit neuen Dateien)
+
+    Returns:
+        tuple: (unveränderte Manifest-Einträge, Manifest-Einträge nicht lesbarer JSON-Dateien)
+    """
+    current = {}
+    for json_file in json_files:
+        member = _database_member(json_file)
+        if member is not None:
+            current[member['path']] = member
+
+    def unchanged(member):
+        now = current.get(member['path'])
+        return now is not None and now['mtime_ns'] == member['mtime_ns'] and now['size'] == member['size']
+
+    batches = sorted(manifest.get('batches', []), key=lambda batch: batch['batch_number'])
+    known = {member['path'] for batch in batches for member in batch['members']}
+
+    # Unveränderte, weiterhin fehlerhafte Dateien nicht bei jedem Lauf erneut versuchen
+    failed = [member for member in manifest.get('failed', []) if unchanged(member)]
+    known.update(member['path'] for member in failed)
+    new_paths = [os.path.relpath(json_file, DST_ROOT) for json_file in json_files
+                 if os.path.relpath(json_file, DST_ROOT) not in known]
+
+    dirty = {batch['batch_number'] for batch in batches
+             if not all(unchanged(member) for member in batch['members'])}
+    last_number = batches[-1]['batch_number'] if batches else 0
+    print(f"Geänderte Datenbank-Dateien: {len(dirty)} von {len(batches)}, neue JSON-Dateien: {len(new_paths):,}")
+
+    # Anzahl neu zu lesender JSON-Dateien für die Fortschrittsanzeige
+    rewrite = set(dirty)
+    if new_paths or dirty:
+        rewrite.add(last_number)
+    total_files = len(new_paths) + sum(1 for batch in batches if batch['batch_number'] in rewrite
+                                       for member in batch['members'] if member['path'] in current)
+
+    kept = []
+    carry = []  # Mitglieder, die ans Ende verschoben werden
+    writer.batch_number = last_number
+    processed = 0
+
+    def write_members(paths, allow_rollover):
+        nonlocal processed
+        overflow = []
+        full_paths = [os.path.join(DST_ROOT, path) for path in paths]
+        for json_file, entry, error, member in iter_database_entries(full_paths, writer.encode_document):
+            processed += 1
+            if error is not None:
+                _report_database_read_error(json_file, error)
+                if member is not None:
+                    failed.append(member)
+            elif allow_rollover:
+                writer.add(entry, member)
+            elif overflow or not writer.fits(entry):
+                overflow.append(member['path'])
+            else:
+                writer.add(entry, member)
+            _print_database_progress(processed, max(total_files, processed), writer)
+        return overflow
+
+    for batch in batches:
+        number = batch['batch_number']
+        is_last = number == last_number
+        if number not in dirty and not (is_last and (carry or new_paths)):
+            kept.append(batch)
+            continue
+
+        members = [member['path'] for member in batch['members'] if member['path'] in current]
+        writer.open_batch(number)
+        if is_last:
+            # Letzte Datei: eigene Mitglieder, verschobene und neue JSON-Dateien - mit Überlauf in neue Dateien
+            write_members(members + carry + new_paths, allow_rollover=True)
+            carry, new_paths = [], []
+        else:
+            carry.extend(write_members(members, allow_rollover=False))
+        writer.close()
+
+    if carry or new_paths:
+        # Keine bestehende Datenbank-Datei (z.B. alle entfernt) - neue Dateien anlegen
+        write_members(carry + new_paths, allow_rollover=True)
+        writer.close()
+
+    return kept, failed
+
+def load_database_manifest(output_dir):
+    """
+    Liest database_manifest.json aus dem Datenbank-Verzeichnis.
+
+    Returns:
+        dict oder None (nicht vorhanden oder nicht lesbar)
+    """
+    try:
+        with open(os.path.join(output_dir, "database_manifest.json"), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) and 'batches' in manifest else None
+    except (OSError, ValueError):
+        return None
+
+def save_database_manifest(output_dir, manifest):
+    """Schreibt database_manifest.json atomar (tmp-Datei + os.replace)."""
+    path = os.path.join(output_dir, "database_manifest.json")
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+
+def _database_member(json_file):
+    """
+    Manifest-Eintrag einer JSON-Datei (Pfad relativ zu DST_ROOT, mtime, Größe).
+
+    Returns:
+        dict oder None (Datei nicht mehr vorhanden)
+    """
+    try:
+        stat = os.stat(json_file)
+    except OSError:
+        return None
+    return {"path": os.path.relpath(json_file, DST_ROOT), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+def _read_database_entry(json_file, encode):
+    """
+    Liest eine JSON-Datei und serialisiert sie mit encode (encode_document des Writers) einmalig.
+
+    Returns:
+        tuple: (json_file, bytes oder None, Exception oder None, Manifest-Eintrag oder None)
+    """
+    # stat() vor dem Lesen, damit eine währenddessen geänderte Datei beim nächsten Lauf erkannt wird
+    member = _database_member(json_file)
+    try:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return json_file, encode(data), None, member
+    except Exception as e:
+        return json_file, None, e, member
+
+def iter_database_entries(json_files, encode, threads=None):
+    """
+    Liest JSON-Dateien mit mehreren Threads und liefert sie in der ursprünglichen Reihenfolge.
+
+    Es sind höchstens threads * 4 Dateien gleichzeitig unterwegs, damit auch bei sehr vielen
+    Dateien nur ein kleines Fenster im Speicher liegt.
+
+    Yields:
+        tuple: (json_file, bytes oder None, Exception oder None, Manifest-Eintrag) wie _read_database_entry()
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    threads = max(1, threads or DATABASE_READ_THREADS)
+    window = threads * 4
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        pending = []
+        files = iter(json_files)
+        for json_file in files:
+            pending.append(executor.submit(_read_database_entry, json_file, encode))
+            if len(pending) >= window:
+                break
+        while pending:
+            yield pending.pop(0).result()
+            json_file = next(files, None)
+            if json_file is not None:
+                pending.append(executor.submit(_read_database_entry, json_file, encode))
+
+class DatabaseWriter:
+    """
+    Schreibt Dokumente direkt in die Datenbank-Dateien file_database_NNN.json.
+
+    Jedes Dokument wird nur einmal serialisiert (encode_document) und sofort in die Datei
+    geschrieben; die Aufteilung nach max_size_mb erfolgt anhand der geschriebenen Bytes.
+    Das Layout entspricht json.dump(..., indent=2) einer {"metadata", "documents"}-Struktur.
+    "documents_in_batch" wird beim Abschluss einer Datei per seek() eingetragen.
+    """
+
+    # Platz für die Dokumentanzahl im Metadaten-Block (mit Leerzeichen aufgefüllt)
+    COUNT_WIDTH = 12
+    # Trennzeichen (",\n") + Dateiabschluss ("\n  ]\n}")
+    TRAILER_BYTES = 10
+
+    def __init__(self, output_dir, metadata, max_size_mb):
+        self.output_dir = output_dir
+        self.metadata = metadata
+        self.max_size_mb = max_size_mb
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.batch_number = 0
+        self.documents_in_batch = 0
+        self.batch_bytes = 0
+        self.files = []  # Manifest-Einträge der geschriebenen Dateien
+        self._file = None
+        self._members = []
+        self._count_offset = None
+        self._pending_number = None
+
+    @staticmethod
+    def encode_document(data):
+        """Serialisiert ein Dokument eingerückt wie ein Element der "documents"-Liste."""
+        # JSON-Strings enthalten keine echten Zeilenumbrüche, daher ist das Einrücken per replace sicher
+        return ("    " + json.dumps(data, ensure_ascii=False, indent=2).replace("\n", "\n    ")).encode('utf-8')
+
+    EXTENSION = ".json"
+
+    def filename(self, batch_number):
+        return f"file_database_{batch_number:03d}{self.EXTENSION}"
+
+    def open_batch(self, batch_number):
+        """
+        Legt fest, dass das nächste Dokument die Datei batch_number beginnt
+        (inkrementeller Modus; sonst wird fortlaufend nummeriert).
+        """
+        self.close()
+        self._pending_number = batch_number
+
+    def _open_batch(self):
+        if self._pending_number is not None:
+            self.batch_number, self._pending_number = self._pending_number, None
+        else:
+            self.batch_number += 1
+        self.documents_in_batch = 0
+        self._members = []
+
+        # Erweitere Metadaten
+        batch_metadata = self.metadata.copy()
+        batch_metadata["batch_number"] = self.batch_number
+        batch_metadata["documents_in_batch"] = 0
+        batch_metadata["max_size_mb"] = self.max_size_mb
+
+        metadata_json = json.dumps(batch_metadata, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        marker = '"documents_in_batch": 0'
+        metadata_json = metadata_json.replace(marker, marker + " " * (self.COUNT_WIDTH - 1), 1)
+        head = '{\n  "metadata": ' + metadata_json + ',\n  "documents": [\n'
+        head_bytes = head.encode('utf-8')
+        self._count_offset = head_bytes.index(marker.encode('utf-8')) + len(marker) - 1
+
+        path = os.path.join(self.output_dir, self.filename(self.batch_number))
+        self._file = open(path + ".tmp", 'wb')
+        self._file.write(head_bytes)
+        self.batch_bytes = len(head_bytes)
+
+    def _close_batch(self):
+        f, self._file = self._file, None
+        f.write(b'\n  ]\n}')
+        f.seek(self._count_offset)
+        f.write(str(self.documents_in_batch).ljust(self.COUNT_WIDTH).encode('ascii'))
+        f.close()
+        self._record_batch()
+
+    def _record_batch(self):
+        """Benennt die fertige .tmp-Datei um und trägt sie in self.files ein."""
+        filename = self.filename(self.batch_number)
+        path = os.path.join(self.output_dir, filename)
+        os.replace(path + ".tmp", path)
+        size = os.path.getsize(path)
+        self.files.append({
+            "file": filename,
+            "batch_number": self.batch_number,
+            "documents": self.documents_in_batch,
+            "bytes": size,
+            "updated": datetime.now().isoformat(),
+            "members": self._members
+        })
+        print(f"\n✓ Erstellt: {filename} ({size / (1024 * 1024):.2f} MB, {self.documents_in_batch:,} Dokumente)")
+
+    def fits(self, entry):
+        """True wenn entry noch in die aktuelle Datei passt (eine leere Datei nimmt alles auf)."""
+        if self._file is None or not self.documents_in_batch:
+            return True
+        return self.batch_bytes + len(entry) + self.TRAILER_BYTES <= self.max_size_bytes
+
+    def add(self, entry, member=None):
+        """
+        Hängt ein mit encode_document() serialisiertes Dokument an.
+        Beginnt eine neue Datei, wenn die aktuelle sonst max_size_mb überschreiten würde.
+
+        Args:
+            entry: Bytes aus encode_document()
+            member: Manifest-Eintrag der Quell-JSON (siehe _database_member)
+        """
+        if not self.fits(entry):
+            self._close_batch()
+        if self._file is None:
+            self._open_batch()
+
+        if self.documents_in_batch:
+            self._file.write(b',\n')
+            self.batch_bytes += 2
+        self._file.write(entry)
+        self.batch_bytes += len(entry)
+        self.documents_in_batch += 1
+        if member is not None:
+            self._members.append(member)
+
+    def close(self):
+        """Schließt die aktuelle Datei (falls Dokumente geschrieben wurden)."""
+        if self._file is not None:
+            self._close_batch()
+        self._pending_number = None
+
+    def abort(self):
+        """Verwirft die aktuell geschriebene (unvollständige) Datei."""
+        f, self._file = self._file, None
+        if f is not None:
+            f.close()
+            try:
+                os.remove(os.path.join(self.output_dir, self.filename(self.batch_number)) + ".tmp")
+            except OSError:
+                pass
+
+class JsonlDatabaseWriter(DatabaseWriter):
+    """
+    Datenbank-Dateien im JSON-Lines-Format (file_database_NNN.jsonl[.gz|.zst]).
+
+    Ein Dokument pro Zeile, ohne Metadaten-Block (diese stehen in database_manifest.json),
+    damit Konsumenten die Dateien zeilenweise streamen können. Bei Kompression zählt für die
+    Aufteilung die bereits komprimiert geschriebene Größe plus alles, was noch im Puffer des
+    Kompressors liegt (unkomprimiert gerechnet). Erst kurz vor der Grenze wird der Kompressor
+    geleert und die Größe genau gemessen.
+    """
 
-    size_mb = os.path.getsize(filepath) / (1024 * 1024)
-    print(f"\n✓ Erstellt: {filename} ({size_mb:.2f} MB, {len(documents):,} Dokumente)")
+    TRAILER_BYTES = 0
+
+    def __init__(self, output_dir, metadata, max_size_mb, compression=None):
+        super().__init__(output_dir, metadata, max_size_mb)
+        self.compression = compression
+        self.EXTENSION = ".jsonl" + (f".{compression}" if compression else "")
+        if compression:
+            # Abschluss des komprimierten Datenstroms (gzip-Trailer bzw. zstd-Frame-Ende)
+            self.TRAILER_BYTES = 32
+        self._raw = None
+        self._unflushed = 0  # Unkomprimierte Bytes, die der Kompressor noch puffert
+
+    @staticmethod
+    def encode_document(data):
+        """Serialisiert ein Dokument als eine JSON-Zeile."""
+        return (json.dumps(data, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+
+    def _open_batch(self):
+        if self._pending_number is not None:
+            self.batch_number, self._pending_number = self._pending_number, None
+        else:
+            self.batch_number += 1
+        self.documents_in_batch = 0
+        self.batch_bytes = 0
+        self._unflushed = 0
+        self._members = []
+
+        path = os.path.join(self.output_dir, self.filename(self.batch_number))
+        self._raw = open(path + ".tmp", 'wb')
+        if self.compression == "gz":
+            import gzip
+            self._file = gzip.GzipFile(fileobj=self._raw, mode='wb')
+        elif self.compression == "zst":
+            self._file = zstandard.ZstdCompressor(level=10).stream_writer(self._raw, closefd=False)
+        else:
+            self._file = self._raw
+
+    def _close_batch(self):
+        f, self._file = self._file, None
+        if f is not self._raw:
+            f.close()  # Schreibt den Rest des komprimierten Datenstroms
+        self._raw.close()
+        self._raw = None
+        self._record_batch()
+
+    def fits(self, entry):
+        """
+        True wenn entry noch in die aktuelle Datei passt. Bei Kompression wird vor einem Nein
+        der Kompressor geleert, damit die geschätzte Größe durch die tatsächliche ersetzt wird.
+        """
+        if super().fits(entry):
+            return True
+        if not self._unflushed:
+            return False
+        self._file.flush()  # gzip: Z_SYNC_FLUSH, zstd: FLUSH_BLOCK
+        self._unflushed = 0
+        self.batch_bytes = self._raw.tell()
+        return super().fits(entry)
+
+    def add(self, entry, member=None):
+        """
+        Hängt eine mit encode_document() serialisierte Zeile an.
+        Beginnt eine neue Datei, wenn die aktuelle sonst max_size_mb überschreiten würde.
+        """
+        if not self.fits(entry):
+            self._close_batch()
+        if self._file is None:
+            self._open_batch()
+
+        self._file.write(entry)
+        self.documents_in_batch += 1
+        if self.compression:
+            # Obergrenze: Ausgabedatei plus alles seit dem letzten Leeren (unkomprimiert)
+            self._unflushed += len(entry)
+            self.batch_bytes = self._raw.tell() + self._unflushed
+        else:
+            self.batch_bytes += len(entry)
+        if member is not None:
+            self._members.append(member)
+
+    def abort(self):
+        """Verwirft die aktuell geschriebene (unvollständige) Datei."""
+        raw, self._raw = self._raw, None
+        self._file = None
+        if raw is not None:
+            raw.close()
+            try:
+                os.remove(os.path.join(self.output_dir, self.filename(self.batch_number)) + ".tmp")
+            except OSError:
+                pass
+
+_SQLITE_DATABASE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT,
+    json_path TEXT UNIQUE NOT NULL,
+    ext TEXT,
+    size INTEGER,
+    created TEXT,
+    modified TEXT,
+    content_hash TEXT,
+    chars INTEGER,
+    protection_level TEXT,
+    contains_sensitive_data INTEGER,
+    summary TEXT,
+    document TEXT,
+    json_mtime_ns INTEGER,
+    json_size INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_documents_path ON documents(path);
+CREATE INDEX IF NOT EXISTS idx_documents_ext ON documents(ext);
+CREATE INDEX IF NOT EXISTS idx_documents_modified ON documents(modified);
+CREATE INDEX IF NOT EXISTS idx_documents_protection ON documents(protection_level);
+CREATE TABLE IF NOT EXISTS entities (
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    type TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entities_document ON entities(document_id);
+CREATE INDEX IF NOT EXISTS idx_entities_value ON entities(type, value);
+CREATE TABLE IF NOT EXISTS keywords (
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    keyword TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_keywords_document ON keywords(document_id);
+CREATE INDEX IF NOT EXISTS idx_keywords_keyword ON keywords(keyword);
+"""
+
+def _encode_sqlite_document(data):
+    """Bereitet ein Dokument für die SQLite-Datenbank vor (läuft in den Lese-Threads)."""
+    return data, json.dumps(data, ensure_ascii=False)
+
+def _insert_sqlite_document(conn, data, document_json, member):
+    """Fügt ein Dokument samt Entities und Keywords ein (ersetzt eine ältere Version derselben JSON)."""
+    conn.execute("DELETE FROM documents WHERE json_path = ?", (member['path'],))
+
+    dsgvo = data.get('dsgvo_classification') or {}
+    cursor = conn.execute(
+        """INSERT INTO documents (path, json_path, ext, size, created, modified, content_hash, chars,
+                                  protection_level, contains_sensitive_data, summary, document,
+                                  json_mtime_ns, json_size)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (data.get('path'), member['path'], data.get('ext'), data.get('size'), data.get('created'),
+         data.get('modified'), data.get('content_hash'), data.get('chars'),
+         dsgvo.get('protection_level'),
+         None if 'contains_sensitive_data' not in dsgvo else int(bool(dsgvo['contains_sensitive_data'])),
+         data.get('summary'), document_json, member['mtime_ns'], member['size'])
+    )
+    document_id = cursor.lastrowid
+
+    entity_rows = []
+    for entity_type, values in (data.get('entities') or {}).items():
+        if isinstance(values, list):
+            entity_rows.extend((document_id, entity_type, str(value)) for value in values if value)
+    if entity_rows:
+        conn.executemany("INSERT INTO entities (document_id, type, value) VALUES (?, ?, ?)", entity_rows)
+
+    keywords = data.get('keywords') or []
+    if keywords:
+        conn.executemany("INSERT INTO keywords (document_id, keyword) VALUES (?, ?)",
+                         [(document_id, str(keyword)) for keyword in keywords if keyword])
+
+def _create_sqlite_database(output_dir, json_files, metadata, incremental, start_time):
+    """
+    --create-database --format sqlite: schreibt alle Dokumente nach file_database.sqlite.
+
+    Tabellen: documents (eine Zeile pro JSON-Datei, vollständiges JSON in "document"),
+    entities (document_id, type, value), keywords (document_id, keyword), metadata.
+    Inkrementell werden nur geänderte (mtime/Größe) oder neue JSON-Dateien gelesen und
+    gelöschte entfernt; vollständig wird in eine neue Datei geschrieben und diese ersetzt.
+    """
+    import sqlite3
+
+    db_path = os.path.join(output_dir, "file_database.sqlite")
+    if incremental and os.path.exists(db_path):
+        target_path = db_path
+    else:
+        if incremental:
+            print("\nHinweis: Keine SQLite-Datenbank gefunden - vollständiger Aufbau")
+            incremental = False
+        target_path = db_path + ".tmp"
+        if os.path.exists(target_path):
+            os.remove(target_path)
+
+    conn = sqlite3.connect(target_path)
+    try:
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(_SQLITE_DATABASE_SCHEMA)
+
+        current = {}
+        for json_file in json_files:
+            member = _database_member(json_file)
+            if member is not None:
+                current[member['path']] = member
+
+        existing = {}
+        if incremental:
+            for json_path, mtime_ns, size in conn.execute(
+                    "SELECT json_path, json_mtime_ns, json_size FROM documents"):
+                existing[json_path] = (mtime_ns, size)
+
+        removed = [path for path in existing if path not in current]
+        to_read = [os.path.join(DST_ROOT, path) for path, member in current.items()
+                   if existing.get(path) != (member['mtime_ns'], member['size'])]
+        if incremental:
+            print(f"\nGeänderte oder neue JSON-Dateien: {len(to_read):,}, entfernte: {len(removed):,}")
+        else:
+            print("\nLade und kombiniere Dateien...")
+
+        for path in removed:
+            conn.execute("DELETE FROM documents WHERE json_path = ?", (path,))
+
+        failed = 0
+        written = 0
+        total = len(to_read)
+        for idx, (json_file, entry, error, member) in enumerate(
+                iter_database_entries(to_read, _encode_sqlite_document), 1):
+            if error is not None or member is None:
+                failed += 1
+                _report_database_read_error(json_file, error)
+            else:
+                _insert_sqlite_document(conn, entry[0], entry[1], member)
+                written += 1
+                if written % 1000 == 0:
+                    conn.commit()
+
+            if idx % 100 == 0 or idx == total:
+                progress = (idx / total) * 100
+                print(f"\rFortschritt: {idx:,}/{total:,} ({progress:.1f}%)", end="", flush=True)
+
+        metadata = dict(metadata, updated=datetime.now().isoformat())
+        conn.executemany("INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                         [(key, json.dumps(value, ensure_ascii=False)) for key, value in metadata.items()])
+        conn.commit()
+        total_documents = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+    except BaseException:
+        conn.close()
+        if target_path != db_path:
+            try:
+                os.remove(target_path)
+            except OSError:
+                pass
+        raise
+    conn.close()
+
+    if target_path != db_path:
+        os.replace(target_path, db_path)
+
+    print()  # Neue Zeile nach Fortschrittsanzeige
+
+    # Abschlussbericht
+    elapsed = time.time() - start_time
+    print("\n" + "=" * 80)
+    print("DATENBANK-ERSTELLUNG ABGESCHLOSSEN")
+    print("=" * 80)
+    print(f"Verarbeitete Dokumente: {total_documents:,}")
+    print(f"Fehlerhafte Dateien: {failed:,}")
+    if incremental:
+        print(f"Aktualisiert: {written:,} Dokumente, entfernt: {len(removed):,}")
+    print(f"Datenbank: {db_path} ({os.path.getsize(db_path) / (1024*1024):.2f} MB)")
+    print(f"Laufzeit: {format_time(elapsed)}")
+    print("=" * 80)
+
+class SearchIndex:
+    """
+    Volltext-Suchindex über alle JSON-Dateien (SQLite FTS5 unter DST_ROOT/.fileinventory).
+
+    documents enthält die Filterspalten (ext, protection_level, modified) und den Stand der
+    JSON-Datei (mtime/Größe für den Abgleich), documents_fts den Text von Pfad, Zusammenfassung,
+    Schlüsselbegriffen und Entities mit derselben rowid. Jeder Prozess öffnet eine eigene
+    Verbindung (siehe get_search_index), WAL erlaubt parallele Leser und Schreiber.
+    """
+
+    # Erhöhen, wenn neue Tabellen aus den bestehenden JSON-Dateien befüllt werden müssen
+    # (--build-index liest dann alle JSON-Dateien erneut)
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path):
+        import sqlite3
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entity_postings (
+                key TEXT NOT NULL,
+                type TEXT NOT NULL,
+                document_id INTEGER NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (key, type, document_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS entity_postings_document ON entity_postings (document_id);
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                json_path TEXT UNIQUE NOT NULL,
+                path TEXT,
+                ext TEXT,
+                size INTEGER,
+                modified TEXT,
+                protection_level TEXT,
+                content_hash TEXT,
+                json_mtime_ns INTEGER,
+                json_size INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS documents_ext ON documents (ext);
+            CREATE INDEX IF NOT EXISTS documents_modified ON documents (modified);
+            CREATE INDEX IF NOT EXISTS documents_protection ON documents (protection_level);
+            CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5 (
+                path, summary, keywords, entities,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+        """)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            # Ältere Indizes: Stand der JSON-Dateien vergessen, damit --build-index alles neu einträgt
+            self.conn.execute("UPDATE documents SET json_mtime_ns = NULL")
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def update(self, json_path, data, json_mtime_ns=None, json_size=None, commit=True):
+        """
+        Fügt ein Dokument ein oder ersetzt es.
+
+        Args:
+            json_path: Pfad der JSON-Datei relativ zu DST_ROOT (Schlüssel)
+            data: Inhalt der JSON-Datei
+            json_mtime_ns, json_size: Stand der JSON-Datei (für --build-index)
+            commit: False beim Massenimport (commit() wird dann vom Aufrufer ausgelöst)
+        """
+        entities = data.get('entities') or {}
+        entity_text = " ".join(str(value) for values in entities.values() if isinstance(values, list)
+                               for value in values if value)
+        keywords = " ".join(str(keyword) for keyword in (data.get('keywords') or []) if keyword)
+        dsgvo = data.get('dsgvo_classification') or {}
+
+        with self._lock:
+            row = self.conn.execute("SELECT id FROM documents WHERE json_path = ?", (json_path,)).fetchone()
+            values = (data.get('path'), data.get('ext'), data.get('size'), data.get('modified'),
+                      dsgvo.get('protection_level'), data.get('content_hash'), json_mtime_ns, json_size)
+            if row is None:
+                doc_id = self.conn.execute(
+                    "INSERT INTO documents (path, ext, size, modified, protection_level, content_hash, "
+                    "json_mtime_ns, json_size, json_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    values + (json_path,)
+                ).lastrowid
+            else:
+                doc_id = row[0]
+                self.conn.execute(
+                    "UPDATE documents SET path = ?, ext = ?, size = ?, modified = ?, protection_level = ?, "
+                    "content_hash = ?, json_mtime_ns = ?, json_size = ? WHERE id = ?",
+                    values + (doc_id,)
+                )
+                self.conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (doc_id,))
+            self.conn.execute(
+                "INSERT INTO documents_fts (rowid, path, summary, keywords, entities) VALUES (?, ?, ?, ?, ?)",
+                (doc_id, data.get('path') or json_path, data.get('summary') or "", keywords, entity_text)
+            )
+            if row is not None:
+                self.conn.execute("DELETE FROM entity_postings WHERE document_id = ?", (doc_id,))
+            postings = {}
+            for entity_type, values in entities.items():
+                if not isinstance(values, list):
+                    continue
+                for value in values:
+                    key = normalize_entity_key(value, entity_type) if value else ""
+                    if key:
+                        postings.setdefault((key, entity_type), str(value))
+            if postings:
+                self.conn.executemany(
+                    "INSERT INTO entity_postings (key, type, document_id, value) VALUES (?, ?, ?, ?)",
+                    [(key, entity_type, doc_id, value) for (key, entity_type), value in postings.items()]
+                )
+            if commit:
+                self.conn.commit()
+        return doc_id
+
+    def remove(self, json_path, commit=True):
+        """Entfernt ein Dokument aus dem Index."""
+        with self._lock:
+            row = self.conn.execute("SELECT id FROM documents WHERE json_path = ?", (json_path,)).fetchone()
+            if row is not None:
+                self.conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (row[0],))
+                self.conn.execute("DELETE FROM entity_postings WHERE document_id = ?", (row[0],))
+                self.conn.execute("DELETE FROM documents WHERE id = ?", (row[0],))
+            if commit:
+                self.conn.commit()
+
+    def known_files(self):
+        """
+        Returns:
+            dict: {json_path: (json_mtime_ns, json_size)} aller indizierten JSON-Dateien
+        """
+        with self._lock:
+            return {path: (mtime_ns, size) for path, mtime_ns, size in
+                    self.conn.execute("SELECT json_path, json_mtime_ns, json_size FROM documents")}
+
+    def search(self, query, ext=None, protection_level=None, modified_after=None, modified_before=None,
+               limit=20):
+        """
+        Volltextsuche (FTS5-Syntax, z.B. "Vertrag AND Müller", "Kündig*", "\"fristlose Kündigung\"").
+        Enthält die Anfrage keine gültige FTS5-Syntax, wird nach allen Wörtern einzeln gesucht.
+
+        Returns:
+            list: dicts mit path, ext, modified, protection_level, snippet (nach Relevanz sortiert)
+        """
+        import sqlite3
+
+        conditions = ["documents_fts MATCH ?"]
+        filters = []
+        if ext:
+            conditions.append("d.ext = ?")
+            filters.append(ext.lower() if ext.startswith('.') else f".{ext.lower()}")
+        if protection_level:
+            conditions.append("d.protection_level = ?")
+            filters.append(protection_level)
+        if modified_after:
+            conditions.append("d.modified >= ?")
+            filters.append(modified_after)
+        if modified_before:
+            conditions.append("d.modified < ?")
+            filters.append(modified_before)
+
+        sql = ("SELECT d.path, d.ext, d.modified, d.protection_level, "
+               "snippet(documents_fts, 1, '[', ']', ' … ', 16) "
+               "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+               f"WHERE {' AND '.join(conditions)} ORDER BY bm25(documents_fts) LIMIT ?")
+        with self._lock:
+            try:
+                rows = self.conn.execute(sql, [query] + filters + [limit]).fetchall()
+            except sqlite3.OperationalError:
+                # Z.B. Bindestriche oder Sonderzeichen: jedes Wort als Phrase suchen
+                terms = " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+                if not terms:
+                    return []
+                rows = self.conn.execute(sql, [terms] + filters + [limit]).fetchall()
+        return [{"path": path, "ext": ext, "modified": modified, "protection_level": level, "snippet": snippet}
+                for path, ext, modified, level, snippet in rows]
+
+    def find_entity(self, name, entity_type=None):
+        """
+        Alle Dokumente, die eine Entity erwähnen (Index-Lookup über den normalisierten Schlüssel).
+
+        Args:
+            name: Name, E-Mail-Adresse oder Telefonnummer in beliebiger Schreibweise
+            entity_type: Nur diesen Typ durchsuchen (z.B. "persons"), sonst alle ENTITY_TYPES
+
+        Returns:
+            list: dicts mit type, value, path, ext, modified, protection_level
+        """
+        types = [entity_type] if entity_type else ENTITY_TYPES
+        pairs = {(normalize_entity_key(name, t), t) for t in types}
+        pairs = [(key, t) for key, t in pairs if key]
+        if not pairs:
+            return []
+        condition = " OR ".join(["(p.key = ? AND p.type = ?)"] * len(pairs))
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT p.type, p.value, d.path, d.ext, d.modified, d.protection_level "
+                "FROM entity_postings p JOIN documents d ON d.id = p.document_id "
+                f"WHERE {condition} ORDER BY d.path",
+                [value for pair in pairs for value in pair]
+            ).fetchall()
+        return [{"type": t, "value": value, "path": path, "ext": ext, "modified": modified,
+                 "protection_level": level} for t, value, path, ext, modified, level in rows]
+
+    def commit(self):
+        with self._lock:
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+# Entity-Typen im "entities"-Block der JSON-Dateien (siehe process_file)
+ENTITY_TYPES = ("companies", "persons", "institutions", "organizations", "projects",
+                "emails", "phone_numbers", "urls")
+
+# Anreden und Titel, die bei Personen nicht zum Schlüssel gehören
+_ENTITY_TITLE_WORDS = {"herr", "herrn", "frau", "dr", "prof", "dipl", "ing", "med", "jur", "rer", "nat"}
+_ENTITY_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+_ENTITY_NON_WORD_RE = re.compile(r"[\W_]+")
+
+def normalize_entity_key(value, entity_type=None):
+    """
+    Normalisierter Schlüssel einer Entity für den Entity-Index.
+
+    Groß-/Kleinschreibung, Umlaut-Schreibweisen (Müller = Mueller), Akzente, Satzzeichen und
+    Leerraum werden vereinheitlicht, bei Personen zusätzlich Anreden und Titel entfernt.
+    Telefonnummern werden auf die Ziffern in nationaler Schreibweise (0...) reduziert,
+    E-Mail-Adressen und URLs nur in Kleinbuchstaben verglichen.
+
+    Returns:
+        str: Schlüssel (leer, wenn nichts Verwertbares übrig bleibt)
+    """
+    import unicodedata
+
+    text = unicodedata.normalize("NFKC", str(value)).strip()
+    if entity_type == "phone_numbers":
+        digits = _NON_DIGIT_RE.sub("", text.replace("(0)", ""))  # +49 (0)89 ... -> 089 ...
+        if digits.startswith("0049"):
+            digits = "0" + digits[4:]
+        elif text.startswith("+49") or (digits.startswith("49") and text.startswith("(+49")):
+            digits = "0" + digits[2:]
+        return digits
+    if entity_type in ("emails", "urls"):
+        return text.casefold()
+
+    text = text.casefold().translate(_ENTITY_UMLAUTS)  # casefold: ß -> ss
+    text = "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+    words = _ENTITY_NON_WORD_RE.sub(" ", text).split()
+    if entity_type == "persons":
+        words = [word for word in words if word not in _ENTITY_TITLE_WORDS] or words
+    return " ".join(words)
+
+_SEARCH_INDEXES = {}  # {(pid, db_path): SearchIndex} - eine Verbindung pro Prozess
+_SEARCH_INDEXES_LOCK = threading.Lock()
+
+def get_search_index():
+    """
+    Gibt den Suchindex für DST_ROOT im aktuellen Prozess zurück.
+
+    Returns:
+        SearchIndex oder None (deaktiviert oder nicht nutzbar, z.B. SQLite ohne FTS5)
+    """
+    if not USE_SEARCH_INDEX:
+        return None
+    try:
+        db_path = os.path.join(get_state_dir(), "search_index.sqlite")
+        key = (os.getpid(), db_path)
+        with _SEARCH_INDEXES_LOCK:
+            index = _SEARCH_INDEXES.get(key)
+            if index is None:
+                index = SearchIndex(db_path)
+                _SEARCH_INDEXES[key] = index
+        return index
+    except Exception as e:
+        print(f"  → Warnung: Suchindex nicht verfügbar: {e}")
+        return None
+
+def update_search_index(json_file, data):
+    """Trägt eine gerade geschriebene JSON-Datei in den Suchindex ein (falls aktiv)."""
+    index = get_search_index()
+    if index is None:
+        return
+    try:
+        stat = os.stat(json_file)
+        index.update(os.path.relpath(json_file, DST_ROOT), data, stat.st_mtime_ns, stat.st_size)
+    except Exception as e:
+        print(f"  → Warnung: Suchindex nicht aktualisiert: {e}")
+
+def build_search_index():
+    """
+    --build-index: Gleicht den Suchindex mit allen JSON-Dateien unter DST_ROOT ab.
+
+    Nur neue oder geänderte JSON-Dateien (mtime/Größe) werden gelesen, gelöschte entfernt.
+    Das Datenbank-Verzeichnis (--create-database) wird nicht durchsucht, weitere Einträge
+    ohne "path" werden übersprungen.
+    """
+    print("=" * 80)
+    print(f"SUCHINDEX AUFBAUEN - {SCRIPT_NAME} v{VERSION}")
+    print("=" * 80)
+
+    if not USE_SEARCH_INDEX:
+        print("Fehler: Suchindex ist deaktiviert (--no-search-index)")
+        return
+    index = get_search_index()
+    if index is None:
+        return
+
+    start_time = time.time()
+    current = {}
+    for json_file in collect_json_files(exclude_dir=os.path.join(DST_ROOT, "database")):
+        member = _database_member(json_file)
+        if member is not None:
+            current[member['path']] = member
+    known = index.known_files()
+
+    removed = [path for path in known if path not in current]
+    to_read = [os.path.join(DST_ROOT, path) for path, member in current.items()
+               if known.get(path) != (member['mtime_ns'], member['size'])]
+    print(f"JSON-Dateien: {len(current):,}, neu oder geändert: {len(to_read):,}, entfernt: {len(removed):,}")
+
+    for path in removed:
+        index.remove(path, commit=False)
+
+    indexed = failed = skipped = 0
+    total = len(to_read)
+    for idx, (json_file, data, error, member) in enumerate(iter_database_entries(to_read, lambda data: data), 1):
+        if error is not None or member is None:
+            failed += 1
+            _report_database_read_error(json_file, error)
+        elif not isinstance(data, dict) or 'path' not in data:
+            skipped += 1
+        else:
+            index.update(member['path'], data, member['mtime_ns'], member['size'], commit=False)
+            indexed += 1
+            if indexed % 1000 == 0:
+                index.commit()
+
+        if idx % 100 == 0 or idx == total:
+            print(f"\rFortschritt: {idx:,}/{total:,} ({idx / total * 100:.1f}%)", end="", flush=True)
+    index.commit()
+    if total:
+        print()
+
+    print("\n" + "=" * 80)
+    print(f"Indiziert: {indexed:,}, entfernt: {len(removed):,}, übersprungen: {skipped:,}, Fehler: {failed:,}")
+    print(f"Index: {index.db_path}")
+    print(f"Laufzeit: {format_time(time.time() - start_time)}")
+    print("=" * 80)
+
+def search_inventory(query, ext=None, protection_level=None, modified_after=None, modified_before=None,
+                     limit=20):
+    """--search: Fragt den Suchindex ab und gibt die Treffer aus."""
+    index = get_search_index()
+    if index is None:
+        return
+    start_time = time.time()
+    results = index.search(query, ext=ext, protection_level=protection_level,
+                           modified_after=modified_after, modified_before=modified_before, limit=limit)
+    elapsed_ms = (time.time() - start_time) * 1000
+
+    print(f"{len(results)} Treffer für \"{query}\" ({elapsed_ms:.1f} ms)")
+    for result in results:
+        level = f", Schutzklasse: {result['protection_level']}" if result['protection_level'] else ""
+        print(f"\n{result['path']}  ({(result['modified'] or '')[:10]}{level})")
+        if result['snippet']:
+            print(f"  {result['snippet']}")
+
+def find_entity_documents(name, entity_type=None):
+    """--find-entity: Listet alle Dokumente, die eine Person, Firma, E-Mail-Adresse usw. erwähnen."""
+    index = get_search_index()
+    if index is None:
+        return
+    start_time = time.time()
+    results = index.find_entity(name, entity_type=entity_type)
+    elapsed_ms = (time.time() - start_time) * 1000
+
+    documents = {}
+    for result in results:
+        documents.setdefault(result['path'], []).append(result)
+    print(f"{len(documents)} Dokumente erwähnen \"{name}\" ({elapsed_ms:.1f} ms)")
+    for path, matches in documents.items():
+        first = matches[0]
+        level = f", Schutzklasse: {first['protection_level']}" if first['protection_level'] else ""
+        found = ", ".join(f"{match['value']} ({match['type']})" for match in matches)
+        print(f"  {path}  ({(first['modified'] or '')[:10]}{level}) - {found}")
+
+class EmbeddingIndex:
+    """
+    Embedding-Matrix der Zusammenfassungen unter DST_ROOT/.fileinventory/embeddings.
+
+    vectors.f32 enthält die L2-normalisierten Vektoren als float32-Zeilen (per np.memmap gelesen),
+    index.json ordnet jeder Zeile JSON-Datei, Dokumentpfad, Content-Hash, Stand der JSON-Datei
+    und den Hash der eingebetteten Zusammenfassung zu. Neue Vektoren werden angehängt; Zeilen
+    gelöschter Dokumente bleiben als Lücke (None) stehen, bis compact() die Matrix neu schreibt.
+    """
+
+    COLUMNS = ["json_path", "path", "content_hash", "json_mtime_ns", "json_size", "summary_hash"]
+
+    def __init__(self, directory, model):
+        self.directory = directory
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.sidecar_path = os.path.join(directory, "index.json")
+        self.model = model
+        self.dim = None
+        self.rows = []  # Zeilennummer -> [json_path, path, content_hash, mtime_ns, size] oder None
+        os.makedirs(directory, exist_ok=True)
+
+        sidecar = None
+        if os.path.exists(self.sidecar_path):
+            try:
+                with open(self.sidecar_path, 'r', encoding='utf-8') as f:
+                    sidecar = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"  → Warnung: Embedding-Index nicht lesbar, wird neu aufgebaut: {e}")
+        if sidecar and sidecar.get('model') == model:
+            self.dim = sidecar.get('dim')
+            self.rows = sidecar.get('rows', [])
+        elif sidecar:
+            print(f"Hinweis: Embedding-Modell geändert ({sidecar.get('model')} → {model}) - vollständiger Neuaufbau")
+
+        # Nach einem Abbruch angehängte, aber nicht im Sidecar eingetragene Zeilen verwerfen
+        expected = len(self.rows) * (self.dim or 0) * 4
+        if not os.path.exists(self.vectors_path) or os.path.getsize(self.vectors_path) < expected:
+            self.dim, self.rows = None, []
+            expected = 0
+        with open(self.vectors_path, 'ab') as f:
+            f.truncate(expected)
+
+    def live_rows(self):
+        """Returns: dict {json_path: Zeilennummer} der belegten Zeilen"""
+        return {row[0]: number for number, row in enumerate(self.rows) if row is not None}
+
+    def append(self, vectors, entries):
+        """Hängt normalisierte Vektoren (n x dim) mit ihren Zeilen-Einträgen an."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding-Dimension {vectors.shape[1]} passt nicht zum Index ({self.dim})")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+        with open(self.vectors_path, 'ab') as f:
+            f.write(vectors.tobytes())
+        self.rows.extend(entries)
+
+    def matrix(self):
+        """Returns: np.memmap (Zeilen x dim) oder None wenn leer"""
+        if not self.rows or not self.dim:
+            return None
+        return np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(len(self.rows), self.dim))
+
+    def compact(self, min_dead_ratio=0.25):
+        """Schreibt die Matrix ohne Lücken neu, wenn mindestens min_dead_ratio der Zeilen frei sind."""
+        dead = sum(1 for row in self.rows if row is None)
+        if not dead or dead < len(self.rows) * min_dead_ratio:
+            return False
+        matrix = self.matrix()
+        live = [number for number, row in enumerate(self.rows) if row is not None]
+        tmp_path = self.vectors_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            for start in range(0, len(live), 65536):
+                f.write(np.ascontiguousarray(matrix[live[start:start + 65536]]).tobytes())
+        del matrix
+        self.rows = [self.rows[number] for number in live]
+        # Abbruch zwischen beiden Schritten: vectors.f32 ist kleiner als laut index.json erwartet,
+        # der Index wird beim nächsten Lauf neu aufgebaut statt Zeilen falsch zuzuordnen
+        os.replace(tmp_path, self.vectors_path)
+        self.save()
+        return True
+
+    def save(self):
+        """Schreibt index.json atomar."""
+        tmp_path = self.sidecar_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": 1, "model": self.model, "dim": self.dim, "columns": self.COLUMNS,
+                       "updated": datetime.now().isoformat(), "rows": self.rows}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.sidecar_path)
+
+    def search(self, query_vector, k=20, chunk_rows=65536):
+        """
+        Top-k nach Kosinus-Ähnlichkeit (Skalarprodukt der normalisierten Vektoren).
+        Die Matrix wird blockweise gelesen, der Speicherbedarf bleibt unabhängig von der Indexgröße.
+
+        Returns:
+            list: [(score, Zeilen-Eintrag), ...] absteigend sortiert
+        """
+        matrix = self.matrix()
+        if matrix is None:
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        live = np.fromiter((row is not None for row in self.rows), dtype=bool, count=len(self.rows))
+
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        for start in range(0, len(self.rows), chunk_rows):
+            scores = matrix[start:start + chunk_rows] @ query
+            scores[~live[start:start + chunk_rows]] = -np.inf
+            if len(scores) > k:
+                top = np.argpartition(scores, -k)[-k:]
+            else:
+                top = np.arange(len(scores))
+            best_scores = np.concatenate([best_scores, scores[top]])
+            best_rows = np.concatenate([best_rows, top + start])
+            if len(best_scores) > k:
+                keep = np.argpartition(best_scores, -k)[-k:]
+                best_scores, best_rows = best_scores[keep], best_rows[keep]
+
+        order = np.argsort(-best_scores)
+        return [(float(best_scores[i]), self.rows[int(best_rows[i])]) for i in order
+                if np.isfinite(best_scores[i])]
+
+def request_embeddings(texts, model=None, timeout=300):
+    """
+    Berechnet Embeddings über den OpenAI-kompatiblen /v1/embeddings-Endpoint des LLM-Servers.
+
+    Returns:
+        list: ein Vektor (Liste von floats) pro Text, in Eingabereihenfolge
+    """
+    url = LMSTUDIO_API_URL.replace('/v1/chat/completions', '/v1/embeddings')
+    resp = requests.post(url, json={"model": model or EMBEDDING_MODEL, "input": list(texts)}, timeout=timeout)
+    resp.raise_for_status()
+    data = sorted(resp.json()["data"], key=lambda item: item.get("index", 0))
+    if len(data) != len(texts):
+        raise ValueError(f"Embedding-Antwort enthält {len(data)} statt {len(texts)} Vektoren")
+    return [item["embedding"] for item in data]
+
+def get_embedding_index():
+    """Öffnet den Embedding-Index für DST_ROOT und EMBEDDING_MODEL (None ohne NumPy)."""
+    if np is None:
+        print("Fehler: Für die semantische Suche wird NumPy benötigt (pip install numpy)")
+        return None
+    return EmbeddingIndex(os.path.join(get_state_dir(), "embeddings"), EMBEDDING_MODEL)
+
+def build_embeddings():
+    """
+    --build-embeddings: Bettet alle neuen oder geänderten Zusammenfassungen ein.
+
+    Nur JSON-Dateien mit geändertem Stand (mtime/Größe) werden gelesen; ein Vektor wird nur
+    neu berechnet, wenn sich die Zusammenfassung geändert hat (z.B. nach --force oder neuem
+    Prompt bei gleichem Inhalt). Identische Zusammenfassungen werden nur einmal eingebettet.
+    Der Fortschritt wird laufend gesichert, ein abgebrochener Lauf setzt beim nächsten Aufruf fort.
+    """
+    print("=" * 80)
+    print(f"EMBEDDINGS BERECHNEN - {SCRIPT_NAME} v{VERSION}")
+    print("=" * 80)
+    print(f"Modell: {EMBEDDING_MODEL}")
+
+    index = get_embedding_index()
+    if index is None:
+        return
+
+    start_time = time.time()
+    current = {}
+    for json_file in collect_json_files(exclude_dir=os.path.join(DST_ROOT, "database")):
+        member = _database_member(json_file)
+        if member is not None:
+            current[member['path']] = member
+
+    live = index.live_rows()
+    removed = [path for path in live if path not in current]
+    for path in removed:
+        index.rows[live[path]] = None
+    to_read = [os.path.join(DST_ROOT, path) for path, member in current.items()
+               if path not in live or tuple(index.rows[live[path]][3:5]) != (member['mtime_ns'], member['size'])]
+    print(f"JSON-Dateien: {len(current):,}, neu oder geändert: {len(to_read):,}, entfernt: {len(removed):,}")
+
+    import hashlib
+
+    # Zeilen ohne Summary-Hash (ältere Indizes) gelten als geändert und werden neu eingebettet
+    by_hash = {row[5]: number for number, row in enumerate(index.rows) if row is not None and len(row) > 5}
+    # Noch nicht abgerufene Zusammenfassungen: Summary-Hash -> Zeilen-Einträge (Duplikate im selben Batch)
+    pending = {}
+    embedded = reused = skipped = failed = 0
+    last_save = time.time()
+
+    def flush():
+        nonlocal embedded, reused
+        hashes = list(pending)
+        vectors = request_embeddings([pending[summary_hash][0] for summary_hash in hashes])
+        for summary_hash, vector in zip(hashes, vectors):
+            entries = pending[summary_hash][1]
+            by_hash[summary_hash] = len(index.rows)
+            index.append([vector] * len(entries), entries)
+            reused += len(entries) - 1
+        embedded += len(hashes)
+        pending.clear()
+
+    total = len(to_read)
+    try:
+        for idx, (json_file, data, error, member) in enumerate(iter_database_entries(to_read, lambda data: data), 1):
+            if error is not None or member is None:
+                failed += 1
+                _report_database_read_error(json_file, error)
+                continue
+            summary = (data.get('summary') or "").strip() if isinstance(data, dict) else ""
+            old_row = live.get(member['path'])
+            if not summary or 'path' not in data:
+                skipped += 1
+                if old_row is not None:
+                    index.rows[old_row] = None
+                continue
+
+            summary_hash = hashlib.sha256(summary.encode('utf-8')).hexdigest()
+            entry = [member['path'], data['path'], data.get('content_hash'), member['mtime_ns'], member['size'],
+                     summary_hash]
+            old_entry = index.rows[old_row] if old_row is not None else None
+            if old_entry is not None and len(old_entry) > 5 and old_entry[5] == summary_hash:
+                # Gleiche Zusammenfassung: nur den Stand der JSON-Datei aktualisieren
+                index.rows[old_row] = entry
+                continue
+            if old_row is not None:
+                index.rows[old_row] = None
+
+            source_row = by_hash.get(summary_hash)
+            if source_row is not None:
+                # Gleiche Zusammenfassung bereits eingebettet (Duplikat): Vektor übernehmen
+                index.append(np.array(index.matrix()[source_row:source_row + 1]), [entry])
+                reused += 1
+            elif summary_hash in pending:
+                pending[summary_hash][1].append(entry)
+            else:
+                pending[summary_hash] = (summary, [entry])
+                if len(pending) >= EMBEDDING_BATCH_SIZE:
+                    flush()
+
+            if time.time() - last_save >= 2:
+                index.save()
+                last_save = time.time()
+            if idx % 100 == 0 or idx == total:
+                print(f"\rFortschritt: {idx:,}/{total:,} ({idx / total * 100:.1f}%) - "
+                      f"{embedded:,} berechnet", end="", flush=True)
+        if pending:
+            flush()
+    except requests.exceptions.RequestException as e:
+        print(f"\nFehler beim Abruf der Embeddings: {e}")
+        print(f"  Prüfen Sie, ob das Embedding-Modell '{EMBEDDING_MODEL}' im LLM-Server geladen ist")
+    finally:
+        index.save()
+    if total:
+        print()
+
+    if index.compact():
+        print("Embedding-Matrix komprimiert (Lücken entfernt)")
+
+    elapsed = time.time() - start_time
+    print("\n" + "=" * 80)
+    print(f"Berechnet: {embedded:,}, übernommen (Duplikate): {reused:,}, ohne Zusammenfassung: {skipped:,}, "
+          f"Fehler: {failed:,}")
+    print(f"Vektoren im Index: {len(index.live_rows()):,} (Dimension {index.dim})")
+    if embedded:
+        print(f"Durchsatz: {embedded / max(elapsed, 0.001):.1f} Zusammenfassungen/s")
+    print(f"Laufzeit: {format_time(elapsed)}")
+    print("=" * 80)
+
+def semantic_search(query, limit=20):
+    """--semantic-search: Sucht die Zusammenfassungen mit der größten Ähnlichkeit zur Anfrage."""
+    index = get_embedding_index()
+    if index is None:
+        return
+    if not index.live_rows():
+        print("Embedding-Index ist leer - bitte zuerst --build-embeddings ausführen")
+        return
+    try:
+        query_vector = request_embeddings([query])[0]
+    except requests.exceptions.RequestException as e:
+        print(f"Fehler beim Abruf des Embeddings: {e}")
+        return
+
+    start_time = time.time()
+    results = index.search(query_vector, k=limit)
+    elapsed_ms = (time.time() - start_time) * 1000
+
+    print(f"{len(results)} Treffer für \"{query}\" ({elapsed_ms:.1f} ms)")
+    for score, row in results:
+        print(f"\n{score:.3f}  {row[1]}")
+        try:
+            with open(os.path.join(DST_ROOT, row[0]), 'r', encoding='utf-8') as f:
+                summary = json.load(f).get('summary') or ""
+            print(f"  {summary[:200]}{'…' if len(summary) > 200 else ''}")
+        except (OSError, json.JSONDecodeError):
+            pass
 
 def parse_arguments():
     """Parse und validiere Kommandozeilenargumente."""
@@ -3248,6 +7289,12 @@ Beispiele:
   {sys.argv[0]} --src ~/Docs --dst ~/Summaries --max-tokens 32768 --summary-max-chars 2000
     Vollständig benutzerdefinierte Konfiguration
 
+  {sys.argv[0]} --llm-concurrency 4
+    Pipeline-Modus: Textextraktion parallel zu bis zu 4 gleichzeitigen LLM-Anfragen
+
+  {sys.argv[0]} --llm-concurrency 4 --extract-workers 6
+    Pipeline-Modus mit Textextraktion in 6 Worker-Prozessen
+
   {sys.argv[0]} --create-database
     Erstellt kombinierte Datenbank aus allen JSON-Dateien (Standard: max 30 MB pro Datei)
 
@@ -3257,6 +7304,15 @@ Beispiele:
   {sys.argv[0]} --create-database --database-output ~/MyDatabase
     Erstellt Datenbank in benutzerdefiniertem Verzeichnis
 
+  {sys.argv[0]} --search "Mietvertrag Müller" --ext pdf --modified-after 2023-01-01
+    Volltextsuche im Suchindex (Aufbau für bestehende JSON-Dateien mit --build-index)
+
+  {sys.argv[0]} --find-entity "Dr. Erika Müller" --entity-type persons
+    Alle Dokumente, die eine Person erwähnen (z.B. für DSGVO-Auskunftsersuchen nach Art. 15)
+
+  {sys.argv[0]} --build-embeddings && {sys.argv[0]} --semantic-search "Kündigung eines Mietvertrags"
+    Semantische Suche über die Zusammenfassungen (Embedding-Modell im LLM-Server laden)
+
   {sys.argv[0]} --cleanup-phones
     Bereinigt alle JSON-Dateien: Entfernt ungültige Telefonnummern (z.B. Projektnummern)
     und extrahiert korrekte Telefonnummern neu aus den Quelldateien
@@ -3306,6 +7362,14 @@ Weitere Informationen:
         help=f'Maximale Context-Länge des Modells in Tokens (Standard: {MAX_CONTEXT_TOKENS})'
     )
 
+    parser.add_argument(
+        '--tokenizer',
+        type=str,
+        metavar='FILE',
+        help='tokenizer.json des Modells für exakte Token-Zählung (benötigt das Paket "tokenizers"); '
+             'ohne wird der /tokenize-Endpoint des Servers oder die Kalibrierung aus den Antworten genutzt'
+    )
+
     parser.add_argument(
         '--summary-max-chars',
         type=int,
@@ -3313,6 +7377,137 @@ Weitere Informationen:
         help=f'Maximale Länge der Zusammenfassung in Zeichen. Text kürzer als dieser Wert wird direkt kopiert. (Standard: {SUMMARY_MAX_CHARS})'
     )
 
+    parser.add_argument(
+        '--llm-concurrency',
+        type=int,
+        metavar='N',
+        help='Pipeline-Modus: Anzahl gleichzeitiger LLM-Anfragen, Textextraktion läuft parallel dazu '
+             f'(Standard: {LLM_CONCURRENCY} = sequentielle Verarbeitung)'
+    )
+
+    parser.add_argument(
+        '--extract-threads',
+        type=int,
+        metavar='N',
+        help=f'Anzahl Threads für die Textextraktion im Pipeline-Modus (Standard: {EXTRACT_THREADS})'
+    )
+
+    parser.add_argument(
+        '--extract-workers',
+        type=int,
+        metavar='N',
+        help='Textextraktion (PDF, DOCX, PPTX, XLSX, ...) in N Worker-Prozessen mit Speicherlimit '
+             f'und regelmäßigem Neustart (Standard: {EXTRACT_WORKERS} = im Hauptprozess)'
+    )
+
+    parser.add_argument(
+        '--extract-memory-limit',
+        type=int,
+        metavar='MB',
+        help=f'Speicherlimit pro Extraktions-Worker in MB, 0 = kein Limit (Standard: {EXTRACT_MEMORY_LIMIT_MB})'
+    )
+
+    parser.add_argument(
+        '--extract-timeout',
+        type=int,
+        metavar='SEKUNDEN',
+        help=f'Maximale Extraktionszeit pro Datei in Worker-Prozessen (Standard: {EXTRACT_TIMEOUT})'
+    )
+
+    parser.add_argument(
+        '--pdf-engine',
+        choices=['pymupdf', 'pdfplumber'],
+        help=f'Engine für die PDF-Textextraktion; mit pymupdf wird pdfplumber nur für Seiten mit '
+             f'schlechter Textqualität genutzt (Standard: {PDF_ENGINE})'
+    )
+
+    parser.add_argument(
+        '--pdf-workers',
+        type=int,
+        metavar='N',
+        help=f'Prozesse für die seitenweise parallele Extraktion großer PDFs '
+             f'(ab {PDF_PARALLEL_MIN_PAGES} Seiten, 1 = sequentiell, Standard: {PDF_PAGE_WORKERS})'
+    )
+
+    parser.add_argument(
+        '--ocr-dpi',
+        type=int,
+        metavar='DPI',
+        help=f'Auflösung für die OCR gescannter PDF-Seiten (Standard: {OCR_DPI})'
+    )
+
+    parser.add_argument(
+        '--ocr-workers',
+        type=int,
+        metavar='N',
+        help=f'Parallele Tesseract-Prozesse pro Dokument (Standard: {OCR_WORKERS})'
+    )
+
+    parser.add_argument(
+        '--ocr-batch-pages',
+        type=int,
+        metavar='N',
+        help=f'Seiten pro Tesseract-Aufruf (Standard: {OCR_BATCH_PAGES})'
+    )
+
+    parser.add_argument(
+        '--no-text-store',
+        action='store_true',
+        help='Extrahierten Text nicht im Text-Store (DST_ROOT/.fileinventory/text) ablegen bzw. von dort lesen'
+    )
+
+    parser.add_argument(
+        '--maintenance-workers',
+        type=int,
+        metavar='N',
+        help=f'Prozesse für --update-dsgvo und --cleanup-phones (Standard: {MAINTENANCE_WORKERS}, 1 = ohne Worker-Prozesse)'
+    )
+
+    parser.add_argument(
+        '--combined-llm',
+        action='store_true',
+        help='Zusammenfassung, Schlüsselbegriffe und Named Entities mit einer einzigen LLM-Anfrage (JSON-Antwort) erstellen'
+    )
+
+    parser.add_argument(
+        '--no-llm-cache',
+        action='store_true',
+        help='LLM-Antworten nicht aus DST_ROOT/.fileinventory/llm_cache.sqlite übernehmen oder dort speichern'
+    )
+
+    parser.add_argument(
+        '--llm-cache-max-mb',
+        type=int,
+        metavar='MB',
+        help=f'Maximale Größe des LLM-Caches, älteste Einträge werden entfernt (Standard: {LLM_CACHE_MAX_MB})'
+    )
+
+    parser.add_argument(
+        '--no-ocr-cache',
+        action='store_true',
+        help='OCR-Cache (DST_ROOT/.fileinventory/ocr_cache.sqlite) nicht nutzen: gescannte Seiten immer neu erkennen'
+    )
+
+    parser.add_argument(
+        '--scan-threads',
+        type=int,
+        metavar='N',
+        help=f'Anzahl paralleler Threads für den Verzeichnis-Scan (Standard: {SCAN_THREADS})'
+    )
+
+    parser.add_argument(
+        '--hash-mmap',
+        action='store_true',
+        help='Content-Hashes per mmap berechnen statt blockweise zu lesen (schneller bei großen lokalen Dateien)'
+    )
+
+    parser.add_argument(
+        '--no-manifest',
+        action='store_true',
+        help='Manifest (DST_ROOT/.fileinventory/manifest.sqlite) nicht nutzen: alle vorhandenen JSON-Dateien '
+             'werden vollständig validiert, z.B. nach manuellem Löschen einzelner JSON-Dateien'
+    )
+
     parser.add_argument(
         '--version',
         action='version',
@@ -3332,6 +7527,19 @@ Weitere Informationen:
         help='Ausgabeverzeichnis für die Datenbank-Dateien (Standard: DST_ROOT/database)'
     )
 
+    parser.add_argument(
+        '--format',
+        choices=DATABASE_FORMATS,
+        default='json',
+        help='Mit --create-database: Ausgabeformat (json, jsonl, jsonl.gz, jsonl.zst, sqlite; Standard: json)'
+    )
+
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Mit --create-database: nur Datenbank-Dateien neu schreiben, deren JSON-Dateien sich geändert haben'
+    )
+
     parser.add_argument(
         '--cleanup-phones',
         action='store_true',
@@ -3344,6 +7552,93 @@ Weitere Informationen:
         help='Aktualisiert alle JSON-Dateien mit DSGVO-Klassifizierung (Art. 9 DSGVO, § 26 BDSG)'
     )
 
+    parser.add_argument(
+        '--build-index',
+        action='store_true',
+        help='Baut den Volltext-Suchindex (SQLite FTS5) für alle JSON-Dateien auf bzw. gleicht ihn ab'
+    )
+
+    parser.add_argument(
+        '--search',
+        type=str,
+        metavar='QUERY',
+        help='Volltextsuche über Pfad, Zusammenfassung, Schlüsselbegriffe und Entities (FTS5-Syntax)'
+    )
+
+    parser.add_argument(
+        '--ext',
+        type=str,
+        help='Mit --search: nur Dateien mit dieser Endung (z.B. pdf)'
+    )
+
+    parser.add_argument(
+        '--protection-level',
+        type=str,
+        metavar='LEVEL',
+        help='Mit --search: nur Dokumente mit dieser DSGVO-Schutzklasse'
+    )
+
+    parser.add_argument(
+        '--modified-after',
+        type=str,
+        metavar='DATE',
+        help='Mit --search: nur Dateien, die ab diesem Datum geändert wurden (YYYY-MM-DD)'
+    )
+
+    parser.add_argument(
+        '--modified-before',
+        type=str,
+        metavar='DATE',
+        help='Mit --search: nur Dateien, die vor diesem Datum geändert wurden (YYYY-MM-DD)'
+    )
+
+    parser.add_argument(
+        '--limit',
+        type=int,
+        metavar='N',
+        default=20,
+        help='Mit --search: maximale Anzahl Treffer (Standard: 20)'
+    )
+
+    parser.add_argument(
+        '--find-entity',
+        type=str,
+        metavar='NAME',
+        help='Listet alle Dokumente, die eine Person, Firma, E-Mail-Adresse oder Telefonnummer erwähnen (Suchindex)'
+    )
+
+    parser.add_argument(
+        '--entity-type',
+        choices=ENTITY_TYPES,
+        help='Mit --find-entity: nur diesen Entity-Typ durchsuchen'
+    )
+
+    parser.add_argument(
+        '--build-embeddings',
+        action='store_true',
+        help='Berechnet Embeddings für neue oder geänderte Zusammenfassungen (/v1/embeddings des LLM-Servers)'
+    )
+
+    parser.add_argument(
+        '--semantic-search',
+        type=str,
+        metavar='QUERY',
+        help='Semantische Suche über die Zusammenfassungen (benötigt --build-embeddings, Anzahl per --limit)'
+    )
+
+    parser.add_argument(
+        '--embedding-model',
+        type=str,
+        metavar='NAME',
+        help=f'Embedding-Modell im LLM-Server (Standard: {EMBEDDING_MODEL})'
+    )
+
+    parser.add_argument(
+        '--no-search-index',
+        action='store_true',
+        help='Suchindex während der Verarbeitung nicht mitschreiben'
+    )
+
     parser.add_argument(
         '--max-database-size',
         type=int,
@@ -3371,10 +7666,97 @@ if __name__ == "__main__":
         MAX_CONTEXT_TOKENS = args.max_tokens
         # Aktualisiere die globale Variable
         globals()['MAX_CONTEXT_TOKENS'] = MAX_CONTEXT_TOKENS
+    if args.tokenizer:
+        TOKENIZER_FILE = os.path.expanduser(args.tokenizer)
+        globals()['TOKENIZER_FILE'] = TOKENIZER_FILE
     if args.summary_max_chars:
         SUMMARY_MAX_CHARS = args.summary_max_chars
         # Aktualisiere die globale Variable
         globals()['SUMMARY_MAX_CHARS'] = SUMMARY_MAX_CHARS
+    if args.llm_concurrency is not None:
+        LLM_CONCURRENCY = max(0, args.llm_concurrency)
+        globals()['LLM_CONCURRENCY'] = LLM_CONCURRENCY
+    if args.extract_threads:
+        EXTRACT_THREADS = max(1, args.extract_threads)
+        globals()['EXTRACT_THREADS'] = EXTRACT_THREADS
+    if args.extract_workers is not None:
+        EXTRACT_WORKERS = max(0, args.extract_workers)
+        globals()['EXTRACT_WORKERS'] = EXTRACT_WORKERS
+    if args.extract_memory_limit is not None:
+        EXTRACT_MEMORY_LIMIT_MB = max(0, args.extract_memory_limit)
+        globals()['EXTRACT_MEMORY_LIMIT_MB'] = EXTRACT_MEMORY_LIMIT_MB
+    if args.pdf_engine:
+        PDF_ENGINE = args.pdf_engine
+        globals()['PDF_ENGINE'] = PDF_ENGINE
+    if args.pdf_workers is not None:
+        PDF_PAGE_WORKERS = max(1, args.pdf_workers)
+        globals()['PDF_PAGE_WORKERS'] = PDF_PAGE_WORKERS
+    if args.ocr_dpi:
+        OCR_DPI = max(72, args.ocr_dpi)
+        globals()['OCR_DPI'] = OCR_DPI
+    if args.ocr_workers:
+        OCR_WORKERS = max(1, args.ocr_workers)
+        globals()['OCR_WORKERS'] = OCR_WORKERS
+    if args.ocr_batch_pages:
+        OCR_BATCH_PAGES = max(1, args.ocr_batch_pages)
+        globals()['OCR_BATCH_PAGES'] = OCR_BATCH_PAGES
+    if args.no_text_store:
+        USE_TEXT_STORE = False
+        globals()['USE_TEXT_STORE'] = USE_TEXT_STORE
+    if args.maintenance_workers:
+        MAINTENANCE_WORKERS = max(1, args.maintenance_workers)
+        globals()['MAINTENANCE_WORKERS'] = MAINTENANCE_WORKERS
+    if args.combined_llm:
+        COMBINED_LLM = True
+        globals()['COMBINED_LLM'] = COMBINED_LLM
+    if args.no_llm_cache:
+        USE_LLM_CACHE = False
+        globals()['USE_LLM_CACHE'] = USE_LLM_CACHE
+    if args.llm_cache_max_mb:
+        LLM_CACHE_MAX_MB = max(1, args.llm_cache_max_mb)
+        globals()['LLM_CACHE_MAX_MB'] = LLM_CACHE_MAX_MB
+    if args.no_ocr_cache:
+        USE_OCR_CACHE = False
+        globals()['USE_OCR_CACHE'] = USE_OCR_CACHE
+    if args.scan_threads:
+        SCAN_THREADS = max(1, args.scan_threads)
+        globals()['SCAN_THREADS'] = SCAN_THREADS
+    if args.hash_mmap:
+        HASH_USE_MMAP = True
+        globals()['HASH_USE_MMAP'] = HASH_USE_MMAP
+    if args.no_manifest:
+        USE_MANIFEST = False
+        globals()['USE_MANIFEST'] = USE_MANIFEST
+    if args.extract_timeout:
+        EXTRACT_TIMEOUT = args.extract_timeout
+        globals()['EXTRACT_TIMEOUT'] = EXTRACT_TIMEOUT
+
+    if args.no_search_index:
+        USE_SEARCH_INDEX = False
+        globals()['USE_SEARCH_INDEX'] = USE_SEARCH_INDEX
+
+    if args.embedding_model:
+        EMBEDDING_MODEL = args.embedding_model
+        globals()['EMBEDDING_MODEL'] = EMBEDDING_MODEL
+
+    # Suchindex aufbauen bzw. abfragen
+    if args.build_index:
+        build_search_index()
+        sys.exit(0)
+    if args.search:
+        search_inventory(args.search, ext=args.ext, protection_level=args.protection_level,
+                         modified_after=args.modified_after, modified_before=args.modified_before,
+                         limit=max(1, args.limit))
+        sys.exit(0)
+    if args.find_entity:
+        find_entity_documents(args.find_entity, entity_type=args.entity_type)
+        sys.exit(0)
+    if args.build_embeddings:
+        build_embeddings()
+        sys.exit(0)
+    if args.semantic_search:
+        semantic_search(args.semantic_search, limit=max(1, args.limit))
+        sys.exit(0)
 
     # Prüfe ob Telefonnummern-Bereinigung gewünscht ist
     if args.cleanup_phones:
@@ -3394,7 +7776,9 @@ if __name__ == "__main__":
             output_dir = os.path.expanduser(output_dir)
         create_combined_database(
             max_size_mb=args.max_database_size,
-            output_dir=output_dir
+            output_dir=output_dir,
+            incremental=args.incremental,
+            fmt=args.format
         )
     else:
         # Normale Verarbeitung
@@ -15,7 +15,6 @@ import sys
 import threading
 import queue
 from datetime import datetime
-from pathlib import Path
 
 # Importiere Plattform-Konfiguration
 from platform_config import PLATFORM
@@ -24,7 +23,7 @@ from platform_config import PLATFORM
 from FileInventory import (
     VERSION, VERSION_DATE, SRC_ROOT, DST_ROOT,
     process_file, update_all_jsons_with_dsgvo,
-    EXTENSIONS, EXCLUDE_PATTERNS
+    EXTENSIONS, EXCLUDE_PATTERNS, ExcludeMatcher
 )
 
 # CustomTkinter Konfiguration
@@ -391,16 +390,10 @@ class FileInventoryApp(ctk.CTk):
             self.message_queue.put(("log", "Sammle Dateien...", "INFO"))
 
             all_files = []
+            exclude = ExcludeMatcher(EXCLUDE_PATTERNS, src)
             for root, dirs, files in os.walk(src):
-                # Prüfe Exclude-Patterns
-                skip = False
-                for pattern in EXCLUDE_PATTERNS:
-                    if Path(root).match(pattern):
-                        skip = True
-                        break
-
-                if skip:
-                    continue
+                # Ausgeschlossene Verzeichnisse gar nicht erst betreten
+                exclude.prune_dirs(dirs)
 
                 for file in files:
                     ext = os.path.splitext(file)[1].lower()
@@ -14,7 +14,6 @@ import sys
 import threading
 import queue
 from datetime import datetime
-from pathlib import Path
 
 # Importiere Plattform-Konfiguration
 from platform_config import PLATFORM
@@ -22,7 +21,7 @@ from platform_config import PLATFORM
 # Importiere FileInventory-Funktionen
 from FileInventory import (
     VERSION, VERSION_DATE, SRC_ROOT, DST_ROOT,
-    EXTENSIONS, EXCLUDE_PATTERNS, process_file
+    EXTENSIONS, EXCLUDE_PATTERNS, ExcludeMatcher, process_file
 )
 
 
@@ -474,14 +473,10 @@ class FileInventoryAppLite(tk.Tk):
             self.message_queue.put(("log", "Sammle Dateien..."))
 
             all_files = []
+            exclude = ExcludeMatcher(EXCLUDE_PATTERNS, src)
             for root, dirs, files in os.walk(src):
-                skip = False
-                for pattern in EXCLUDE_PATTERNS:
-                    if Path(root).match(pattern):
-                        skip = True
-                        break
-                if skip:
-                    continue
+                # Ausgeschlossene Verzeichnisse gar nicht erst betreten
+                exclude.prune_dirs(dirs)
 
                 for file in files:
                     ext = os.path.splitext(file)[1].lower()
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import FileInventory  # noqa: E402
+
+
+@pytest.fixture
+def inventory(tmp_path, monkeypatch):
+    """FileInventory mit leerem SRC_ROOT/DST_ROOT unter tmp_path."""
+    src_root = tmp_path / "src"
+    dst_root = tmp_path / "dst"
+    src_root.mkdir()
+    dst_root.mkdir()
+    monkeypatch.setattr(FileInventory, "SRC_ROOT", str(src_root))
+    monkeypatch.setattr(FileInventory, "DST_ROOT", str(dst_root))
+    return FileInventory
@@ -0,0 +1,195 @@
+"""
+Gleichwertigkeit der optimierten Erkennung mit der ursprünglichen Implementierung:
+- classify_sensitive_data(): ein kompilierter Ausdruck pro Kategorie (_build_keyword_matcher)
+  statt einer Regex-Suche pro Schlüsselwort
+- extract_contact_info_from_text() / validate_phone_number(): vorkompilierte Pattern
+
+Die Referenzfunktionen unten sind unverändert aus dem Stand vor der Optimierung übernommen
+und werden mit zufällig erzeugten Texten verglichen.
+"""
+
+import os
+import random
+import re
+
+import pytest
+
+FUZZ_TEXTS = 3000
+
+
+# --- Referenz: ursprüngliche Implementierungen -------------------------------------------------
+
+def baseline_matched_keywords(categories, text, file_path=None):
+    """Schlüsselwort-Suche aus classify_sensitive_data() vor _build_keyword_matcher."""
+    search_text = text.lower()
+    if file_path:
+        filename = os.path.basename(file_path).lower()
+        search_text = filename + " " + search_text
+
+    matched = {}
+    for category_name, category_data in categories.items():
+        matched_keywords = []
+        for keyword in category_data['keywords']:
+            pattern = r'\b' + re.escape(keyword) + r'\b'
+            if re.search(pattern, search_text, re.IGNORECASE):
+                matched_keywords.append(keyword)
+        if matched_keywords:
+            matched[category_name] = matched_keywords
+    return matched
+
+
+def baseline_extract_contact_info_from_text(text):
+    contact_info = {
+        'urls': [],
+        'emails': [],
+        'phone_numbers': []
+    }
+
+    if not text:
+        return contact_info
+
+    url_pattern = r'(?:https?://|www\.)(?:[A-Za-z0-9\-._~:/?#\[\]!$&\'()*+,;=%]+[A-Za-z0-9\-_~/?#\[\]$&*+=%]|[A-Za-z0-9\-._~:/?#\[\]!$&\'()*+,;=%])'
+    raw_urls = re.findall(url_pattern, text, re.IGNORECASE)
+
+    cleaned_urls = []
+    for url in raw_urls:
+        if '@' in url:
+            url = url.split('@')[0]
+        url = re.sub(r'[).,;:!]+$', '', url)
+        url = re.sub(r'-[A-Za-z]+$', '', url)
+        if '.' in url and len(url) > 5:
+            cleaned_urls.append(url)
+
+    contact_info['urls'] = list(set(cleaned_urls))
+
+    email_pattern = r'\b[A-Za-z0-9][A-Za-z0-9._%+-]*@[A-Za-z0-9][A-Za-z0-9.-]*\.[A-Za-z]{2,}\b'
+    raw_emails = re.findall(email_pattern, text)
+
+    cleaned_emails = []
+    for email in raw_emails:
+        local_part = email.split('@')[0]
+        if 'www.' in local_part.lower() or 'http' in local_part.lower():
+            parts = re.split(r'[-\s]', local_part)
+            if parts:
+                local_part = parts[-1]
+                email = f"{local_part}@{email.split('@')[1]}"
+
+        if len(local_part) <= 64 and len(email) < 254:
+            cleaned_emails.append(email)
+
+    contact_info['emails'] = list(set(cleaned_emails))
+
+    phone_patterns = [
+        r'\+49[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,10}',
+        r'\+49[\s\-]?\d{2,4}[\s\-/]\d{6,10}',
+        r'0049[\s\-]?\d{2,4}[\s\-]?\d{6,10}',
+        r'\(0\d{2,4}\)[\s\-]?\d{6,10}',
+        r'\b0\d{2,4}[\s\-/]\d{6,10}\b',
+        r'\b0\d{9,11}\b',
+    ]
+
+    phone_numbers = []
+    for pattern in phone_patterns:
+        matches = re.findall(pattern, text)
+        phone_numbers.extend(matches)
+
+    cleaned_phones = []
+    for phone in phone_numbers:
+        normalized = re.sub(r'[\s\-/()]', '', phone)
+        digits_only = re.sub(r'\D', '', normalized)
+        if len(digits_only) >= 8:
+            if digits_only.startswith('0') or digits_only.startswith('49'):
+                if phone not in cleaned_phones:
+                    cleaned_phones.append(phone)
+
+    contact_info['phone_numbers'] = cleaned_phones
+
+    return contact_info
+
+
+def baseline_validate_phone_number(phone):
+    digits_only = re.sub(r'\D', '', phone)
+    if len(digits_only) < 8:
+        return False
+    if not (digits_only.startswith('0') or digits_only.startswith('49')):
+        return False
+
+    phone_patterns = [
+        r'\+49[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,10}',
+        r'\+49[\s\-]?\d{2,4}[\s\-/]\d{6,10}',
+        r'0049[\s\-]?\d{2,4}[\s\-]?\d{6,10}',
+        r'\(0\d{2,4}\)[\s\-]?\d{6,10}',
+        r'0\d{2,4}[\s\-/]\d{6,10}',
+        r'0\d{9,11}',
+    ]
+    for pattern in phone_patterns:
+        if re.search(f'^{pattern}$', phone.strip()):
+            return True
+    return False
+
+
+# --- Vergleich ---------------------------------------------------------------------------------
+
+KEYWORD_FILLER = ["der", "Vertrag", "xcv", "cvx", "-", "_", "ä", "Lohnsteuerbescheinigung", "zeugnis-kopie",
+                  "Qualifiziertes Zeugnis", "\n", "1", "Steuer-ID2", "ARZTbrief", "arzt.", "MITARBEITER"]
+
+CONTACT_TOKENS = ["+49 30 12345678", "+49(30)1234567", "+49 30/12345678", "0049 30 12345678", "(030) 12345678",
+                  "030/12345678", "03012345678", "091-2024", "0301234567890123", "www.example.de",
+                  "https://x.y/z).", "BOOKPLAY-www.book-play.de-Hallo@book-play.de", "a@b.de", "WWW.FOO.COM,",
+                  "HTTPS://A.B", "httpſ://q.de", "ä", "_", "İ", "x@y.dä", "@@", "%a+b@c-d.org", "é@x.de", "x",
+                  "0", "00", "1", "-", "/", " ", "\n", "(", "+", "49", "0049", "Tel", "0123", "4567890", "@"]
+
+
+def fuzz_keyword_text(rng, keywords):
+    words = [rng.choice(keywords + KEYWORD_FILLER) for _ in range(rng.randint(0, 30))]
+    parts = []
+    for word in words:
+        parts.append(word.upper() if rng.random() < 0.2 else word)
+        parts.append(rng.choice([" ", "", "-", "\n", ".", "_", "ß"]))
+    return "".join(parts)
+
+
+def fuzz_contact_text(rng):
+    return "".join(rng.choice(CONTACT_TOKENS) + rng.choice(["", " ", "-", "/", "\n", "a"])
+                   for _ in range(rng.randint(0, 25)))
+
+
+def test_keyword_matcher_matches_baseline(inventory, monkeypatch):
+    # Bankdaten-Kontext wird sonst per LLM geprüft
+    monkeypatch.setattr(inventory, "check_bankdata_context_with_llm",
+                        lambda *args, **kwargs: {'contains_private_bankdata': False})
+    categories = inventory.SENSITIVE_DATA_KEYWORDS
+    keywords = [keyword for category in categories.values() for keyword in category['keywords']]
+    rng = random.Random(1)
+    matched = 0
+    for i in range(FUZZ_TEXTS):
+        text = fuzz_keyword_text(rng, keywords)
+        file_path = "/x/Lebenslauf_cv.pdf" if i % 2 else None
+        result = inventory.classify_sensitive_data(text, file_path=file_path)
+        expected = baseline_matched_keywords(categories, text, file_path)
+        assert result['matched_keywords'] == expected, text
+        assert result['data_categories'] == list(expected), text
+        matched += bool(expected)
+    # Die Stichprobe muss tatsächlich Treffer enthalten
+    assert matched > FUZZ_TEXTS // 2
+
+
+def test_contact_extraction_matches_baseline(inventory):
+    rng = random.Random(3)
+    phones = 0
+    for _ in range(FUZZ_TEXTS):
+        text = fuzz_contact_text(rng)
+        result = inventory.extract_contact_info_from_text(text)
+        expected = baseline_extract_contact_info_from_text(text)
+        assert result['phone_numbers'] == expected['phone_numbers'], text
+        assert sorted(result['urls']) == sorted(expected['urls']), text
+        assert sorted(result['emails']) == sorted(expected['emails']), text
+        for phone in set(expected['phone_numbers']) | {text[:20]}:
+            assert inventory.validate_phone_number(phone) == baseline_validate_phone_number(phone), phone
+        phones += len(expected['phone_numbers'])
+    assert phones > 0
+
+
+@pytest.mark.parametrize("text", ["", None])
+def test_contact_extraction_empty_input(inventory, text):
+    assert inventory.extract_contact_info_from_text(text) == baseline_extract_contact_info_from_text(text)
@@ -0,0 +1,226 @@
+"""
+Inkrementelle Aktualisierung der kombinierten Datenbank (--create-database --incremental):
+nach Änderungen, Löschungen und neuen JSON-Dateien muss database_manifest.json genau den
+Datenbank-Dateien auf der Platte entsprechen.
+"""
+
+import contextlib
+import glob
+import gzip
+import io
+import json
+import os
+import random
+import shutil
+
+import pytest
+
+MAX_SIZE_MB = 0.005  # ca. 5 KB pro Datenbank-Datei, damit viele Dateien entstehen
+FORMATS = ["json", "jsonl", "jsonl.gz"]
+
+
+def write_json(inventory, number, extra=""):
+    """Legt die JSON-Ausgabe für Dokument number an (bzw. überschreibt sie)."""
+    rel_path = os.path.join(f"d{number % 3}", f"f{number:03d}.txt.json")
+    path = os.path.join(inventory.DST_ROOT, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        "path": rel_path[:-len(".json")],
+        "ext": ".txt",
+        "size": number,
+        "summary": f"Dokument {number}: " + random_text(number, 400) + extra,
+        "keywords": ["a", "b"],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    return rel_path
+
+
+def random_text(seed, length):
+    """Schlecht komprimierbarer Text, damit auch .gz-Datenbanken mehrere Dateien ergeben."""
+    rng = random.Random(seed)
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(length))
+
+
+def number_of(rel_path):
+    """Dokumentnummer aus dem Pfad einer JSON-Datei (d<n>/f<nnn>.txt.json)."""
+    return int(os.path.basename(rel_path)[1:4])
+
+
+def build(inventory, fmt, incremental=True, output_dir=None):
+    """Erstellt bzw. aktualisiert die Datenbank und gibt das Manifest zurück."""
+    output_dir = output_dir or database_dir(inventory)
+    with contextlib.redirect_stdout(io.StringIO()):
+        inventory.create_combined_database(max_size_mb=MAX_SIZE_MB, output_dir=output_dir,
+                                           incremental=incremental, fmt=fmt)
+    return inventory.load_database_manifest(output_dir)
+
+
+def database_dir(inventory):
+    return os.path.join(inventory.DST_ROOT, "database")
+
+
+def read_documents(path):
+    """Dokumente einer Datenbank-Datei in Dateireihenfolge."""
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["documents"]
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def current_json_files(inventory):
+    result = []
+    for root, dirs, files in os.walk(inventory.DST_ROOT):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != database_dir(inventory)]
+        result.extend(os.path.relpath(os.path.join(root, name), inventory.DST_ROOT)
+                      for name in files if name.endswith(".json"))
+    return sorted(result)
+
+
+def check_database(inventory, manifest, output_dir=None):
+    """Prüft das Manifest gegen die Datenbank-Dateien und die JSON-Dateien auf der Platte."""
+    output_dir = output_dir or database_dir(inventory)
+    on_disk = sorted(os.path.basename(path) for path in glob.glob(os.path.join(output_dir, "file_database_*")))
+    assert on_disk == sorted(batch["file"] for batch in manifest["batches"])
+    assert not glob.glob(os.path.join(output_dir, "*.tmp"))
+
+    numbers = [batch["batch_number"] for batch in manifest["batches"]]
+    assert numbers == sorted(set(numbers))
+
+    members = []
+    documents = {}
+    for batch in manifest["batches"]:
+        path = os.path.join(output_dir, batch["file"])
+        docs = read_documents(path)
+        assert len(docs) == batch["documents"] == len(batch["members"])
+        assert batch["bytes"] == os.path.getsize(path)
+        if batch["documents"] > 1:
+            assert batch["bytes"] <= MAX_SIZE_MB * 1024 * 1024
+        for member, doc in zip(batch["members"], docs):
+            json_path = os.path.join(inventory.DST_ROOT, member["path"])
+            stat = os.stat(json_path)
+            assert (member["mtime_ns"], member["size"]) == (stat.st_mtime_ns, stat.st_size)
+            with open(json_path, encoding="utf-8") as f:
+                assert doc == json.load(f)
+            documents[member["path"]] = doc
+        members.extend(member["path"] for member in batch["members"])
+
+    failed = [member["path"] for member in manifest["failed"]]
+    # Jede JSON-Datei steht genau einmal in der Datenbank oder in "failed"
+    assert sorted(members + failed) == current_json_files(inventory)
+    return documents
+
+
+@pytest.fixture
+def database(inventory):
+    for number in range(120):
+        write_json(inventory, number)
+    return inventory
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_incremental_update_matches_files_on_disk(database, tmp_path, fmt):
+    inventory = database
+    first = build(inventory, fmt, incremental=False)
+    check_database(inventory, first)
+    assert len(first["batches"]) > 4
+    untouched = first["batches"][0]
+    untouched_mtime = os.stat(os.path.join(database_dir(inventory), untouched["file"])).st_mtime_ns
+
+    # Mitglied einer mittleren Datei deutlich vergrößern (passt nicht mehr hinein → wandert ans Ende)
+    grown = first["batches"][2]["members"][-1]["path"]
+    write_json(inventory, number_of(grown), extra=random_text(-1, 3000))
+    # Mitglied ohne Größenänderung neu schreiben (nur mtime)
+    touched = first["batches"][3]["members"][-1]["path"]
+    stat = os.stat(os.path.join(inventory.DST_ROOT, touched))
+    os.utime(os.path.join(inventory.DST_ROOT, touched), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    # Löschen und neue Dateien
+    for member in first["batches"][1]["members"][:2]:
+        os.remove(os.path.join(inventory.DST_ROOT, member["path"]))
+    for number in range(200, 210):
+        write_json(inventory, number)
+
+    second = build(inventory, fmt)
+    documents = check_database(inventory, second)
+
+    assert untouched["file"] not in second["changed_batches"]
+    assert untouched in second["batches"]
+    assert os.stat(os.path.join(database_dir(inventory), untouched["file"])).st_mtime_ns == untouched_mtime
+    for batch in first["batches"][1:4]:
+        assert batch["file"] in second["changed_batches"]
+    # Das vergrößerte Dokument passt nicht mehr in seine Datei und steht jetzt weiter hinten
+    placement = {member["path"]: batch["batch_number"]
+                 for batch in second["batches"] for member in batch["members"]}
+    assert placement[grown] > first["batches"][2]["batch_number"]
+    assert second["removed_batches"] == []
+
+    # Gleicher Inhalt wie ein vollständiger Neuaufbau
+    shutil.move(database_dir(inventory), str(tmp_path / "incremental"))
+    full = build(inventory, fmt, incremental=False)
+    assert check_database(inventory, full) == documents
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_unchanged_database_is_not_rewritten(database, fmt):
+    inventory = database
+    first = build(inventory, fmt, incremental=False)
+    second = build(inventory, fmt)
+    check_database(inventory, second)
+    assert second["changed_batches"] == []
+    assert second["removed_batches"] == []
+    assert second["batches"] == first["batches"]
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_batch_without_members_is_removed(database, fmt):
+    inventory = database
+    first = build(inventory, fmt, incremental=False)
+    emptied = first["batches"][1]
+    for member in emptied["members"]:
+        os.remove(os.path.join(inventory.DST_ROOT, member["path"]))
+
+    second = build(inventory, fmt)
+    check_database(inventory, second)
+    assert second["removed_batches"] == [emptied["file"]]
+    assert not os.path.exists(os.path.join(database_dir(inventory), emptied["file"]))
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_failed_members_are_recorded_and_retried_after_change(database, fmt):
+    inventory = database
+    first = build(inventory, fmt, incremental=False)
+    broken = first["batches"][2]["members"][1]["path"]
+    broken_path = os.path.join(inventory.DST_ROOT, broken)
+    with open(broken_path, encoding="utf-8") as f:
+        original = f.read()
+    with open(broken_path, "w", encoding="utf-8") as f:
+        f.write("{")
+
+    second = build(inventory, fmt)
+    check_database(inventory, second)
+    assert [member["path"] for member in second["failed"]] == [broken]
+
+    # Unverändert fehlerhaft: keine Datenbank-Datei wird erneut geschrieben
+    third = build(inventory, fmt)
+    check_database(inventory, third)
+    assert third["changed_batches"] == []
+    assert [member["path"] for member in third["failed"]] == [broken]
+
+    # Repariert: Datei landet wieder in der Datenbank
+    with open(broken_path, "w", encoding="utf-8") as f:
+        f.write(original)
+    fourth = build(inventory, fmt)
+    documents = check_database(inventory, fourth)
+    assert fourth["failed"] == []
+    assert broken in documents
+
+
+def test_changed_settings_trigger_full_rebuild(database):
+    inventory = database
+    build(inventory, "json", incremental=False)
+    manifest = build(inventory, "jsonl")
+    check_database(inventory, manifest)
+    assert manifest["format"] == "jsonl"
+    assert manifest["removed_batches"] and all(name.endswith(".json") for name in manifest["removed_batches"])